@@ -0,0 +1,3 @@
+"""
+Бенчмарки бота. Запускаются вручную: python -m benchmarks.<имя_модуля>
+"""
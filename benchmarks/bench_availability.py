@@ -0,0 +1,79 @@
+"""
+Бенчмарк индекса свободного времени: 10 000 мастеров x 60 дней.
+
+Работает без базы данных на синтетических данных.
+Запуск: python -m benchmarks.bench_availability [мастеров] [дней]
+"""
+
+import random
+import statistics
+import sys
+import time
+from datetime import date, time as dtime, timedelta
+
+from bot.scheduling.availability import AvailabilityIndex
+
+SPECIALIZATIONS = [f"специализация {i}" for i in range(20)]
+
+
+def build_index(masters: int, days: int) -> AvailabilityIndex:
+    """Заполняет индекс: рабочий день 9:00-20:00 и случайные занятые часы."""
+    rng = random.Random(42)
+    index = AvailabilityIndex()
+    start = date.today()
+    for master_id in range(1, masters + 1):
+        index.set_master(master_id, rng.choice(SPECIALIZATIONS))
+        for offset in range(days):
+            day = start + timedelta(days=offset)
+            index.mark_free(master_id, day, dtime(9), dtime(20))
+            for hour in rng.sample(range(9, 20), 6):
+                index.mark_busy(master_id, day, dtime(hour), dtime(hour, 59))
+    return index
+
+
+def index_size_mb(index: AvailabilityIndex) -> float:
+    """Оценивает память под маски дней (словари и числа)."""
+    total = sys.getsizeof(index._days)
+    for masters in index._days.values():
+        total += sys.getsizeof(masters)
+        total += sum(sys.getsizeof(bits) for bits in masters.values())
+    return total / 1024 / 1024
+
+
+def percentile(values: list, p: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+def main(masters: int, days: int) -> None:
+    started = time.perf_counter()
+    index = build_index(masters, days)
+    build_seconds = time.perf_counter() - started
+    memory_mb = index_size_mb(index)
+    print(f"Построение {masters} x {days}: {build_seconds:.2f} с, память {memory_mb:.1f} МБ")
+
+    rng = random.Random(7)
+    today = date.today()
+    latencies = []
+    for _ in range(1000):
+        date_from = today + timedelta(days=rng.randrange(days))
+        started = time.perf_counter()
+        index.find_windows(rng.choice(SPECIALIZATIONS), rng.choice([30, 60, 90, 120]),
+                           date_from, date_from + timedelta(days=14), limit=10)
+        latencies.append((time.perf_counter() - started) * 1000)
+    print(f"find_windows: p50 {statistics.median(latencies):.3f} мс, "
+          f"p99 {percentile(latencies, 0.99):.3f} мс")
+
+    started = time.perf_counter()
+    updates = 100000
+    for _ in range(updates):
+        day = today + timedelta(days=rng.randrange(days))
+        index.apply_slot(rng.randrange(1, masters + 1), day, dtime(12), dtime(13),
+                         rng.random() < 0.5)
+    elapsed = time.perf_counter() - started
+    print(f"apply_slot: {updates / elapsed:.0f} обновлений/с")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 60)
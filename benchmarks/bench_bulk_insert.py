@@ -0,0 +1,72 @@
+"""
+Сравнение построчной и массовой вставки временных слотов.
+
+Нужна локальная PostgreSQL с примененными миграциями (настройки из .env).
+Запуск: python -m benchmarks.bench_bulk_insert [число_слотов]
+"""
+
+import asyncio
+import sys
+import time
+from datetime import date, time as dtime, timedelta
+
+from bot.database.database import Database
+from bot.database.models.master import Master
+from bot.database.models.time_slot import TimeSlot
+
+
+def build_slots(master_id: int, count: int) -> list:
+    """Строит count слотов по 30 минут, 16 слотов на день."""
+    slots = []
+    start_date = date.today() + timedelta(days=1)
+    for i in range(count):
+        day, index = divmod(i, 16)
+        start_minutes = 8 * 60 + index * 30
+        start = dtime(start_minutes // 60, start_minutes % 60)
+        end = dtime((start_minutes + 30) // 60, (start_minutes + 30) % 60)
+        slots.append((master_id, start_date + timedelta(days=day), start, end))
+    return slots
+
+
+async def per_row(db: Database, slots: list) -> None:
+    query = """
+    INSERT INTO time_slots (master_id, date, start_time, end_time)
+    VALUES ($1, $2, $3, $4)
+    RETURNING id
+    """
+    for slot in slots:
+        await db.fetchrow(query, *slot, use_primary=True)
+
+
+async def execute_many(db: Database, slots: list) -> None:
+    query = "INSERT INTO time_slots (master_id, date, start_time, end_time) VALUES ($1, $2, $3, $4)"
+    await db.executemany(query, slots)
+
+
+async def main(count: int) -> None:
+    db = Database()
+    await db.connect()
+    master = await Master.create(db, "Бенчмарк", "Вставки", f"+7000{int(time.time())}",
+                                 "benchmark")
+    try:
+        slots = build_slots(master.id, count)
+        cases = [
+            ("INSERT ... RETURNING построчно", per_row),
+            ("executemany", execute_many),
+            ("bulk_create (unnest)", TimeSlot.bulk_create),
+            ("COPY", TimeSlot.copy_records),
+        ]
+        print(f"Вставка {count} слотов")
+        for name, func in cases:
+            await db.execute("DELETE FROM time_slots WHERE master_id = $1", master.id)
+            started = time.perf_counter()
+            await func(db, slots)
+            elapsed = time.perf_counter() - started
+            print(f"{name:<32} {elapsed * 1000:10.1f} мс  {count / elapsed:12.0f} строк/с")
+    finally:
+        await master.delete(db)
+        await db.disconnect()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000))
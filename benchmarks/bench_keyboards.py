@@ -0,0 +1,67 @@
+"""
+Стоимость подготовки reply_markup к отправке: сборка на каждый вызов и готовые клавиатуры.
+
+Для каждой клавиатуры измеряется то, что происходит при отправке сообщения:
+получение разметки и ее сериализация в JSON. Сеть и база не нужны.
+
+Запуск: python -m benchmarks.bench_keyboards
+"""
+
+import json
+import time
+
+from telegram import InlineKeyboardButton, InlineKeyboardMarkup
+
+from bot.keyboards.main_menu_keyboard import get_main_menu_keyboard
+from bot.keyboards.search_keyboard import get_search_results_keyboard
+from bot.router import pack
+
+ROUNDS = 20000
+
+
+def build_main_menu() -> InlineKeyboardMarkup:
+    # Прежняя реализация: новая разметка на каждый вызов
+    return InlineKeyboardMarkup([
+        [
+            InlineKeyboardButton("Найти мастера", callback_data="find_master"),
+            InlineKeyboardButton("Мои записи", callback_data="my_appointments")
+        ],
+        [
+            InlineKeyboardButton("Стать мастером", callback_data="become_master"),
+            InlineKeyboardButton("Помощь", callback_data="help")
+        ]
+    ])
+
+
+def build_search_results(prev_cursor: int, next_cursor: int) -> InlineKeyboardMarkup:
+    return InlineKeyboardMarkup([
+        [
+            InlineKeyboardButton("⬅️", callback_data=pack("fm:p", prev_cursor)),
+            InlineKeyboardButton("➡️", callback_data=pack("fm:n", next_cursor))
+        ],
+        [InlineKeyboardButton("Новый поиск", callback_data="find_master")],
+        [InlineKeyboardButton("Вернуться в меню", callback_data="back_to_main")]
+    ])
+
+
+def time_per_call(function) -> float:
+    started = time.perf_counter()
+    for i in range(ROUNDS):
+        json.dumps(function(i).to_dict())
+    return (time.perf_counter() - started) / ROUNDS * 1e6
+
+
+def main() -> None:
+    # Листание: 50 разных страниц, как у нескольких активных пользователей
+    cases = (
+        ("главное меню", lambda i: build_main_menu(), lambda i: get_main_menu_keyboard()),
+        ("листание поиска", lambda i: build_search_results(i % 50, i % 50 + 5),
+         lambda i: get_search_results_keyboard(i % 50, i % 50 + 5)),
+    )
+    print(f"{'клавиатура':<18} {'сборка, мкс':>12} {'готовая, мкс':>13}")
+    for name, old, new in cases:
+        print(f"{name:<18} {time_per_call(old):>12.2f} {time_per_call(new):>13.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Сравнение одиночных запросов и пакетной загрузки при одновременных обращениях.
+
+Нужна локальная PostgreSQL с примененными миграциями и хотя бы одним мастером.
+Запуск: python -m benchmarks.bench_loader [одновременных_запросов]
+"""
+
+import asyncio
+import sys
+import time
+
+from bot.database.cache import master_cache, service_cache
+from bot.database.database import Database
+from bot.database.models.master import Master, SELECT_MASTER_BY_ID
+from bot.database.models.service import Service, SELECT_SERVICES_BY_MASTER_ID
+
+
+def round_trips(db: Database) -> int:
+    """Количество выполненных запросов по статистике Database."""
+    return sum(histogram.count for histogram in db.stats.queries.values())
+
+
+async def run_case(db: Database, name: str, calls) -> None:
+    master_cache.clear()
+    service_cache.clear()
+    before = round_trips(db)
+    started = time.perf_counter()
+    await asyncio.gather(*calls)
+    elapsed = time.perf_counter() - started
+    print(f"{name:<42} {round_trips(db) - before:6} запросов  {elapsed * 1000:8.1f} мс")
+
+
+async def main(concurrency: int) -> None:
+    db = Database()
+    db.max_waiting = concurrency
+    await db.connect()
+    try:
+        rows = await db.fetch("SELECT id FROM masters ORDER BY id LIMIT $1", concurrency)
+        if not rows:
+            raise SystemExit("В базе нет мастеров")
+        master_ids = [rows[i % len(rows)]['id'] for i in range(concurrency)]
+
+        print(f"{concurrency} одновременных обращений, {len(rows)} разных мастеров")
+        await run_case(db, "Master: отдельный fetchrow на вызов",
+                       [db.fetchrow(SELECT_MASTER_BY_ID, i) for i in master_ids])
+        await run_case(db, "Master.get_by_id (пакетная загрузка)",
+                       [Master.get_by_id(db, i) for i in master_ids])
+        await run_case(db, "Service: отдельный fetch на вызов",
+                       [db.fetch(SELECT_SERVICES_BY_MASTER_ID, i) for i in master_ids])
+        await run_case(db, "Service.get_by_master_id (пакетная загрузка)",
+                       [Service.get_by_master_id(db, i) for i in master_ids])
+    finally:
+        await db.disconnect()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 500))
@@ -0,0 +1,69 @@
+"""
+Память и скорость построения моделей из 100 000 строк asyncpg.
+
+Строки генерируются в PostgreSQL (generate_series), таблицы не нужны.
+Сравнивается прежний способ (класс с __dict__ и cls(**row)) и
+Service.from_row (__slots__, значения по позициям).
+Запуск: python -m benchmarks.bench_models [строк]
+"""
+
+import asyncio
+import gc
+import sys
+import time
+import tracemalloc
+
+from bot.database.database import Database
+from bot.database.models.service import Service
+
+SYNTHETIC_SERVICES = """
+SELECT i AS id, i % 1000 AS master_id, 'Услуга ' || i AS name, '' AS description,
+       '1000' AS price, interval '1 hour' AS duration, now()::timestamp AS created_at
+FROM generate_series(1, $1) AS i
+"""
+
+
+class DictService:
+    """Прежняя модель услуги: атрибуты в __dict__, создание через cls(**row)."""
+
+    def __init__(self, id=None, master_id=None, name="", description="", price="",
+                 duration=None, created_at=None):
+        self.id = id
+        self.master_id = master_id
+        self.name = name
+        self.description = description
+        self.price = price
+        self.duration = duration
+        self.created_at = created_at
+
+
+def measure(name: str, build, rows: list) -> None:
+    gc.collect()
+    started = time.perf_counter()
+    objects = build(rows)
+    elapsed = time.perf_counter() - started
+
+    gc.collect()
+    tracemalloc.start()
+    objects = build(rows)
+    memory_mb = tracemalloc.get_traced_memory()[0] / 1024 / 1024
+    tracemalloc.stop()
+
+    print(f"{name:<28} {elapsed * 1000:8.1f} мс  {len(rows) / elapsed:10.0f} строк/с  "
+          f"{memory_mb:7.1f} МБ на {len(objects)} объектов")
+
+
+async def main(count: int) -> None:
+    db = Database(replica_dsns=())
+    await db.connect()
+    try:
+        rows = await db.fetch(SYNTHETIC_SERVICES, count)
+    finally:
+        await db.disconnect()
+
+    measure("cls(**row), __dict__", lambda rows: [DictService(**row) for row in rows], rows)
+    measure("Service.from_row, __slots__", lambda rows: [Service.from_row(row) for row in rows], rows)
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000))
@@ -0,0 +1,70 @@
+"""
+Стоимость выбора обработчика callback-запроса: цепочка регулярных выражений и Router.
+
+Application проверяет CallbackQueryHandler по очереди, пока pattern не совпадет,
+поэтому время растет с числом кнопок. Router находит обработчик поиском в словаре.
+Сеть и база не нужны.
+
+Запуск: python -m benchmarks.bench_router
+"""
+
+import time
+
+from telegram import Update
+from telegram.ext import CallbackQueryHandler
+
+from bot.router import Router, pack
+
+ROUNDS = 20000
+
+
+async def noop(update, context) -> None:
+    return
+
+
+def make_update(data: str) -> Update:
+    return Update.de_json({
+        "update_id": 1,
+        "callback_query": {
+            "id": "1",
+            "from": {"id": 1, "is_bot": False, "first_name": "User"},
+            "chat_instance": "1",
+            "data": data,
+        },
+    }, None)
+
+
+def time_per_call(function, updates: list) -> float:
+    started = time.perf_counter()
+    for _ in range(ROUNDS // len(updates)):
+        for update in updates:
+            function(update)
+    return (time.perf_counter() - started) / (ROUNDS // len(updates) * len(updates)) * 1e6
+
+
+def main() -> None:
+    print(f"{'обработчиков':>12} {'regex, мкс':>12} {'Router, мкс':>12}")
+    for count in (10, 50, 200, 500):
+        chain = [CallbackQueryHandler(noop, pattern=rf"^a{i}:\d+$") for i in range(count)]
+        router = Router()
+        for i in range(count):
+            router.callback(f"a{i}", noop)
+
+        # Равномерно по всей таблице, как нажатия разных кнопок
+        updates = [make_update(pack(f"a{i}", 42)) for i in range(0, count, max(count // 10, 1))]
+
+        def regex_dispatch(update: Update):
+            for handler in chain:
+                if handler.check_update(update):
+                    return handler
+            return None
+
+        def router_dispatch(update: Update):
+            return router.resolve_callback(update.callback_query.data)
+
+        print(f"{count:>12} {time_per_call(regex_dispatch, updates):>12.2f} "
+              f"{time_per_call(router_dispatch, updates):>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
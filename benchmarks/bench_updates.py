@@ -0,0 +1,108 @@
+"""
+Пропускная способность обработки обновлений: последовательно и параллельно.
+
+Обновления подаются в Application так же, как их подает polling или webhook,
+а ответы уходят в локальную заглушку Bot API с задержкой как у Telegram.
+Заодно проверяется, что сообщения одного пользователя обработаны по порядку.
+
+Замер (100 x 5, задержка 20 мс), обн/с при 1/16/64/256 одновременных обновлениях:
+без ограничения запросов (0) - 21/175/58/74, с ограничением 16 - 20/158/148/155.
+Без ограничения процесс упирается в процессор: по cProfile около половины
+времени уходит на перебор ожидающих запросов в пуле httpcore, и чем больше
+запросов в пуле, тем медленнее (см. bot/request.py).
+
+Запуск: python -m benchmarks.bench_updates [пользователей] [сообщений_на_пользователя] [задержка_мс]
+        [запросов_к_API_одновременно, 0 - без ограничения]
+"""
+
+import asyncio
+import sys
+import time
+
+from telegram import Update
+from telegram.ext import Application, MessageHandler, filters
+
+from benchmarks.fake_bot_api import FakeBotApi
+from bot.request import ConcurrencyLimitedRequest
+from bot.update_processor import PerUserUpdateProcessor
+
+
+def make_update(update_id: int, user_id: int, text: str) -> dict:
+    user = {"id": user_id, "is_bot": False, "first_name": f"User{user_id}"}
+    return {
+        "update_id": update_id,
+        "message": {
+            "message_id": update_id,
+            "date": 0,
+            "chat": {"id": user_id, "type": "private"},
+            "from": user,
+            "text": text,
+        },
+    }
+
+
+async def run_case(api: FakeBotApi, concurrency: int, users: int, per_user: int,
+                   max_requests: int) -> None:
+    processed = {}
+    finished = 0
+
+    async def echo_step(update: Update, context) -> None:
+        # Два обращения к API, как у типичного шага регистрации
+        step = int(update.message.text)
+        processed.setdefault(update.effective_user.id, []).append(step)
+        await update.message.reply_text(f"Шаг {step}")
+        await context.bot.send_message(update.effective_chat.id, "Введите следующее значение")
+        nonlocal finished
+        finished += 1
+
+    builder = (
+        Application.builder()
+        .token("1:fake")
+        .base_url(api.base_url)
+        .concurrent_updates(PerUserUpdateProcessor(concurrency))
+    )
+    if max_requests:
+        builder = builder.request(ConcurrencyLimitedRequest(max_requests))
+    application = builder.build()
+    application.add_handler(MessageHandler(filters.TEXT, echo_step))
+
+    updates = [
+        Update.de_json(make_update(step * users + user, user + 1000, str(step)), application.bot)
+        for step in range(per_user)
+        for user in range(users)
+    ]
+
+    async with application:
+        await application.start()
+        started = time.perf_counter()
+        for update in updates:
+            await application.update_queue.put(update)
+        while finished < len(updates):
+            await asyncio.sleep(0.005)
+        elapsed = time.perf_counter() - started
+        await application.stop()
+
+    ordered = all(steps == sorted(steps) for steps in processed.values())
+    print(f"одновременно {concurrency:4}: {len(updates) / elapsed:8.1f} обн/с  "
+          f"{elapsed:6.2f} с  порядок по пользователю {'сохранен' if ordered else 'НАРУШЕН'}")
+
+
+async def main(users: int, per_user: int, latency_ms: float, max_requests: int) -> None:
+    api = FakeBotApi(port=0, latency=latency_ms / 1000)
+    await api.start()
+    try:
+        print(f"{users} пользователей x {per_user} сообщений, задержка API {latency_ms} мс, "
+              f"запросов к API одновременно: {max_requests or 'без ограничения'}")
+        for concurrency in (1, 16, 64, 256):
+            await run_case(api, concurrency, users, per_user, max_requests)
+    finally:
+        await api.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 100,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 5,
+        float(sys.argv[3]) if len(sys.argv) > 3 else 20,
+        int(sys.argv[4]) if len(sys.argv) > 4 else 16
+    ))
@@ -0,0 +1,73 @@
+"""
+Проверка ограничителя исходящих запросов на заглушке Bot API с лимитами Telegram.
+
+Бот отправляет всплеск сообщений: массовую рассылку по многим чатам и
+одновременно ответы пользователям. Сравниваются запуски без ограничителя
+и с RateLimiter: сколько ответов 429 вернула заглушка, сколько вызовов
+завершились ошибкой и когда были доставлены интерактивные ответы.
+Последний запуск занижает лимит заглушки, чтобы проверить повтор после retry_after.
+
+Запуск: python -m benchmarks.check_rate_limiter [сообщений_рассылки] [ответов]
+"""
+
+import asyncio
+import sys
+import time
+
+from telegram.error import RetryAfter
+from telegram.ext import Application
+
+from benchmarks.fake_bot_api import FakeBotApi
+from bot.rate_limiter import RateLimiter, PRIORITY_BULK
+
+
+async def run_case(name: str, limiter, bulk: int, replies: int, global_limit: int = 30) -> None:
+    api = FakeBotApi(port=0, latency=0.005, global_limit=global_limit, chat_limit=3, retry_after=1)
+    await api.start()
+    builder = Application.builder().token("1:fake").base_url(api.base_url)
+    if limiter:
+        builder = builder.rate_limiter(limiter)
+    application = builder.build()
+
+    failed = 0
+    reply_times = []
+    started = time.perf_counter()
+
+    async def send(chat_id: int, text: str, bulk_message: bool) -> None:
+        nonlocal failed
+        kwargs = {"rate_limit_args": {"priority": PRIORITY_BULK}} if limiter and bulk_message else {}
+        try:
+            await application.bot.send_message(chat_id, text, **kwargs)
+        except RetryAfter:
+            failed += 1
+            return
+        if not bulk_message:
+            reply_times.append(time.perf_counter() - started)
+
+    try:
+        async with application:
+            calls = [send(100 + i, "Напоминание о записи", True) for i in range(bulk)]
+            # Ответы пользователям приходят, когда рассылка уже в очереди
+            calls += [send(10 + i % 5, "Ответ пользователю", False) for i in range(replies)]
+            await asyncio.gather(*calls)
+    finally:
+        await api.stop()
+
+    elapsed = time.perf_counter() - started
+    last_reply = f"{max(reply_times):.2f} с" if reply_times else "-"
+    print(f"{name:<28} {elapsed:6.2f} с  ответов 429: {sum(api.rejected.values()):4}  "
+          f"ошибок: {failed:4}  последний ответ пользователю: {last_reply}")
+
+
+async def main(bulk: int, replies: int) -> None:
+    print(f"Рассылка {bulk} сообщений и {replies} ответов в 5 чатов, заглушка: 30/с всего, 3/с на чат")
+    await run_case("без ограничителя", None, bulk, replies)
+    await run_case("с RateLimiter", RateLimiter(), bulk, replies)
+    await run_case("с RateLimiter, лимит 20/с", RateLimiter(max_retries=10), bulk, replies, global_limit=20)
+
+
+if __name__ == "__main__":
+    asyncio.run(main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 120,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 15
+    ))
@@ -0,0 +1,7 @@
+"""
+Бенчмарки слоя базы данных на локальной PostgreSQL.
+
+seed    - заполняет базу объемами, близкими к боевым
+run     - замеряет методы моделей при разной конкурентности и сохраняет JSON
+compare - сравнивает два JSON-отчета и находит регрессии
+"""
@@ -0,0 +1,85 @@
+"""
+Сравнение двух отчетов benchmarks.db.run.
+
+Для каждого сценария и уровня конкурентности выводит p95 до и после и их
+отношение, а также время выполнения плана из EXPLAIN ANALYZE. Если миграции
+в отчетах различаются, это выводится в начале: так видно, какое изменение
+схемы дало разницу.
+
+Запуск: python -m benchmarks.db.compare старый.json новый.json [--max-regression 1.2]
+"""
+
+import argparse
+import json
+import sys
+
+
+def load(path: str) -> dict:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def compare(before: dict, after: dict, max_regression: float = None) -> list:
+    """
+    Печатает таблицу сравнения.
+
+    Args:
+        before (dict): Отчет до изменения
+        after (dict): Отчет после изменения
+        max_regression (float, optional): Допустимое отношение p95 после/до
+
+    Returns:
+        list: Строки "сценарий @ уровень", где p95 вырос больше допустимого
+    """
+    old_migrations = before["meta"].get("migrations", {})
+    new_migrations = after["meta"].get("migrations", {})
+    for version in sorted(set(old_migrations) | set(new_migrations)):
+        if old_migrations.get(version) != new_migrations.get(version):
+            state = "новая" if version not in old_migrations else "изменена"
+            print(f"Миграция {version}: {state}")
+    print(f"Коммиты: {before['meta'].get('git_commit')} -> {after['meta'].get('git_commit')}")
+    print()
+
+    regressions = []
+    for name, new in after["scenarios"].items():
+        old = before["scenarios"].get(name)
+        if old is None:
+            print(f"{name}: нет в старом отчете")
+            continue
+
+        old_plan = old["explain"].get("execution_ms")
+        new_plan = new["explain"].get("execution_ms")
+        print(f"{name}: план {old['explain'].get('node')} {old_plan} мс -> "
+              f"{new['explain'].get('node')} {new_plan} мс")
+
+        for level, stats in new.get("levels", {}).items():
+            old_stats = old.get("levels", {}).get(level)
+            if not old_stats or not old_stats.get("p95_ms") or not stats.get("p95_ms"):
+                continue
+            ratio = stats["p95_ms"] / old_stats["p95_ms"]
+            mark = ""
+            if max_regression is not None and ratio > max_regression:
+                mark = "  РЕГРЕССИЯ"
+                regressions.append(f"{name} @ {level}")
+            print(f"    {level:>4} одновременно: p95 {old_stats['p95_ms']} -> {stats['p95_ms']} мс "
+                  f"(x{ratio:.2f}), {old_stats['throughput']} -> {stats['throughput']} выз/с{mark}")
+
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Сравнение отчетов бенчмарка базы данных")
+    parser.add_argument("before", help="отчет до изменения")
+    parser.add_argument("after", help="отчет после изменения")
+    parser.add_argument("--max-regression", type=float,
+                        help="завершиться с кодом 1, если p95 вырос больше чем в столько раз")
+    args = parser.parse_args()
+
+    regressions = compare(load(args.before), load(args.after), args.max_regression)
+    if regressions:
+        print(f"\nРегрессии p95: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
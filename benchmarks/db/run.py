@@ -0,0 +1,317 @@
+"""
+Замер методов моделей и путей записи на заполненной базе.
+
+Каждый сценарий выполняется при нескольких уровнях конкурентности
+(по умолчанию 1, 10, 50, 100, 200 одновременных вызовов); для каждого уровня
+записываются пропускная способность, p50/p95/p99 и число ошибок. Для SQL
+каждого сценария снимается EXPLAIN (ANALYZE, BUFFERS) - внутри транзакции,
+которая откатывается, так что пишущие сценарии данные не меняют.
+
+Кэши моделей на время замера отключены, чтобы измерялась база, а не память
+процесса (--with-cache включает их обратно). Результат сохраняется в JSON
+вместе с версиями примененных миграций, чтобы отчеты до и после изменения
+схемы можно было сравнить: python -m benchmarks.db.compare old.json new.json
+
+Запуск: python -m benchmarks.db.run [--levels 1,10,50,100,200] [--calls 2000] [--output путь.json]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import time
+from datetime import date, datetime, timedelta
+
+from bot.database.cache import master_cache, service_cache, schedule_cache
+from bot.database.database import Database
+from bot.database.models import PREPARED_QUERIES
+from bot.database.models.booking import Booking, BOOK_ANY_SLOT, CANCEL_BOOKING
+from bot.database.models.master import Master, SELECT_MASTER_BY_ID, SELECT_MASTER_BY_PHONE
+from bot.database.models.schedule import (
+    WorkingSchedule,
+    SELECT_SCHEDULES_BY_MASTER_ID,
+    SELECT_SCHEDULE_BY_MASTER_AND_DAY
+)
+from bot.database.models.service import Service, SELECT_SERVICES_BY_MASTER_ID
+from bot.scheduling.availability import SELECT_FREE_SLOTS
+from benchmarks.db.seed import SPECIALIZATIONS
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+SEARCH_BY_SPECIALIZATION = """
+SELECT id, first_name, last_name, phone_number, specialization,
+       photo_url, description, experience_years, created_at, updated_at, version
+FROM masters
+WHERE specialization = $1
+ORDER BY specialization ASC, id ASC
+LIMIT $2
+"""
+
+SEARCH_BY_NAME = """
+SELECT id, first_name, last_name, phone_number, specialization,
+       photo_url, description, experience_years, created_at, updated_at, version
+FROM masters
+WHERE (last_name || ' ' || first_name) ILIKE $1
+ORDER BY specialization ASC, id ASC
+LIMIT $2
+"""
+
+
+class Rollback(Exception):
+    """Откатывает транзакцию EXPLAIN ANALYZE."""
+
+
+class Scenario:
+    """
+    Сценарий замера: вызов метода модели и SQL, который он выполняет.
+    """
+
+    def __init__(self, name: str, call, query: str, make_args):
+        """
+        Args:
+            name (str): Имя сценария в отчете
+            call: Корутина (db, rnd) -> результат, вызов метода модели
+            query (str): SQL для EXPLAIN
+            make_args: Функция rnd -> параметры SQL для EXPLAIN
+        """
+        self.name = name
+        self.call = call
+        self.query = query
+        self.make_args = make_args
+
+
+class Dataset:
+    """
+    Границы данных в базе, из которых выбираются случайные параметры.
+    """
+
+    def __init__(self, first_id: int, last_id: int, first_slot_date: date, last_slot_date: date):
+        self.first_id = first_id
+        self.last_id = last_id
+        self.first_slot_date = first_slot_date
+        self.last_slot_date = last_slot_date
+
+    def master_id(self, rnd: random.Random) -> int:
+        return rnd.randint(self.first_id, self.last_id)
+
+    def phone(self, rnd: random.Random) -> str:
+        # Номер совпадает с шаблоном seed: +7900 и порядковый номер мастера
+        return "+7900" + str(rnd.randint(1, self.last_id - self.first_id + 1)).zfill(7)
+
+    def slot_date(self, rnd: random.Random) -> date:
+        return self.first_slot_date + timedelta(days=rnd.randint(0, (self.last_slot_date - self.first_slot_date).days))
+
+
+async def book_and_cancel(db: Database, data: Dataset, rnd: random.Random):
+    booking = await Booking.book_any_slot(db, data.master_id(rnd), data.slot_date(rnd), rnd.randint(1, 10 ** 9))
+    if booking:
+        await booking.cancel(db)
+    return booking
+
+
+def build_scenarios(data: Dataset) -> list:
+    free_slots_days = 7
+    return [
+        Scenario("Master.get_by_id", lambda db, rnd: Master.get_by_id(db, data.master_id(rnd)),
+                 SELECT_MASTER_BY_ID, lambda rnd: (data.master_id(rnd),)),
+        Scenario("Master.get_by_phone", lambda db, rnd: Master.get_by_phone(db, data.phone(rnd)),
+                 SELECT_MASTER_BY_PHONE, lambda rnd: (data.phone(rnd),)),
+        Scenario("Master.search(specialization)",
+                 lambda db, rnd: Master.search(db, specialization=rnd.choice(SPECIALIZATIONS)),
+                 SEARCH_BY_SPECIALIZATION, lambda rnd: (rnd.choice(SPECIALIZATIONS), 6)),
+        Scenario("Master.search(name)",
+                 lambda db, rnd: Master.search(db, name=f"Фамилия{rnd.randint(1, 999)} "),
+                 SEARCH_BY_NAME, lambda rnd: (f"%Фамилия{rnd.randint(1, 999)} %", 6)),
+        Scenario("Service.get_by_master_id", lambda db, rnd: Service.get_by_master_id(db, data.master_id(rnd)),
+                 SELECT_SERVICES_BY_MASTER_ID, lambda rnd: (data.master_id(rnd),)),
+        Scenario("WorkingSchedule.get_by_master_id",
+                 lambda db, rnd: WorkingSchedule.get_by_master_id(db, data.master_id(rnd)),
+                 SELECT_SCHEDULES_BY_MASTER_ID, lambda rnd: (data.master_id(rnd),)),
+        Scenario("WorkingSchedule.get_by_master_and_day",
+                 lambda db, rnd: WorkingSchedule.get_by_master_and_day(db, data.master_id(rnd), rnd.randint(1, 7)),
+                 SELECT_SCHEDULE_BY_MASTER_AND_DAY, lambda rnd: (data.master_id(rnd), rnd.randint(1, 7))),
+        Scenario("time_slots: свободные слоты мастера на неделю",
+                 lambda db, rnd: db.fetch(SELECT_FREE_SLOTS, data.first_slot_date,
+                                          data.first_slot_date + timedelta(days=free_slots_days),
+                                          [data.master_id(rnd)]),
+                 SELECT_FREE_SLOTS,
+                 lambda rnd: (data.first_slot_date, data.first_slot_date + timedelta(days=free_slots_days),
+                              [data.master_id(rnd)])),
+        Scenario("Booking.book_any_slot + cancel", lambda db, rnd: book_and_cancel(db, data, rnd),
+                 BOOK_ANY_SLOT, lambda rnd: (data.master_id(rnd), None, 1, data.slot_date(rnd))),
+        Scenario("Booking.cancel", None, CANCEL_BOOKING, lambda rnd: (0,)),
+    ]
+
+
+async def explain(db: Database, query: str, args: tuple) -> dict:
+    """
+    Снимает план запроса с фактическими временами и буферами.
+
+    Запрос выполняется в транзакции, которая всегда откатывается.
+
+    Returns:
+        dict: План в формате JSON и основные показатели
+    """
+    plan = None
+    try:
+        async with db.transaction() as tx:
+            row = await tx.fetchrow(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {query}", *args)
+            plan = json.loads(row[0])[0] if isinstance(row[0], str) else row[0][0]
+            raise Rollback()
+    except Rollback:
+        pass
+
+    root = plan["Plan"]
+    return {
+        "planning_ms": plan.get("Planning Time"),
+        "execution_ms": plan.get("Execution Time"),
+        "shared_hit_blocks": root.get("Shared Hit Blocks"),
+        "shared_read_blocks": root.get("Shared Read Blocks"),
+        "node": root.get("Node Type"),
+        "plan": plan,
+    }
+
+
+async def measure(db: Database, scenario: Scenario, concurrency: int, calls: int, seed: int) -> dict:
+    """
+    Выполняет сценарий calls раз, не больше concurrency вызовов одновременно.
+
+    Returns:
+        dict: Пропускная способность, перцентили задержки (мс) и число ошибок
+    """
+    rnd = random.Random(seed)
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    errors = 0
+
+    async def one() -> None:
+        nonlocal errors
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                await scenario.call(db, rnd)
+            except Exception:
+                errors += 1
+                return
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(calls)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+
+    def percentile(fraction: float):
+        if not latencies:
+            return None
+        return round(latencies[min(len(latencies) - 1, int(len(latencies) * fraction))] * 1000, 3)
+
+    return {
+        "calls": calls,
+        "errors": errors,
+        "elapsed_s": round(elapsed, 3),
+        "throughput": round(calls / elapsed, 1),
+        "p50_ms": percentile(0.5),
+        "p95_ms": percentile(0.95),
+        "p99_ms": percentile(0.99),
+        "max_ms": percentile(1.0),
+    }
+
+
+async def collect_metadata(db: Database) -> dict:
+    migrations = await db.fetch(
+        "SELECT version, checksum FROM schema_migrations ORDER BY version", use_primary=True
+    )
+    counts = {}
+    for table in ("masters", "services", "working_schedules", "time_slots", "bookings"):
+        # Оценка из статистики: точный count(*) по 50 млн строк занимает минуты
+        row = await db.fetchrow(
+            "SELECT COALESCE(SUM(c.reltuples), 0)::bigint AS n FROM pg_class c "
+            "WHERE c.oid = $1::regclass OR c.oid IN (SELECT inhrelid FROM pg_inherits WHERE inhparent = $1::regclass)",
+            table, use_primary=True
+        )
+        counts[table] = row['n']
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                                text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        "started_at": datetime.now().isoformat(timespec="seconds"),
+        "git_commit": commit,
+        "server_version": (await db.fetchrow("SHOW server_version", use_primary=True))[0],
+        "pool_max_size": db.max_size,
+        "migrations": {row['version']: row['checksum'] for row in migrations},
+        "row_estimates": counts,
+    }
+
+
+async def run(levels: list, calls: int, output: str, with_cache: bool, only: str) -> None:
+    db = Database(prepared_queries=PREPARED_QUERIES, replica_dsns=())
+    # Бенчмарк сам ограничивает конкурентность; запросы не должны отклоняться пулом
+    db.max_waiting = max(levels) + 1
+    db.acquire_timeout = None
+    await db.connect()
+
+    if not with_cache:
+        for cache in (master_cache, service_cache, schedule_cache):
+            cache.maxsize = 0
+
+    try:
+        bounds = await db.fetchrow("SELECT min(id) AS first, max(id) AS last FROM masters", use_primary=True)
+        slot_dates = await db.fetchrow(
+            "SELECT min(date) AS first, max(date) AS last FROM time_slots WHERE date >= CURRENT_DATE",
+            use_primary=True
+        )
+        if bounds['first'] is None or slot_dates['first'] is None:
+            raise SystemExit("База пуста. Сначала запустите python -m benchmarks.db.seed")
+        data = Dataset(bounds['first'], bounds['last'], slot_dates['first'], slot_dates['last'])
+
+        report = {"meta": await collect_metadata(db), "levels": levels, "calls": calls, "scenarios": {}}
+        report["meta"]["with_cache"] = with_cache
+
+        for scenario in build_scenarios(data):
+            if only and only not in scenario.name:
+                continue
+            result = {"explain": await explain(db, scenario.query, scenario.make_args(random.Random(0)))}
+            print(f"{scenario.name}: план {result['explain']['node']}, "
+                  f"{result['explain']['execution_ms']:.2f} мс, буферов "
+                  f"{result['explain']['shared_hit_blocks']}+{result['explain']['shared_read_blocks']}")
+
+            if scenario.call is not None:
+                result["levels"] = {}
+                for level in levels:
+                    stats = await measure(db, scenario, level, calls, seed=level)
+                    result["levels"][str(level)] = stats
+                    print(f"    {level:>4} одновременно: {stats['throughput']:>9.1f} выз/с  "
+                          f"p50 {stats['p50_ms']} мс  p95 {stats['p95_ms']} мс  p99 {stats['p99_ms']} мс  "
+                          f"ошибок {stats['errors']}")
+            report["scenarios"][scenario.name] = result
+
+        if not output:
+            os.makedirs(RESULTS_DIR, exist_ok=True)
+            output = os.path.join(RESULTS_DIR, f"db-{datetime.now():%Y%m%d-%H%M%S}.json")
+        with open(output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2, default=str)
+        print(f"Отчет: {output}")
+    finally:
+        await db.disconnect()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Бенчмарк слоя базы данных")
+    parser.add_argument("--levels", default="1,10,50,100,200", help="уровни конкурентности через запятую")
+    parser.add_argument("--calls", type=int, default=2000, help="вызовов на каждый уровень")
+    parser.add_argument("--output", help="путь к JSON-отчету")
+    parser.add_argument("--with-cache", action="store_true", help="не отключать кэши моделей")
+    parser.add_argument("--only", help="только сценарии, в имени которых есть эта строка")
+    args = parser.parse_args()
+    levels = [int(level) for level in args.levels.split(",")]
+    asyncio.run(run(levels, args.calls, args.output, args.with_cache, args.only))
+
+
+if __name__ == "__main__":
+    main()
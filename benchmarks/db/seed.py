@@ -0,0 +1,105 @@
+"""
+Заполнение локальной PostgreSQL данными для бенчмарков.
+
+При --scale 1: 100 000 мастеров, 1 000 000 услуг, график на 7 дней у каждого
+мастера и слоты на горизонт SLOT_HORIZON_DAYS - около 50 млн строк time_slots
+(10 рабочих часов с перерывом, слоты по 30 минут, 6 рабочих дней в неделю).
+Все строки генерируются на стороне PostgreSQL (generate_series), слоты -
+тем же SlotGenerator, что и в боте, пачками мастеров.
+
+Нужна база с примененными миграциями. Запуск:
+    python -m benchmarks.db.seed --scale 0.01          # 1 000 мастеров, быстро
+    python -m benchmarks.db.seed --scale 1 --reset     # полный объем, очистив таблицы
+"""
+
+import argparse
+import asyncio
+import time
+
+from bot.database.database import Database
+from bot.database.partitions import PartitionManager
+from bot.scheduling.slot_generator import SlotGenerator
+
+SPECIALIZATIONS = [
+    "Парикмахер", "Барбер", "Мастер маникюра", "Мастер педикюра", "Косметолог",
+    "Визажист", "Бровист", "Лешмейкер", "Массажист", "Тату-мастер", "Стилист", "Колорист",
+]
+
+INSERT_MASTERS = """
+INSERT INTO masters (first_name, last_name, phone_number, specialization, description, experience_years)
+SELECT 'Имя' || i, 'Фамилия' || i, '+7900' || lpad(i::text, 7, '0'),
+       ($2::text[])[1 + i % array_length($2::text[], 1)],
+       'Описание мастера ' || i, i % 30
+FROM generate_series(1, $1) AS i
+"""
+
+INSERT_SERVICES = """
+INSERT INTO services (master_id, name, description, price, duration)
+SELECT m.id, 'Услуга ' || k, 'Описание услуги ' || k, (500 + k * 100)::text,
+       make_interval(mins => 30 + (k % 4) * 15)
+FROM masters m, generate_series(1, $1) AS k
+"""
+
+# Пн-Сб с 9 до 19 с перерывом на обед, воскресенье - выходной
+INSERT_SCHEDULES = """
+INSERT INTO working_schedules (master_id, day_of_week, is_working, start_time, end_time,
+                               break_start_time, break_end_time)
+SELECT m.id, d, d <= 6, '09:00', '19:00', '13:00', '14:00'
+FROM masters m, generate_series(1, 7) AS d
+"""
+
+RESET_TABLES = """
+TRUNCATE masters, services, working_schedules, time_slots, bookings RESTART IDENTITY CASCADE
+"""
+
+
+async def seed(scale: float, services_per_master: int, batch: int, reset: bool) -> None:
+    db = Database(replica_dsns=())
+    db.statement_timeout_ms = 0
+    await db.connect()
+    try:
+        existing = (await db.fetchrow("SELECT count(*) AS n FROM masters", use_primary=True))['n']
+        if existing and not reset:
+            raise SystemExit(f"В базе уже {existing} мастеров. Для очистки запустите с --reset")
+        if reset:
+            await db.execute(RESET_TABLES)
+
+        masters = max(1, int(100_000 * scale))
+        steps = (
+            ("мастера", INSERT_MASTERS, (masters, SPECIALIZATIONS)),
+            ("услуги", INSERT_SERVICES, (services_per_master,)),
+            ("графики", INSERT_SCHEDULES, ()),
+        )
+        for name, query, args in steps:
+            started = time.perf_counter()
+            await db.execute(query, *args)
+            print(f"{name:<10} {time.perf_counter() - started:8.1f} с")
+
+        await PartitionManager(db).create_future_partitions()
+        generator = SlotGenerator(db)
+        # Слоты в 30 минут, как у самой короткой услуги
+        started = time.perf_counter()
+        created = 0
+        bounds = await db.fetchrow("SELECT min(id) AS first, max(id) AS last FROM masters", use_primary=True)
+        for first_id in range(bounds['first'], bounds['last'] + 1, batch):
+            master_ids = list(range(first_id, min(first_id + batch, bounds['last'] + 1)))
+            created += await generator.fill_horizon(master_ids)
+        print(f"{'слоты':<10} {time.perf_counter() - started:8.1f} с  ({created} строк)")
+
+        await db.execute("ANALYZE")
+    finally:
+        await db.disconnect()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Заполнение базы для бенчмарков")
+    parser.add_argument("--scale", type=float, default=1.0, help="1.0 = 100 000 мастеров")
+    parser.add_argument("--services-per-master", type=int, default=10)
+    parser.add_argument("--batch", type=int, default=1000, help="мастеров на один запрос генерации слотов")
+    parser.add_argument("--reset", action="store_true", help="очистить таблицы перед заполнением")
+    args = parser.parse_args()
+    asyncio.run(seed(args.scale, args.services_per_master, args.batch, args.reset))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+"""
+Локальная заглушка Telegram Bot API для нагрузочных тестов.
+
+Отвечает на методы Bot API правдоподобными ответами с настраиваемой
+задержкой, чтобы бот можно было нагружать без обращения к Telegram.
+Поддерживает keep-alive: httpx переиспользует соединения так же, как с api.telegram.org.
+Может имитировать лимиты Telegram: при превышении отвечает 429 с retry_after.
+FakeRequest подключает ту же заглушку к боту без HTTP и сокетов - для
+замеров самих обработчиков и запуска в CI без сети.
+
+Запуск отдельно: python -m benchmarks.fake_bot_api [порт] [задержка_мс]
+Адрес для Application.builder().base_url(): http://127.0.0.1:<порт>/bot
+"""
+
+import asyncio
+import json
+import sys
+import time
+from collections import Counter, defaultdict, deque
+from urllib.parse import parse_qsl
+
+from telegram.request import BaseRequest
+
+BOT_USER = {"id": 1, "is_bot": True, "first_name": "Fake", "username": "fake_bot"}
+
+
+class FakeBotApi:
+    """
+    HTTP-сервер, имитирующий Telegram Bot API.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 8081, latency: float = 0.02,
+                 global_limit: int = None, chat_limit: int = None, retry_after: int = 1):
+        """
+        Инициализирует заглушку.
+
+        Args:
+            host (str): Адрес для прослушивания
+            port (int): Порт (0 - выбрать свободный)
+            latency (float): Задержка ответа на каждый вызов (секунды)
+            global_limit (int): Сколько вызовов в секунду принимать всего (None - без лимита)
+            chat_limit (int): Сколько сообщений в секунду принимать в один чат (None - без лимита)
+            retry_after (int): retry_after в ответе 429 (секунды)
+        """
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.global_limit = global_limit
+        self.chat_limit = chat_limit
+        self.retry_after = retry_after
+        self.calls = Counter()
+        self.rejected = Counter()
+        self.sent_messages = []
+        self._recent_calls = deque()
+        self._recent_chat_calls = defaultdict(deque)
+        self._server = None
+        self._message_id = 0
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}/bot"
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                _, path, _ = request_line.decode().split(" ", 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, value = line.decode().split(":", 1)
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+
+                code, payload = await self.respond(path.rsplit("/", 1)[-1], self._parse_body(headers, body))
+                status = b"200 OK" if code == 200 else b"429 Too Many Requests"
+                writer.write(
+                    b"HTTP/1.1 " + status + b"\r\nContent-Type: application/json\r\n"
+                    b"Content-Length: " + str(len(payload)).encode() + b"\r\n\r\n" + payload
+                )
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    def _parse_body(headers: dict, body: bytes) -> dict:
+        if not body:
+            return {}
+        if headers.get("content-type", "").startswith("application/json"):
+            return json.loads(body)
+        return dict(parse_qsl(body.decode()))
+
+    async def respond(self, method: str, params: dict) -> tuple:
+        """
+        Формирует ответ Bot API на вызов метода.
+
+        Args:
+            method (str): Имя метода
+            params (dict): Параметры вызова
+
+        Returns:
+            tuple: (HTTP-код, тело ответа в JSON)
+        """
+        if self._over_limit(method, params):
+            return 429, json.dumps({
+                "ok": False,
+                "error_code": 429,
+                "description": f"Too Many Requests: retry after {self.retry_after}",
+                "parameters": {"retry_after": self.retry_after},
+            }).encode()
+        return 200, json.dumps({"ok": True, "result": await self._call(method, params)}).encode()
+
+    def _over_limit(self, method: str, params: dict) -> bool:
+        """
+        Проверяет лимиты за последнюю секунду и учитывает принятый вызов.
+
+        Args:
+            method (str): Имя метода
+            params (dict): Параметры вызова
+
+        Returns:
+            bool: True, если вызов нужно отклонить с 429
+        """
+        if method in ("getMe", "getUpdates"):
+            return False
+        now = time.monotonic()
+        windows = [(self._recent_calls, self.global_limit)]
+        if "chat_id" in params:
+            windows.append((self._recent_chat_calls[str(params["chat_id"])], self.chat_limit))
+
+        for window, limit in windows:
+            while window and now - window[0] >= 1:
+                window.popleft()
+            if limit is not None and len(window) >= limit:
+                self.rejected[method] += 1
+                return True
+        for window, _ in windows:
+            window.append(now)
+        return False
+
+    async def _call(self, method: str, params: dict):
+        """
+        Возвращает результат вызова метода Bot API.
+
+        Args:
+            method (str): Имя метода
+            params (dict): Параметры вызова
+
+        Returns:
+            Результат в формате Bot API
+        """
+        self.calls[method] += 1
+        # Даже без задержки вызов отдает управление циклу событий, как настоящий запрос
+        await asyncio.sleep(self.latency)
+
+        if method == "getMe":
+            return BOT_USER
+        if method == "getUpdates":
+            return []
+        if method in ("sendMessage", "editMessageText"):
+            self._message_id += 1
+            chat_id = int(params.get("chat_id", 0))
+            self.sent_messages.append((chat_id, params.get("text")))
+            return {
+                "message_id": int(params.get("message_id", self._message_id)),
+                "date": int(time.time()),
+                "chat": {"id": chat_id, "type": "private"},
+                "from": BOT_USER,
+                "text": params.get("text", ""),
+            }
+        return True
+
+
+class FakeRequest(BaseRequest):
+    """
+    Транспорт PTB, отвечающий из FakeBotApi без сети.
+
+    Подключается через Application.builder().request(FakeRequest(api)).
+    """
+
+    def __init__(self, api: FakeBotApi):
+        self.api = api
+
+    @property
+    def read_timeout(self):
+        return None
+
+    async def initialize(self) -> None:
+        return
+
+    async def shutdown(self) -> None:
+        return
+
+    async def do_request(self, url, method, request_data=None, read_timeout=None, write_timeout=None,
+                         connect_timeout=None, pool_timeout=None) -> tuple:
+        params = request_data.parameters if request_data else {}
+        return await self.api.respond(url.rsplit("/", 1)[-1], params)
+
+
+async def main(port: int, latency_ms: float) -> None:
+    api = FakeBotApi(port=port, latency=latency_ms / 1000)
+    await api.start()
+    print(f"Заглушка Bot API: {api.base_url} (задержка {latency_ms} мс)")
+    await asyncio.Event().wait()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 8081,
+        float(sys.argv[2]) if len(sys.argv) > 2 else 20
+    ))
@@ -0,0 +1,73 @@
+"""
+Нагрузочный тест бронирования: тысячи одновременных попыток записи.
+
+Проверяет, что ни один слот не забронирован дважды, и считает пропускную
+способность. Нужна локальная PostgreSQL с примененными миграциями.
+Запуск: python -m benchmarks.load_booking [попыток] [слотов]
+"""
+
+import asyncio
+import random
+import sys
+import time
+from datetime import date, time as dtime, timedelta
+
+from bot.database.database import Database
+from bot.database.models.booking import Booking
+from bot.database.models.master import Master
+from bot.database.models.time_slot import TimeSlot
+
+
+async def main(attempts: int, slot_count: int) -> None:
+    db = Database()
+    # Все попытки стартуют одновременно: очередь к пулу здесь ожидаема
+    db.max_waiting = attempts
+    db.acquire_timeout = None
+    await db.connect()
+    master = await Master.create(db, "Нагрузка", "Бронирования", f"+7001{int(time.time())}",
+                                 "benchmark")
+    try:
+        day = date.today() + timedelta(days=1)
+        slots = [
+            (master.id, day, dtime(i // 60 % 24, i % 60), dtime((i + 1) // 60 % 24, (i + 1) % 60))
+            for i in range(slot_count)
+        ]
+        slot_ids = await TimeSlot.bulk_create(db, slots)
+
+        rng = random.Random(1)
+
+        async def attempt(client_id: int):
+            if client_id % 2:
+                return await Booking.book_slot(db, rng.choice(slot_ids), day, client_id)
+            return await Booking.book_any_slot(db, master.id, day, client_id)
+
+        started = time.perf_counter()
+        results = await asyncio.gather(*(attempt(i) for i in range(attempts)))
+        elapsed = time.perf_counter() - started
+
+        won = [booking for booking in results if booking]
+        duplicates = await db.fetch("""
+            SELECT slot_id, count(*) AS bookings
+            FROM bookings
+            WHERE master_id = $1 AND status = 'confirmed'
+            GROUP BY slot_id
+            HAVING count(*) > 1
+        """, master.id, use_primary=True)
+        booked_slots = await db.fetchrow("""
+            SELECT count(*) AS booked FROM time_slots
+            WHERE master_id = $1 AND NOT is_available
+        """, master.id, use_primary=True)
+
+        print(f"Попыток: {attempts}, слотов: {slot_count}, успешных: {len(won)}")
+        print(f"Время: {elapsed:.2f} с, {attempts / elapsed:.0f} попыток/с")
+        print(f"Занятых слотов: {booked_slots['booked']}, двойных бронирований: {len(duplicates)}")
+        if duplicates or booked_slots['booked'] != len(won):
+            raise SystemExit("Обнаружено двойное бронирование")
+    finally:
+        await master.delete(db)
+        await db.disconnect()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000,
+                     int(sys.argv[2]) if len(sys.argv) > 2 else 500))
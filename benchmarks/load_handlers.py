@@ -0,0 +1,224 @@
+"""
+Нагрузочный прогон обработчиков бота без сети и базы данных.
+
+Приложение собирается из тех же обработчиков, что и в боте (setup_handlers),
+но вызовы Bot API уходят во внутреннюю заглушку (FakeRequest). Каждый
+синтетический пользователь проходит регистрацию мастера:
+/start -> Стать мастером -> Начать регистрацию -> Согласен -> ФИО -> контакт.
+Обновления подаются через Application.process_update, пользователи
+обрабатываются параллельно, шаги одного пользователя - по порядку.
+
+Отчет: пропускная способность, p50/p95/p99 по каждому обработчику и прирост
+памяти процесса. При превышении порогов скрипт завершается с кодом 1,
+поэтому его можно запускать в CI.
+
+Запуск: python -m benchmarks.load_handlers --users 2000 --concurrency 100
+В CI:   python -m benchmarks.load_handlers --users 500 --concurrency 10 --max-p95-ms 50 --min-throughput 500
+
+Задержки включают ожидание в цикле событий, поэтому растут вместе с --concurrency.
+"""
+
+import argparse
+import asyncio
+import gc
+import os
+import resource
+import sys
+import time
+from functools import wraps
+
+# Настройки загружаются при первом обращении к ним; для прогона без сети подойдут любые значения
+os.environ.setdefault("TELEGRAM_BOT_TOKEN", "1:offline")
+os.environ.setdefault("DB_PASSWORD", "offline")
+
+from telegram import Update
+from telegram.ext import Application, CommandHandler
+
+from benchmarks.fake_bot_api import FakeBotApi, FakeRequest
+from bot.main import setup_handlers
+from bot.router import Router
+
+BOT_USER = {"id": 1, "is_bot": True, "first_name": "Fake", "username": "fake_bot"}
+
+
+def rss_kb() -> int:
+    """Текущий размер резидентной памяти процесса (КБ)."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    # Не Linux: доступен только пиковый размер
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def percentile(values: list, fraction: float) -> float:
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+class UserScript:
+    """
+    Обновления, которые отправляет один пользователь при регистрации мастера.
+    """
+
+    def __init__(self, user_id: int):
+        self.user_id = user_id
+        self.user = {"id": user_id, "is_bot": False, "first_name": f"User{user_id}"}
+        self.chat = {"id": user_id, "type": "private"}
+        self.update_id = user_id * 10
+
+    def _next_id(self) -> int:
+        self.update_id += 1
+        return self.update_id
+
+    def message(self, **fields) -> dict:
+        update_id = self._next_id()
+        return {
+            "update_id": update_id,
+            "message": {"message_id": update_id, "date": 0, "chat": self.chat, "from": self.user, **fields},
+        }
+
+    def callback(self, data: str) -> dict:
+        update_id = self._next_id()
+        return {
+            "update_id": update_id,
+            "callback_query": {
+                "id": str(update_id),
+                "from": self.user,
+                "chat_instance": str(self.user_id),
+                "data": data,
+                "message": {"message_id": update_id, "date": 0, "chat": self.chat,
+                            "from": BOT_USER, "text": "..."},
+            },
+        }
+
+    def updates(self) -> list:
+        return [
+            self.message(text="/start", entities=[{"type": "bot_command", "offset": 0, "length": 6}]),
+            self.callback("become_master"),
+            self.callback("start_master_registration"),
+            self.callback("accept_terms"),
+            self.message(text="Иванов Иван"),
+            self.message(contact={"phone_number": f"+7999{self.user_id:07d}", "first_name": "Иван",
+                                  "user_id": self.user_id}),
+        ]
+
+
+def instrument(application: Application, timings: dict) -> None:
+    """
+    Оборачивает обработчики приложения и маршрутизатора замером времени.
+
+    Args:
+        application (Application): Приложение с зарегистрированными обработчиками
+        timings (dict): Сюда пишутся длительности по имени обработчика
+    """
+    def timed(callback):
+        samples = timings.setdefault(callback.__name__, [])
+
+        @wraps(callback)
+        async def wrapper(update, context):
+            started = time.perf_counter()
+            try:
+                return await callback(update, context)
+            finally:
+                samples.append(time.perf_counter() - started)
+        return wrapper
+
+    routers = set()
+    for handlers in application.handlers.values():
+        for handler in handlers:
+            owner = getattr(handler.callback, "__self__", None)
+            if isinstance(owner, Router):
+                # Один Router обслуживает и callback-запросы, и сообщения
+                if id(owner) in routers:
+                    continue
+                routers.add(id(owner))
+                owner.callbacks = {key: timed(value) for key, value in owner.callbacks.items()}
+                owner.states = {key: timed(value) for key, value in owner.states.items()}
+            elif isinstance(handler, CommandHandler):
+                handler.callback = timed(handler.callback)
+
+
+async def run(users: int, concurrency: int, latency_ms: float) -> dict:
+    api = FakeBotApi(latency=latency_ms / 1000)
+    application = (
+        Application.builder()
+        .token(os.environ["TELEGRAM_BOT_TOKEN"])
+        .request(FakeRequest(api))
+        .get_updates_request(FakeRequest(api))
+        .build()
+    )
+    setup_handlers(application)
+    timings = {}
+    instrument(application, timings)
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def play(user_id: int) -> None:
+        async with semaphore:
+            updates = [Update.de_json(data, application.bot) for data in UserScript(user_id).updates()]
+            for update in updates:
+                await application.process_update(update)
+
+    async with application:
+        gc.collect()
+        memory_before = rss_kb()
+        started = time.perf_counter()
+        await asyncio.gather(*(play(100000 + i) for i in range(users)))
+        elapsed = time.perf_counter() - started
+        gc.collect()
+        memory_after = rss_kb()
+
+    total = sum(len(samples) for samples in timings.values())
+    return {
+        "updates": total,
+        "elapsed": elapsed,
+        "throughput": total / elapsed,
+        "memory_kb": memory_after - memory_before,
+        "api_calls": sum(api.calls.values()),
+        "handlers": {name: sorted(samples) for name, samples in timings.items()},
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--latency-ms", type=float, default=0, help="задержка ответа заглушки Bot API")
+    parser.add_argument("--max-p95-ms", type=float, default=None, help="порог p95 любого обработчика")
+    parser.add_argument("--min-throughput", type=float, default=None, help="порог обновлений в секунду")
+    parser.add_argument("--max-memory-mb", type=float, default=None, help="порог прироста памяти")
+    args = parser.parse_args()
+
+    result = asyncio.run(run(args.users, args.concurrency, args.latency_ms))
+
+    print(f"{args.users} пользователей, одновременно {args.concurrency}: "
+          f"{result['updates']} обновлений за {result['elapsed']:.2f} с, "
+          f"{result['throughput']:.0f} обн/с, вызовов API {result['api_calls']}")
+    print(f"Прирост памяти: {result['memory_kb'] / 1024:.1f} МБ "
+          f"({result['memory_kb'] * 1024 / args.users:.0f} байт на пользователя)")
+    print(f"{'обработчик':<34} {'вызовов':>8} {'p50, мс':>8} {'p95, мс':>8} {'p99, мс':>8}")
+
+    failures = []
+    for name, samples in sorted(result["handlers"].items()):
+        if not samples:
+            continue
+        p50, p95, p99 = (percentile(samples, q) * 1000 for q in (0.5, 0.95, 0.99))
+        print(f"{name:<34} {len(samples):>8} {p50:>8.2f} {p95:>8.2f} {p99:>8.2f}")
+        if args.max_p95_ms is not None and p95 > args.max_p95_ms:
+            failures.append(f"{name}: p95 {p95:.2f} мс > {args.max_p95_ms} мс")
+
+    if args.min_throughput is not None and result["throughput"] < args.min_throughput:
+        failures.append(f"пропускная способность {result['throughput']:.0f} обн/с < {args.min_throughput}")
+    if args.max_memory_mb is not None and result["memory_kb"] / 1024 > args.max_memory_mb:
+        failures.append(f"прирост памяти {result['memory_kb'] / 1024:.1f} МБ > {args.max_memory_mb} МБ")
+
+    if failures:
+        print("Превышены пороги:\n" + "\n".join(failures))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+"""
+Модуль кэша в памяти процесса.
+"""
+
+import time
+from collections import OrderedDict
+from bot.database.database import DatabaseExecutor, Transaction
+from config.settings import Settings
+
+
+class TTLCache:
+    """
+    Ограниченный по размеру кэш с временем жизни записей.
+
+    При переполнении вытесняется запись, к которой дольше всего не обращались.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0):
+        """
+        Инициализирует кэш.
+
+        Args:
+            maxsize (int): Максимальное количество записей
+            ttl (float): Время жизни записи в секундах
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        """
+        Возвращает значение из кэша.
+
+        Args:
+            key: Ключ
+            default: Значение, если ключа нет или запись устарела
+
+        Returns:
+            Значение из кэша или default
+        """
+        item = self._data.get(key)
+        if item is None:
+            self.misses += 1
+            return default
+
+        value, expires_at = item
+        if expires_at < time.monotonic():
+            del self._data[key]
+            self.misses += 1
+            return default
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key, value, ttl: float = None) -> None:
+        """
+        Сохраняет значение в кэш.
+
+        Args:
+            key: Ключ
+            value: Значение
+            ttl (float, optional): Время жизни записи вместо ttl кэша
+        """
+        self._data[key] = (value, time.monotonic() + (self.ttl if ttl is None else ttl))
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def invalidate(self, key) -> None:
+        """
+        Удаляет запись из кэша.
+
+        Args:
+            key: Ключ
+        """
+        self._data.pop(key, None)
+
+    def invalidate_where(self, predicate) -> None:
+        """
+        Удаляет записи, значение которых удовлетворяет условию.
+
+        Проходит по всему кэшу, поэтому подходит только для редких операций.
+
+        Args:
+            predicate: Функция от значения, возвращающая bool
+        """
+        for key in [key for key, (value, _) in self._data.items() if predicate(value)]:
+            del self._data[key]
+
+    def stats(self) -> dict:
+        """
+        Возвращает статистику обращений к кэшу.
+
+        Returns:
+            dict: Количество записей size, попаданий hits, промахов misses
+                и доля попаданий hit_rate
+        """
+        total = self.hits + self.misses
+        return {
+            'size': len(self._data),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0
+        }
+
+    def clear(self) -> None:
+        """
+        Очищает кэш.
+        """
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+def is_cacheable(db: DatabaseExecutor) -> bool:
+    """
+    Проверяет, можно ли читать через кэш.
+
+    Внутри транзакции чтения идут мимо кэша, чтобы видеть свои же изменения.
+    Промахи кэша читаются из основной базы: отстающая реплика после записи
+    вернула бы старую строку, и та жила бы в кэше весь MODEL_CACHE_TTL.
+
+    Args:
+        db (DatabaseExecutor): Подключение к базе данных или открытая транзакция
+
+    Returns:
+        bool: True, если чтение можно обслужить из кэша
+    """
+    return not isinstance(db, Transaction)
+
+
+def run_after_write(db: DatabaseExecutor, invalidate) -> None:
+    """
+    Сбрасывает кэш после изменения данных.
+
+    Если запись идет в транзакции, сброс повторяется после COMMIT: иначе
+    параллельное чтение до фиксации могло бы вернуть в кэш старые данные.
+
+    Args:
+        db (DatabaseExecutor): Подключение к базе данных или открытая транзакция
+        invalidate: Функция без аргументов, удаляющая записи кэша
+    """
+    invalidate()
+    if isinstance(db, Transaction):
+        db.after_commit(invalidate)
+
+
+def invalidate_after_write(db: DatabaseExecutor, cache: TTLCache, *keys) -> None:
+    """
+    Удаляет ключи из кэша после изменения данных (см. run_after_write).
+
+    Args:
+        db (DatabaseExecutor): Подключение к базе данных или открытая транзакция
+        cache (TTLCache): Кэш
+        *keys: Ключи для удаления
+    """
+    def invalidate() -> None:
+        for key in keys:
+            cache.invalidate(key)
+
+    run_after_write(db, invalidate)
+
+
+def configure_model_caches(settings: Settings) -> None:
+    """
+    Применяет к кэшам моделей размер и время жизни из настроек.
+
+    Args:
+        settings (Settings): Загруженные настройки
+    """
+    for cache in (master_cache, service_cache, schedule_cache):
+        cache.maxsize = settings.MODEL_CACHE_SIZE
+        cache.ttl = settings.MODEL_CACHE_TTL
+
+
+# Кэши строк моделей: строки asyncpg неизменяемы, объекты создаются на каждый вызов.
+# Размер и время жизни задает configure_model_caches при запуске бота
+master_cache = TTLCache()
+service_cache = TTLCache()
+schedule_cache = TTLCache()
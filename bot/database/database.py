@@ -2,8 +2,55 @@
 Модуль подключения к базе данных PostgreSQL.
 """
 
+import asyncio
+import contextvars
+import re
+import time
+from contextlib import asynccontextmanager, contextmanager
+from typing import AsyncIterator, Union
 import asyncpg
-from config.settings import DB_HOST, DB_PORT, DB_NAME, DB_USER, DB_PASSWORD
+from bot.database.loader import BatchLoader
+from bot.database.stats import QueryStats
+from bot.startup_profiler import process_uptime
+from config.settings import get_settings
+
+# Позиционные параметры запроса: $1, $2, ...
+QUERY_PARAMETER = re.compile(r"\$(\d+)")
+
+# Включается в Database.use_primary(): чтения текущей задачи идут в основную базу
+_primary_reads = contextvars.ContextVar('primary_reads', default=False)
+
+
+class DatabaseBusyError(Exception):
+    """
+    Пул соединений перегружен: запрос отклонен, не дожидаясь соединения.
+    """
+
+
+class ConcurrentUpdateError(Exception):
+    """
+    Запись изменена или удалена другим запросом после того, как ее прочитали.
+    """
+
+
+async def _timed(stats: QueryStats, query: str, args: tuple, coroutine):
+    """
+    Выполняет запрос и записывает его длительность в статистику.
+
+    Args:
+        stats (QueryStats): Статистика запросов
+        query (str): SQL-запрос (ключ статистики)
+        args (tuple): Параметры запроса
+        coroutine: Корутина, выполняющая запрос
+
+    Returns:
+        Результат корутины
+    """
+    started = time.perf_counter()
+    try:
+        return await coroutine
+    finally:
+        stats.record_query(query, time.perf_counter() - started, args)
 
 
 class Database:
@@ -11,46 +58,310 @@ class Database:
     Класс для работы с базой данных PostgreSQL.
     """
 
-    def __init__(self):
+    def __init__(self, prepared_queries: tuple = (), replica_dsns: list = None):
         """
         Инициализирует параметры подключения к базе данных.
+
+        Args:
+            prepared_queries (tuple): SQL-запросы, которые подготавливаются
+                на каждом новом соединении пула
+            replica_dsns (list, optional): DSN реплик для чтения; у каждой свой
+                пул. По умолчанию DB_REPLICA_DSNS из настроек
         """
-        self.host = DB_HOST
-        self.port = DB_PORT
-        self.database = DB_NAME
-        self.user = DB_USER
-        self.password = DB_PASSWORD
+        settings = get_settings()
+        self.host = settings.DB_HOST
+        self.port = settings.DB_PORT
+        self.database = settings.DB_NAME
+        self.user = settings.DB_USER
+        self.password = settings.DB_PASSWORD
         self.pool = None
+        self.replica_dsns = list(settings.DB_REPLICA_DSNS if replica_dsns is None else replica_dsns)
+        self.replica_pools = []
+        self._next_replica = 0
+        self.prepared_queries = tuple(prepared_queries)
+        self._connect_started_at = None
+        self._first_response_logged = False
+        self.stats = QueryStats(slow_query_threshold=settings.DB_SLOW_QUERY_MS / 1000)
+        self.min_size = settings.DB_POOL_MIN_SIZE
+        self.max_size = settings.DB_POOL_MAX_SIZE
+        self.max_inactive_connection_lifetime = settings.DB_POOL_MAX_INACTIVE_LIFETIME
+        self.statement_timeout_ms = settings.DB_STATEMENT_TIMEOUT_MS
+        self.acquire_timeout = settings.DB_ACQUIRE_TIMEOUT
+        self.max_waiting = settings.DB_POOL_MAX_WAITING
+        self._waiting = 0
+        self._loaders = {}
+
+    async def _init_connection(self, connection: asyncpg.Connection) -> None:
+        """
+        Подготавливает часто используемые запросы на новом соединении пула.
+
+        Connection.prepare() не кладет запрос в кэш выражений соединения,
+        поэтому каждый запрос один раз выполняется через fetch с NULL во всех
+        параметрах: после этого fetch/fetchrow с тем же текстом не тратят
+        время на разбор. Запросы выполняются в транзакции только для чтения,
+        поэтому в prepared_queries допустимы только SELECT, которые при
+        NULL-параметрах не возвращают строк.
+
+        Args:
+            connection (asyncpg.Connection): Новое соединение пула
+        """
+        async with connection.transaction(readonly=True):
+            for query in self.prepared_queries:
+                parameters = max((int(n) for n in QUERY_PARAMETER.findall(query)), default=0)
+                await connection.fetch(query, *([None] * parameters))
+
+    def _log_first_response(self) -> None:
+        """
+        Один раз выводит время от запуска процесса до первого ответа базы.
+
+        В это время входят импорт модулей, открытие пула и подготовка запросов.
+        """
+        if self._first_response_logged or self._connect_started_at is None:
+            return
+        self._first_response_logged = True
+        since_connect_ms = (time.perf_counter() - self._connect_started_at) * 1000
+        print(f"Первый ответ базы данных получен через {process_uptime() * 1000:.0f} мс "
+              f"после запуска процесса ({since_connect_ms:.1f} мс после подключения)")
+
+    async def _create_pool(self, **connect_kwargs) -> asyncpg.Pool:
+        """
+        Создает пул соединений с общими настройками.
+
+        create_pool сразу открывает min_size соединений и для каждого
+        вызывает init, так что первый запрос не ждет подключения.
+
+        Args:
+            **connect_kwargs: Параметры подключения (dsn или host, port и т.д.)
+
+        Returns:
+            asyncpg.Pool: Пул соединений
+        """
+        return await asyncpg.create_pool(
+            **connect_kwargs,
+            min_size=self.min_size,
+            max_size=self.max_size,
+            max_inactive_connection_lifetime=self.max_inactive_connection_lifetime,
+            server_settings={'statement_timeout': str(self.statement_timeout_ms)},
+            init=self._init_connection
+        )
 
     async def connect(self) -> None:
         """
-        Создает пул соединений с базой данных.
+        Создает пулы соединений с основной базой данных и репликами.
+
+        Повторный вызов при открытом пуле ничего не делает.
 
         Raises:
             Exception: Если не удалось подключиться к базе данных
         """
+        if self.pool:
+            return
+
+        self._connect_started_at = time.perf_counter()
+        self._first_response_logged = False
         try:
-            self.pool = await asyncpg.create_pool(
+            self.pool = await self._create_pool(
                 host=self.host,
                 port=self.port,
                 database=self.database,
                 user=self.user,
-                password=self.password,
-                min_size=1,
-                max_size=10
+                password=self.password
             )
-            print("Подключение к базе данных успешно установлено")
+            self.replica_pools = [
+                await self._create_pool(dsn=dsn) for dsn in self.replica_dsns
+            ]
+            elapsed_ms = (time.perf_counter() - self._connect_started_at) * 1000
+            print(f"Подключение к базе данных успешно установлено за {elapsed_ms:.1f} мс "
+                  f"(реплик: {len(self.replica_pools)})")
         except Exception as e:
+            await self.disconnect()
             raise Exception(f"Не удалось подключиться к базе данных: {e}")
 
     async def disconnect(self) -> None:
         """
-        Закрывает пул соединений с базой данных.
+        Закрывает пулы соединений с базой данных.
         """
+        for pool in self.replica_pools:
+            await pool.close()
+        self.replica_pools = []
         if self.pool:
             await self.pool.close()
+            self.pool = None
             print("Подключение к базе данных закрыто")
 
+    @contextmanager
+    def use_primary(self):
+        """
+        Направляет все чтения текущей задачи в основную базу.
+
+        Нужен для чтения сразу после записи, когда реплика может отставать:
+            await master.update(db)
+            with db.use_primary():
+                master = await Master.get_by_id(db, master.id)
+        """
+        token = _primary_reads.set(True)
+        try:
+            yield
+        finally:
+            _primary_reads.reset(token)
+
+    def loader(self, name: str, batch_fn) -> BatchLoader:
+        """
+        Возвращает пакетный загрузчик для вида поиска.
+
+        Для чтений из основной базы (use_primary) заводится отдельный загрузчик,
+        чтобы такие ключи не попали в пакет, который уйдет на реплику.
+
+        Args:
+            name (str): Имя вида поиска, например 'master_by_id'
+            batch_fn: Корутина batch_fn(db, keys) -> dict
+
+        Returns:
+            BatchLoader: Загрузчик
+        """
+        key = (name, _primary_reads.get())
+        loader = self._loaders.get(key)
+        if loader is None:
+            loader = self._loaders[key] = BatchLoader(lambda keys: batch_fn(self, keys))
+        return loader
+
+    def _read_pool(self, use_primary: bool) -> asyncpg.Pool:
+        """
+        Выбирает пул для чтения: реплики по очереди или основную базу.
+
+        Args:
+            use_primary (bool): Читать из основной базы
+
+        Returns:
+            asyncpg.Pool: Пул для запроса
+        """
+        if use_primary or not self.replica_pools or _primary_reads.get():
+            return self.pool
+        pool = self.replica_pools[self._next_replica]
+        self._next_replica = (self._next_replica + 1) % len(self.replica_pools)
+        return pool
+
+    def pool_status(self) -> dict:
+        """
+        Возвращает суммарное состояние пулов соединений.
+
+        Returns:
+            dict: Количество соединений in_use, idle, размер size, max_size
+                и число запросов waiting, ожидающих соединения
+        """
+        pools = [pool for pool in [self.pool, *self.replica_pools] if pool]
+        size = sum(pool.get_size() for pool in pools)
+        idle = sum(pool.get_idle_size() for pool in pools)
+        return {
+            'in_use': size - idle,
+            'idle': idle,
+            'size': size,
+            'max_size': self.max_size * max(len(pools), 1),
+            'waiting': self._waiting
+        }
+
+    def render_metrics(self) -> str:
+        """
+        Выводит статистику запросов и состояние пулов в формате Prometheus.
+
+        Returns:
+            str: Текст метрик
+        """
+        lines = [self.stats.render_prometheus().rstrip("\n")]
+        pools = [("primary", self.pool)] + [
+            (f"replica{index}", pool) for index, pool in enumerate(self.replica_pools)
+        ]
+        for metric in ("in_use", "idle", "size"):
+            lines.append(f"# TYPE db_pool_{metric} gauge")
+            for name, pool in pools:
+                if not pool:
+                    continue
+                size, idle = pool.get_size(), pool.get_idle_size()
+                value = {"in_use": size - idle, "idle": idle, "size": size}[metric]
+                lines.append(f'db_pool_{metric}{{pool="{name}"}} {value}')
+        lines.append("# TYPE db_pool_waiting gauge")
+        lines.append(f"db_pool_waiting {self._waiting}")
+        return "\n".join(lines) + "\n"
+
+    @asynccontextmanager
+    async def _acquire(self, pool: asyncpg.Pool = None) -> AsyncIterator[asyncpg.Connection]:
+        """
+        Берет соединение из пула и записывает время ожидания.
+
+        Если соединения уже ждут max_waiting запросов или соединение не
+        освободилось за acquire_timeout, запрос сразу отклоняется, чтобы
+        обработчики не копились в очереди пула.
+
+        Args:
+            pool (asyncpg.Pool, optional): Пул, по умолчанию основная база
+
+        Yields:
+            asyncpg.Connection: Соединение из пула
+
+        Raises:
+            DatabaseBusyError: Если пул перегружен
+        """
+        pool = pool or self.pool
+        if self._waiting >= self.max_waiting:
+            raise DatabaseBusyError(f"Соединения пула ждут {self._waiting} запросов")
+
+        self._waiting += 1
+        started = time.perf_counter()
+        try:
+            connection = await pool.acquire(timeout=self.acquire_timeout)
+        except asyncio.TimeoutError:
+            raise DatabaseBusyError(
+                f"Соединение не освободилось за {self.acquire_timeout} с"
+            ) from None
+        finally:
+            self._waiting -= 1
+        self.stats.record_acquire(time.perf_counter() - started)
+
+        try:
+            yield connection
+        finally:
+            await pool.release(connection)
+
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator['Transaction']:
+        """
+        Открывает транзакцию на одном соединении из пула основной базы.
+
+        Все запросы через возвращаемый объект идут по одному соединению и
+        фиксируются одним COMMIT при выходе из блока; при исключении
+        транзакция откатывается целиком. Чтения внутри транзакции тоже идут
+        в основную базу и видят только что записанные данные.
+
+        Пример:
+            async with db.transaction() as tx:
+                master = await Master.create(tx, ...)
+                await WorkingSchedule.create(tx, master.id, 1)
+
+        Yields:
+            Transaction: Открытая транзакция
+        """
+        async with self._acquire() as connection:
+            tx = Transaction(connection, self.stats)
+            async with tx.transaction():
+                yield tx
+
+    @asynccontextmanager
+    async def session(self) -> AsyncIterator['Transaction']:
+        """
+        Закрепляет одно соединение основной базы без открытия транзакции.
+
+        Нужен для команд, которые нельзя выполнять в транзакции
+        (CREATE INDEX CONCURRENTLY), и для сессионных блокировок
+        (pg_advisory_lock). Транзакцию на этом же соединении открывает
+        session.transaction(). Вне транзакции каждая команда фиксируется
+        сразу, поэтому функции after_commit вызываются немедленно.
+
+        Yields:
+            Transaction: Объект запросов на закрепленном соединении
+        """
+        async with self._acquire() as connection:
+            yield Transaction(connection, self.stats)
+
     async def execute(self, query: str, *args) -> None:
         """
         Выполняет SQL-запрос без возврата результата.
@@ -62,16 +373,22 @@ class Database:
         Raises:
             Exception: Если произошла ошибка при выполнении запроса
         """
-        async with self.pool.acquire() as connection:
-            await connection.execute(query, *args)
+        async with self._acquire() as connection:
+            await _timed(self.stats, query, args, connection.execute(query, *args))
+        self._log_first_response()
 
-    async def fetch(self, query: str, *args) -> list:
+    async def fetch(self, query: str, *args, use_primary: bool = False) -> list:
         """
         Выполняет SQL-запрос и возвращает список результатов.
 
+        Запрос уходит на реплику (по очереди), если они настроены.
+        Запросы с изменением данных (INSERT ... RETURNING и т.п.) должны
+        передавать use_primary=True.
+
         Args:
             query (str): SQL-запрос
             *args: Параметры для запроса
+            use_primary (bool): Выполнить в основной базе
 
         Returns:
             list: Список результатов запроса
@@ -79,16 +396,21 @@ class Database:
         Raises:
             Exception: Если произошла ошибка при выполнении запроса
         """
-        async with self.pool.acquire() as connection:
-            return await connection.fetch(query, *args)
+        async with self._acquire(self._read_pool(use_primary)) as connection:
+            rows = await _timed(self.stats, query, args, connection.fetch(query, *args))
+        self._log_first_response()
+        return rows
 
-    async def fetchrow(self, query: str, *args):
+    async def fetchrow(self, query: str, *args, use_primary: bool = False):
         """
         Выполняет SQL-запрос и возвращает одну строку результата.
 
+        Маршрутизация такая же, как у fetch.
+
         Args:
             query (str): SQL-запрос
             *args: Параметры для запроса
+            use_primary (bool): Выполнить в основной базе
 
         Returns:
             Row: Одна строка результата или None
@@ -96,5 +418,198 @@ class Database:
         Raises:
             Exception: Если произошла ошибка при выполнении запроса
         """
-        async with self.pool.acquire() as connection:
-            return await connection.fetchrow(query, *args)
\ No newline at end of file
+        async with self._acquire(self._read_pool(use_primary)) as connection:
+            row = await _timed(self.stats, query, args, connection.fetchrow(query, *args))
+        self._log_first_response()
+        return row
+
+    async def executemany(self, query: str, args: list) -> None:
+        """
+        Выполняет один SQL-запрос для набора параметров за один проход.
+
+        Args:
+            query (str): SQL-запрос
+            args (list): Список кортежей параметров
+
+        Raises:
+            Exception: Если произошла ошибка при выполнении запроса
+        """
+        async with self._acquire() as connection:
+            await _timed(self.stats, query, (args,), connection.executemany(query, args))
+        self._log_first_response()
+
+    async def copy_records_to_table(self, table: str, records: list, columns: list) -> str:
+        """
+        Загружает записи в таблицу через COPY.
+
+        Самый быстрый способ массовой вставки, но без RETURNING.
+
+        Args:
+            table (str): Имя таблицы
+            records (list): Список кортежей значений
+            columns (list): Имена столбцов в порядке значений кортежей
+
+        Returns:
+            str: Статус команды COPY
+        """
+        async with self._acquire() as connection:
+            status = await _timed(
+                self.stats, f"COPY {table}", (records,),
+                connection.copy_records_to_table(table, records=records, columns=columns)
+            )
+        self._log_first_response()
+        return status
+
+
+class Transaction:
+    """
+    Открытая транзакция на закрепленном соединении.
+
+    Повторяет интерфейс запросов Database, поэтому методы моделей принимают
+    ее вместо Database без изменений.
+    """
+
+    def __init__(self, connection: asyncpg.Connection, stats: QueryStats):
+        """
+        Инициализирует транзакцию.
+
+        Args:
+            connection (asyncpg.Connection): Соединение, на котором открыта транзакция
+            stats (QueryStats): Статистика запросов объекта Database
+        """
+        self.connection = connection
+        self.stats = stats
+        self.commit_callbacks = []
+        # Глубина вложенных блоков transaction(): 0 - соединение вне транзакции
+        self._depth = 0
+
+    def after_commit(self, callback) -> None:
+        """
+        Регистрирует функцию, которая вызывается после успешного COMMIT.
+
+        При откате транзакции или точки сохранения, внутри которой функция
+        зарегистрирована, она не вызывается. Вне транзакции (на соединении
+        из Database.session()) изменения уже зафиксированы, и функция
+        вызывается сразу.
+
+        Args:
+            callback: Функция без аргументов
+        """
+        if self._depth == 0:
+            callback()
+        else:
+            self.commit_callbacks.append(callback)
+
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator['Transaction']:
+        """
+        Открывает точку сохранения (SAVEPOINT) внутри текущей транзакции.
+
+        При исключении откатываются только изменения внутри блока,
+        внешняя транзакция продолжается. На соединении из Database.session()
+        открывает обычную транзакцию.
+
+        Yields:
+            Transaction: Эта же транзакция
+        """
+        mark = len(self.commit_callbacks)
+        self._depth += 1
+        try:
+            async with self.connection.transaction():
+                yield self
+        except BaseException:
+            # Изменения блока откатились - его функции after_commit не нужны
+            del self.commit_callbacks[mark:]
+            raise
+        finally:
+            self._depth -= 1
+
+        if self._depth == 0:
+            callbacks, self.commit_callbacks = self.commit_callbacks, []
+            for callback in callbacks:
+                callback()
+
+    async def execute(self, query: str, *args) -> None:
+        """
+        Выполняет SQL-запрос без возврата результата.
+
+        Args:
+            query (str): SQL-запрос
+            *args: Параметры для запроса
+        """
+        await _timed(self.stats, query, args, self.connection.execute(query, *args))
+
+    async def fetch(self, query: str, *args, use_primary: bool = True) -> list:
+        """
+        Выполняет SQL-запрос и возвращает список результатов.
+
+        Args:
+            query (str): SQL-запрос
+            *args: Параметры для запроса
+            use_primary (bool): Не используется: транзакция всегда в основной базе
+
+        Returns:
+            list: Список результатов запроса
+        """
+        return await _timed(self.stats, query, args, self.connection.fetch(query, *args))
+
+    async def fetchrow(self, query: str, *args, use_primary: bool = True):
+        """
+        Выполняет SQL-запрос и возвращает одну строку результата.
+
+        Args:
+            query (str): SQL-запрос
+            *args: Параметры для запроса
+            use_primary (bool): Не используется: транзакция всегда в основной базе
+
+        Returns:
+            Row: Одна строка результата или None
+        """
+        return await _timed(self.stats, query, args, self.connection.fetchrow(query, *args))
+
+    async def executemany(self, query: str, args: list) -> None:
+        """
+        Выполняет один SQL-запрос для набора параметров за один проход.
+
+        Args:
+            query (str): SQL-запрос
+            args (list): Список кортежей параметров
+        """
+        await _timed(self.stats, query, (args,), self.connection.executemany(query, args))
+
+    async def copy_records_to_table(self, table: str, records: list, columns: list) -> str:
+        """
+        Загружает записи в таблицу через COPY.
+
+        Args:
+            table (str): Имя таблицы
+            records (list): Список кортежей значений
+            columns (list): Имена столбцов в порядке значений кортежей
+
+        Returns:
+            str: Статус команды COPY
+        """
+        return await _timed(
+            self.stats, f"COPY {table}", (records,),
+            self.connection.copy_records_to_table(table, records=records, columns=columns)
+        )
+
+
+# Любой объект, через который модели выполняют запросы
+DatabaseExecutor = Union[Database, Transaction]
+
+def run_after_commit(db: DatabaseExecutor, callback) -> None:
+    """
+    Вызывает функцию после фиксации изменений.
+
+    В транзакции функция откладывается до COMMIT (см. Transaction.after_commit),
+    вне транзакции изменения уже зафиксированы и функция вызывается сразу.
+
+    Args:
+        db (DatabaseExecutor): Подключение к базе данных или открытая транзакция
+        callback: Функция без аргументов
+    """
+    if isinstance(db, Transaction):
+        db.after_commit(callback)
+    else:
+        callback()
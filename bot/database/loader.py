@@ -0,0 +1,68 @@
+"""
+Модуль пакетной загрузки записей (в духе DataLoader).
+
+Ключи, запрошенные в одном проходе цикла событий, собираются вместе и
+загружаются одним запросом вида WHERE id = ANY($1).
+"""
+
+import asyncio
+
+
+class BatchLoader:
+    """
+    Объединяет одновременные запросы по ключам в один пакетный запрос.
+    """
+
+    def __init__(self, batch_fn):
+        """
+        Инициализирует загрузчик.
+
+        Args:
+            batch_fn: Корутина batch_fn(keys: list) -> dict, возвращающая
+                значения по ключам; отсутствующие ключи дают None
+        """
+        self.batch_fn = batch_fn
+        self.batches = 0
+        self._pending = {}
+        self._task = None
+
+    def load(self, key) -> asyncio.Future:
+        """
+        Ставит ключ в текущий пакет.
+
+        Пакет отправляется, когда цикл событий доходит до задачи загрузчика,
+        то есть после всех задач, уже готовых к выполнению в этом проходе.
+
+        Args:
+            key: Ключ записи
+
+        Returns:
+            asyncio.Future: Значение по ключу или None
+        """
+        future = self._pending.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = self._pending[key] = loop.create_future()
+            if self._task is None:
+                self._task = loop.create_task(self._dispatch())
+        return future
+
+    async def _dispatch(self) -> None:
+        """
+        Загружает накопленный пакет и раздает результаты ожидающим.
+        """
+        pending, self._pending = self._pending, {}
+        self._task = None
+        self.batches += 1
+
+        try:
+            results = await self.batch_fn(list(pending))
+        except Exception as e:
+            for future in pending.values():
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for key, future in pending.items():
+            if not future.done():
+                future.set_result(results.get(key))
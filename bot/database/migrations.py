@@ -1,10 +1,97 @@
 """
 Модуль управления миграциями базы данных.
+
+Каждая миграция применяется на одном закрепленном соединении в одной
+транзакции вместе с записью в schema_migrations. Одновременный запуск с
+нескольких серверов исключается advisory-блокировкой PostgreSQL.
+Контрольная сумма файла сохраняется и сверяется при каждом запуске, так что
+изменение уже примененной миграции обнаруживается сразу.
+
+Миграция, первая строка которой - "-- migrate: no-transaction", выполняется
+вне транзакции по одной команде (нужно для CREATE INDEX CONCURRENTLY). Такие
+миграции должны быть повторяемыми (IF NOT EXISTS): при ошибке часть команд
+уже будет выполнена.
 """
 
+import hashlib
 import os
-import asyncio
-from bot.database.database import Database
+import time
+from bot.database.database import Database, Transaction
+
+# Ключ advisory-блокировки миграций (произвольное постоянное число)
+MIGRATION_LOCK_ID = 7318520401
+
+NO_TRANSACTION_MARKER = "-- migrate: no-transaction"
+
+
+class MigrationError(Exception):
+    """
+    Ошибка проверки или применения миграций.
+    """
+
+
+def split_statements(sql: str) -> list:
+    """
+    Разбивает SQL на отдельные команды по точке с запятой.
+
+    Учитывает строки в кавычках, $$-блоки и комментарии, чтобы не резать
+    тела функций и тексты COMMENT ON.
+
+    Args:
+        sql (str): Содержимое файла миграции
+
+    Returns:
+        list: Команды без завершающей точки с запятой
+    """
+    statements = []
+    start = i = 0
+    length = len(sql)
+    while i < length:
+        char = sql[i]
+        if sql.startswith("--", i):
+            newline = sql.find("\n", i)
+            i = length if newline == -1 else newline + 1
+            continue
+        if sql.startswith("/*", i):
+            end = sql.find("*/", i + 2)
+            i = length if end == -1 else end + 2
+            continue
+        if char in ("'", '"'):
+            end = i + 1
+            while True:
+                end = sql.find(char, end)
+                if end == -1:
+                    end = length
+                    break
+                # Удвоенная кавычка - экранирование
+                if sql.startswith(char * 2, end):
+                    end += 2
+                    continue
+                break
+            i = end + 1
+            continue
+        if char == "$":
+            tag_end = sql.find("$", i + 1)
+            tag = sql[i:tag_end + 1] if tag_end != -1 else ""
+            if tag and (tag == "$$" or tag[1:-1].isidentifier()):
+                end = sql.find(tag, tag_end + 1)
+                i = length if end == -1 else end + len(tag)
+                continue
+        if char == ";":
+            statements.append(sql[start:i])
+            start = i + 1
+        i += 1
+    statements.append(sql[start:])
+    return [statement.strip() for statement in statements if _has_code(statement)]
+
+
+def _has_code(statement: str) -> bool:
+    """Проверяет, что в команде есть что-то кроме пробелов и комментариев."""
+    for line in statement.splitlines():
+        line = line.strip()
+        if line and not line.startswith("--"):
+            return True
+    return False
 
 
 class MigrationManager:
@@ -24,81 +111,153 @@ class MigrationManager:
         self.migrations_dir = migrations_dir
         self.migration_table = "schema_migrations"
 
-    async def init_migration_table(self) -> None:
+    async def init_migration_table(self, session: Transaction) -> None:
         """
-        Создает таблицу для отслеживания миграций.
+        Создает таблицу для отслеживания миграций и добавляет недостающие колонки.
+
+        Args:
+            session (Transaction): Закрепленное соединение
         """
-        query = f"""
+        await session.execute(f"""
         CREATE TABLE IF NOT EXISTS {self.migration_table} (
             id SERIAL PRIMARY KEY,
             version VARCHAR(20) UNIQUE NOT NULL,
             applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
         )
+        """)
+        # Колонки появились позже самой таблицы
+        await session.execute(f"""
+        ALTER TABLE {self.migration_table}
+            ADD COLUMN IF NOT EXISTS filename VARCHAR(255),
+            ADD COLUMN IF NOT EXISTS checksum CHAR(64),
+            ADD COLUMN IF NOT EXISTS duration_ms INTEGER
+        """)
+
+    async def get_applied_migrations(self, session: Transaction) -> dict:
+        """
+        Получает уже примененные миграции.
+
+        Args:
+            session (Transaction): Закрепленное соединение
+
+        Returns:
+            dict: Контрольная сумма (или None для старых записей) по версии
         """
-        await self.database.execute(query)
-        print("Таблица миграций создана")
+        query = f"SELECT version, checksum FROM {self.migration_table} ORDER BY version"
+        rows = await session.fetch(query)
+        return {row['version']: row['checksum'] for row in rows}
 
-    async def get_applied_migrations(self) -> list:
+    def get_migration_files(self) -> list:
         """
-        Получает список уже примененных миграций.
+        Читает файлы миграций по порядку версий.
 
         Returns:
-            list: Список версий примененных миграций
+            list: Кортежи (версия, имя файла, содержимое, контрольная сумма)
+
+        Raises:
+            MigrationError: Если две миграции имеют одну версию
         """
-        query = f"SELECT version FROM {self.migration_table} ORDER BY version"
-        rows = await self.database.fetch(query)
-        return [row['version'] for row in rows]
+        migrations = []
+        if not os.path.exists(self.migrations_dir):
+            return migrations
+
+        versions = set()
+        for filename in sorted(os.listdir(self.migrations_dir)):
+            if not filename.endswith('.sql'):
+                continue
+            version = filename.split('_')[0]
+            if version in versions:
+                raise MigrationError(f"Несколько миграций с версией {version}")
+            versions.add(version)
 
-    async def mark_migration_as_applied(self, version: str) -> None:
+            with open(os.path.join(self.migrations_dir, filename), 'rb') as f:
+                content = f.read()
+            migrations.append((version, filename, content.decode('utf-8'), hashlib.sha256(content).hexdigest()))
+        return migrations
+
+    async def verify_checksums(self, session: Transaction, applied: dict, migrations: list) -> None:
         """
-        Помечает миграцию как примененную.
+        Сверяет контрольные суммы примененных миграций с файлами.
+
+        Записи, сделанные до появления контрольных сумм, получают сумму текущего файла.
 
         Args:
-            version (str): Версия миграции
+            session (Transaction): Закрепленное соединение
+            applied (dict): Примененные миграции
+            migrations (list): Файлы миграций
+
+        Raises:
+            MigrationError: Если примененный файл миграции был изменен
         """
-        query = f"INSERT INTO {self.migration_table} (version) VALUES ($1)"
-        await self.database.execute(query, version)
+        for version, filename, _, checksum in migrations:
+            if version not in applied:
+                continue
+            if applied[version] is None:
+                await session.execute(
+                    f"UPDATE {self.migration_table} SET filename = $2, checksum = $3 WHERE version = $1",
+                    version, filename, checksum
+                )
+            elif applied[version] != checksum:
+                raise MigrationError(
+                    f"Миграция {filename} изменена после применения. "
+                    f"Изменения схемы нужно оформлять новой миграцией"
+                )
 
-    async def apply_migration(self, version: str, sql_content: str) -> None:
+    async def apply_migration(self, session: Transaction, version: str, filename: str,
+                              sql_content: str, checksum: str) -> None:
         """
-        Применяет миграцию к базе данных.
+        Применяет миграцию и записывает ее в schema_migrations.
 
         Args:
+            session (Transaction): Закрепленное соединение
             version (str): Версия миграции
+            filename (str): Имя файла миграции
             sql_content (str): SQL содержимое миграции
+            checksum (str): Контрольная сумма файла
         """
-        # Выполняем миграцию
-        await self.database.execute(sql_content)
-        # Помечаем как примененную
-        await self.mark_migration_as_applied(version)
-        print(f"Миграция {version} успешно применена")
+        record_query = f"""
+        INSERT INTO {self.migration_table} (version, filename, checksum, duration_ms)
+        VALUES ($1, $2, $3, $4)
+        """
+        started = time.perf_counter()
+
+        if sql_content.lstrip().startswith(NO_TRANSACTION_MARKER):
+            # Команды вне транзакции выполняются по одной: несколько команд
+            # в одном запросе PostgreSQL все равно объединяет в транзакцию
+            for statement in split_statements(sql_content):
+                await session.execute(statement)
+            duration_ms = round((time.perf_counter() - started) * 1000)
+            await session.execute(record_query, version, filename, checksum, duration_ms)
+        else:
+            async with session.transaction():
+                await session.execute(sql_content)
+                duration_ms = round((time.perf_counter() - started) * 1000)
+                await session.execute(record_query, version, filename, checksum, duration_ms)
+
+        print(f"Миграция {version} успешно применена за {duration_ms} мс")
 
     async def run_migrations(self) -> None:
         """
         Запускает все непримененные миграции.
+
+        Raises:
+            MigrationError: Если примененный файл миграции был изменен
         """
-        # Инициализируем таблицу миграций
-        await self.init_migration_table()
-
-        # Получаем список уже примененных миграций
-        applied = await self.get_applied_migrations()
-
-        # Получаем список всех файлов миграций
-        migration_files = []
-        if os.path.exists(self.migrations_dir):
-            for filename in sorted(os.listdir(self.migrations_dir)):
-                if filename.endswith('.sql'):
-                    version = filename.split('_')[0]
-                    migration_files.append((version, filename))
-
-        # Применяем непримененные миграции
-        for version, filename in migration_files:
-            if version not in applied:
-                file_path = os.path.join(self.migrations_dir, filename)
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    sql_content = f.read()
+        migrations = self.get_migration_files()
+
+        async with self.database.session() as session:
+            # Второй экземпляр ждет здесь, а затем видит уже примененные миграции
+            await session.execute("SELECT pg_advisory_lock($1)", MIGRATION_LOCK_ID)
+            try:
+                await self.init_migration_table(session)
+                applied = await self.get_applied_migrations(session)
+                await self.verify_checksums(session, applied, migrations)
 
-                print(f"Применяется миграция {version}...")
-                await self.apply_migration(version, sql_content)
+                for version, filename, sql_content, checksum in migrations:
+                    if version not in applied:
+                        print(f"Применяется миграция {version}...")
+                        await self.apply_migration(session, version, filename, sql_content, checksum)
+            finally:
+                await session.execute("SELECT pg_advisory_unlock($1)", MIGRATION_LOCK_ID)
 
-        print("Все миграции применены")
\ No newline at end of file
+        print("Все миграции применены")
@@ -0,0 +1,30 @@
+"""
+Модели базы данных.
+"""
+
+from bot.database.models.master import (
+    SELECT_MASTER_BY_ID,
+    SELECT_MASTERS_BY_IDS,
+    SELECT_MASTER_BY_PHONE
+)
+from bot.database.models.service import (
+    SELECT_SERVICES_BY_MASTER_ID,
+    SELECT_SERVICES_BY_MASTER_IDS,
+    SELECT_SERVICE_BY_ID
+)
+from bot.database.models.schedule import (
+    SELECT_SCHEDULES_BY_MASTER_ID,
+    SELECT_SCHEDULE_BY_MASTER_AND_DAY
+)
+
+# Запросы, которые подготавливаются на каждом соединении пула при старте
+PREPARED_QUERIES = (
+    SELECT_MASTER_BY_ID,
+    SELECT_MASTERS_BY_IDS,
+    SELECT_MASTER_BY_PHONE,
+    SELECT_SERVICES_BY_MASTER_ID,
+    SELECT_SERVICES_BY_MASTER_IDS,
+    SELECT_SERVICE_BY_ID,
+    SELECT_SCHEDULES_BY_MASTER_ID,
+    SELECT_SCHEDULE_BY_MASTER_AND_DAY,
+)
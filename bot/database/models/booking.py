@@ -0,0 +1,216 @@
+"""
+Модель записи клиента и методы бронирования слотов.
+"""
+
+from datetime import date, datetime, time
+from bot.database.database import DatabaseExecutor, run_after_commit
+from bot.scheduling.availability import availability_index
+
+# Захват слота и создание записи одним запросом. Строка слота блокируется
+# через FOR UPDATE SKIP LOCKED: проигравший конкурент не ждет блокировку,
+# а сразу получает пустой результат. ID записи берется из последовательности
+# заранее, чтобы сразу сохранить его в time_slots.booking_id. Условие по дате
+# ($4) оставляет в плане одну секцию time_slots: первичный ключ - (id, date).
+BOOK_SLOT_TEMPLATE = """
+WITH claimed AS (
+    UPDATE time_slots
+    SET is_available = FALSE,
+        booking_id = nextval(pg_get_serial_sequence('bookings', 'id'))
+    WHERE id = (
+        {slot_select}
+        FOR UPDATE SKIP LOCKED
+    )
+      AND date = $4
+      AND is_available
+    RETURNING id, master_id, date, start_time, end_time, booking_id
+)
+INSERT INTO bookings (id, slot_id, master_id, service_id, client_telegram_id,
+                      date, start_time, end_time)
+SELECT booking_id, id, master_id, $2, $3, date, start_time, end_time
+FROM claimed
+RETURNING id, slot_id, master_id, service_id, client_telegram_id, date,
+          start_time, end_time, status, created_at, cancelled_at
+"""
+
+BOOK_SLOT = BOOK_SLOT_TEMPLATE.format(slot_select="""
+        SELECT id FROM time_slots
+        WHERE id = $1 AND date = $4 AND is_available""")
+
+BOOK_ANY_SLOT = BOOK_SLOT_TEMPLATE.format(slot_select="""
+        SELECT id FROM time_slots
+        WHERE master_id = $1 AND date = $4 AND is_available
+        ORDER BY start_time
+        LIMIT 1""")
+
+CANCEL_BOOKING = """
+WITH cancelled AS (
+    UPDATE bookings
+    SET status = 'cancelled', cancelled_at = NOW()
+    WHERE id = $1 AND status = 'confirmed'
+    RETURNING id, slot_id, master_id, date, start_time, end_time
+),
+released AS (
+    UPDATE time_slots t
+    SET is_available = TRUE, booking_id = NULL
+    FROM cancelled c
+    -- Дата слота скопирована в запись: по ней выбирается нужная секция time_slots
+    WHERE t.id = c.slot_id AND t.date = c.date AND t.booking_id = c.id
+)
+SELECT id, master_id, date, start_time, end_time FROM cancelled
+"""
+
+
+class Booking:
+    """
+    Модель записи клиента на временной слот.
+    """
+
+    # Порядок совпадает с порядком столбцов в SELECT/RETURNING: на нем построен from_row
+    __slots__ = (
+        'id', 'slot_id', 'master_id', 'service_id', 'client_telegram_id', 'date',
+        'start_time', 'end_time', 'status', 'created_at', 'cancelled_at'
+    )
+
+    def __init__(self, id: int = None, slot_id: int = None, master_id: int = None,
+                 service_id: int = None, client_telegram_id: int = None,
+                 date: date = None, start_time: time = None, end_time: time = None,
+                 status: str = "confirmed", created_at: datetime = None,
+                 cancelled_at: datetime = None):
+        """
+        Инициализирует объект записи.
+
+        Args:
+            id (int, optional): ID записи
+            slot_id (int): ID временного слота
+            master_id (int): ID мастера
+            service_id (int, optional): ID услуги
+            client_telegram_id (int): Telegram ID клиента
+            date (date): Дата записи
+            start_time (time): Время начала
+            end_time (time): Время окончания
+            status (str): Статус записи ('confirmed' или 'cancelled')
+            created_at (datetime, optional): Дата создания
+            cancelled_at (datetime, optional): Дата отмены
+        """
+        self.id = id
+        self.slot_id = slot_id
+        self.master_id = master_id
+        self.service_id = service_id
+        self.client_telegram_id = client_telegram_id
+        self.date = date
+        self.start_time = start_time
+        self.end_time = end_time
+        self.status = status
+        self.created_at = created_at
+        self.cancelled_at = cancelled_at
+
+    @classmethod
+    def from_row(cls, row) -> 'Booking':
+        """
+        Быстро создает объект из строки запроса.
+
+        Значения берутся по позициям, без промежуточного словаря, поэтому
+        запрос должен возвращать все столбцы в порядке __slots__.
+
+        Args:
+            row (Record): Строка результата запроса
+
+        Returns:
+            Booking: Объект модели
+        """
+        booking = cls.__new__(cls)
+        (booking.id, booking.slot_id, booking.master_id, booking.service_id,
+         booking.client_telegram_id, booking.date, booking.start_time, booking.end_time,
+         booking.status, booking.created_at, booking.cancelled_at) = row
+        return booking
+
+    @classmethod
+    def _booked(cls, db: DatabaseExecutor, row) -> 'Booking':
+        """
+        Создает объект новой записи и после COMMIT убирает слот из индекса свободного времени.
+
+        Args:
+            db (DatabaseExecutor): Подключение к базе данных или открытая транзакция
+            row (Record): Строка результата бронирования
+
+        Returns:
+            Booking: Объект модели
+        """
+        booking = cls.from_row(row)
+        run_after_commit(db, lambda: availability_index.apply_slot(
+            booking.master_id, booking.date, booking.start_time, booking.end_time, False
+        ))
+        return booking
+
+    @classmethod
+    async def book_slot(cls, db: DatabaseExecutor, slot_id: int, day: date,
+                        client_telegram_id: int, service_id: int = None) -> 'Booking':
+        """
+        Бронирует конкретный слот.
+
+        Слот захватывается одним условным запросом, поэтому из одновременных
+        попыток выигрывает ровно одна, а остальные не ждут блокировок.
+
+        Args:
+            db (DatabaseExecutor): Подключение к базе данных или открытая транзакция
+            slot_id (int): ID слота
+            day (date): Дата слота
+            client_telegram_id (int): Telegram ID клиента
+            service_id (int, optional): ID услуги
+
+        Returns:
+            Booking: Созданная запись или None, если слот уже занят
+        """
+        row = await db.fetchrow(BOOK_SLOT, slot_id, service_id, client_telegram_id, day,
+                                use_primary=True)
+        if not row:
+            return None
+
+        return cls._booked(db, row)
+
+    @classmethod
+    async def book_any_slot(cls, db: DatabaseExecutor, master_id: int, day: date,
+                            client_telegram_id: int, service_id: int = None) -> 'Booking':
+        """
+        Бронирует самый ранний свободный слот мастера на дату.
+
+        Слоты, которые в этот момент захватывают другие клиенты, пропускаются.
+
+        Args:
+            db (DatabaseExecutor): Подключение к базе данных или открытая транзакция
+            master_id (int): ID мастера
+            day (date): Дата
+            client_telegram_id (int): Telegram ID клиента
+            service_id (int, optional): ID услуги
+
+        Returns:
+            Booking: Созданная запись или None, если свободных слотов нет
+        """
+        row = await db.fetchrow(BOOK_ANY_SLOT, master_id, service_id, client_telegram_id, day,
+                                use_primary=True)
+        if not row:
+            return None
+
+        return cls._booked(db, row)
+
+    async def cancel(self, db: DatabaseExecutor) -> bool:
+        """
+        Отменяет запись и освобождает слот.
+
+        После COMMIT слот возвращается в индекс свободного времени.
+
+        Args:
+            db (DatabaseExecutor): Подключение к базе данных или открытая транзакция
+
+        Returns:
+            bool: True, если запись была отменена этим вызовом
+        """
+        row = await db.fetchrow(CANCEL_BOOKING, self.id, use_primary=True)
+        if not row:
+            return False
+
+        self.status = "cancelled"
+        run_after_commit(db, lambda: availability_index.apply_slot(
+            row['master_id'], row['date'], row['start_time'], row['end_time'], True
+        ))
+        return True
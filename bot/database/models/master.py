@@ -3,7 +3,52 @@
 """
 
 from datetime import datetime
-from bot.database.database import Database
+from bot.database.database import DatabaseExecutor, ConcurrentUpdateError, run_after_commit
+from bot.database.cache import (
+    master_cache,
+    service_cache,
+    schedule_cache,
+    is_cacheable,
+    invalidate_after_write,
+    run_after_write
+)
+from bot.scheduling.availability import availability_index
+
+SELECT_MASTER_BY_ID = """
+SELECT id, first_name, last_name, phone_number, specialization,
+       photo_url, description, experience_years, created_at, updated_at, version
+FROM masters
+WHERE id = $1
+"""
+
+SELECT_MASTERS_BY_IDS = """
+SELECT id, first_name, last_name, phone_number, specialization,
+       photo_url, description, experience_years, created_at, updated_at, version
+FROM masters
+WHERE id = ANY($1::int[])
+"""
+
+SELECT_MASTER_BY_PHONE = """
+SELECT id, first_name, last_name, phone_number, specialization,
+       photo_url, description, experience_years, created_at, updated_at, version
+FROM masters
+WHERE phone_number = $1
+"""
+
+
+async def fetch_master_rows(db: DatabaseExecutor, master_ids: list) -> dict:
+    """
+    Загружает строки мастеров одним запросом.
+
+    Args:
+        db (DatabaseExecutor): Подключение к базе данных или открытая транзакция
+        master_ids (list): ID мастеров
+
+    Returns:
+        dict: Строки мастеров по ID (ненайденных ID в словаре нет)
+    """
+    rows = await db.fetch(SELECT_MASTERS_BY_IDS, master_ids)
+    return {row['id']: row for row in rows}
 
 
 class Master:
@@ -11,11 +56,26 @@ class Master:
     Модель мастера.
     """
 
+    # Порядок совпадает с порядком столбцов в SELECT/RETURNING: на нем построен from_row.
+    # _loaded - значения столбцов на момент чтения из базы, по ним update находит измененные поля;
+    # _pending - (транзакция, значения) после update в еще не зафиксированной транзакции
+    __slots__ = (
+        'id', 'first_name', 'last_name', 'phone_number', 'specialization', 'photo_url',
+        'description', 'experience_years', 'created_at', 'updated_at', 'version', '_loaded',
+        '_pending'
+    )
+
+    # Поля, которые меняет update, и их позиции в строке запроса
+    UPDATABLE_FIELDS = (
+        ('first_name', 1), ('last_name', 2), ('phone_number', 3), ('specialization', 4),
+        ('photo_url', 5), ('description', 6), ('experience_years', 7)
+    )
+
     def __init__(self, id: int = None, first_name: str = "", last_name: str = "",
                  phone_number: str = "", specialization: str = "",
                  photo_url: str = None, description: str = "",
                  experience_years: int = 0, created_at: datetime = None,
-                 updated_at: datetime = None):
+                 updated_at: datetime = None, version: int = None):
         """
         Инициализирует объект мастера.
 
@@ -30,6 +90,7 @@ class Master:
             experience_years (int): Стаж в годах
             created_at (datetime, optional): Дата создания
             updated_at (datetime, optional): Дата обновления
+            version (int, optional): Версия строки, прочитанная из базы
         """
         self.id = id
         self.first_name = first_name
@@ -41,16 +102,70 @@ class Master:
         self.experience_years = experience_years
         self.created_at = created_at
         self.updated_at = updated_at
+        self.version = version
+        self._loaded = None
+        self._pending = None
 
     @classmethod
-    async def create(cls, db: Database, first_name: str, last_name: str,
+    def from_row(cls, row) -> 'Master':
+        """
+        Быстро создает объект из строки запроса.
+
+        Значения берутся по позициям, без промежуточного словаря, поэтому
+        запрос должен возвращать все столбцы в порядке __slots__.
+
+        Args:
+            row (Record): Строка результата запроса
+
+        Returns:
+            Master: Объект модели
+        """
+        master = cls.__new__(cls)
+        (master.id, master.first_name, master.last_name, master.phone_number,
+         master.specialization, master.photo_url, master.description,
+         master.experience_years, master.created_at, master.updated_at, master.version) = row
+        master._loaded = row
+        master._pending = None
+        return master
+
+    def _snapshot(self) -> tuple:
+        """
+        Возвращает текущие значения столбцов в порядке __slots__.
+        """
+        return (self.id, self.first_name, self.last_name, self.phone_number,
+                self.specialization, self.photo_url, self.description,
+                self.experience_years, self.created_at, self.updated_at, self.version)
+
+    def changed_fields(self) -> dict:
+        """
+        Возвращает поля, измененные после чтения из базы.
+
+        Для объекта, созданного конструктором, измененными считаются все поля.
+
+        Returns:
+            dict: Новые значения по имени поля
+        """
+        return self._changed_since(self._loaded)
+
+    def _changed_since(self, loaded) -> dict:
+        """
+        Возвращает поля, отличающиеся от сохраненных значений (None - все поля).
+        """
+        return {
+            name: getattr(self, name)
+            for name, position in self.UPDATABLE_FIELDS
+            if loaded is None or getattr(self, name) != loaded[position]
+        }
+
+    @classmethod
+    async def create(cls, db: DatabaseExecutor, first_name: str, last_name: str,
                      phone_number: str, specialization: str, description: str = "",
                      experience_years: int = 0, photo_url: str = None) -> 'Master':
         """
         Создает нового мастера в базе данных.
 
         Args:
-            db (Database): Объект подключения к базе данных
+            db (DatabaseExecutor): Подключение к базе данных или открытая транзакция
             first_name (str): Имя мастера
             last_name (str): Фамилия мастера
             phone_number (str): Номер телефона
@@ -66,11 +181,12 @@ class Master:
         INSERT INTO masters (first_name, last_name, phone_number, specialization, 
                            photo_url, description, experience_years)
         VALUES ($1, $2, $3, $4, $5, $6, $7)
-        RETURNING id, created_at, updated_at
+        RETURNING id, created_at, updated_at, version
         """
 
         row = await db.fetchrow(query, first_name, last_name, phone_number,
-                                specialization, photo_url, description, experience_years)
+                                specialization, photo_url, description, experience_years,
+                                use_primary=True)
 
         master = cls(
             id=row['id'],
@@ -82,85 +198,250 @@ class Master:
             description=description,
             experience_years=experience_years,
             created_at=row['created_at'],
-            updated_at=row['updated_at']
+            updated_at=row['updated_at'],
+            version=row['version']
         )
+        master._loaded = master._snapshot()
+        run_after_commit(db, lambda: availability_index.set_master(master.id, specialization))
 
         return master
 
     @classmethod
-    async def get_by_id(cls, db: Database, master_id: int) -> 'Master':
+    async def get_by_id(cls, db: DatabaseExecutor, master_id: int) -> 'Master':
         """
         Получает мастера по ID.
 
         Args:
-            db (Database): Объект подключения к базе данных
+            db (DatabaseExecutor): Подключение к базе данных или открытая транзакция
             master_id (int): ID мастера
 
         Returns:
             Master: Объект мастера или None, если не найден
         """
-        query = """
-        SELECT id, first_name, last_name, phone_number, specialization, 
-               photo_url, description, experience_years, created_at, updated_at
-        FROM masters
-        WHERE id = $1
-        """
+        if is_cacheable(db):
+            row = master_cache.get(('id', master_id))
+            if row is None:
+                # Одновременные запросы из разных обработчиков уходят одним ANY($1);
+                # кэш заполняется только из основной базы (см. is_cacheable)
+                with db.use_primary():
+                    row = await db.loader('master_by_id', fetch_master_rows).load(master_id)
+                if row is not None:
+                    master_cache.set(('id', master_id), row)
+        else:
+            row = await db.fetchrow(SELECT_MASTER_BY_ID, master_id)
 
-        row = await db.fetchrow(query, master_id)
         if not row:
             return None
 
-        return cls(**row)
+        return cls.from_row(row)
+
+    @classmethod
+    async def get_many_by_ids(cls, db: DatabaseExecutor, master_ids: list) -> dict:
+        """
+        Получает нескольких мастеров одним запросом.
+
+        Args:
+            db (DatabaseExecutor): Подключение к базе данных или открытая транзакция
+            master_ids (list): ID мастеров
+
+        Returns:
+            dict: Объекты Master по ID (ненайденных ID в словаре нет)
+        """
+        rows = await fetch_master_rows(db, list(master_ids))
+        return {master_id: cls.from_row(row) for master_id, row in rows.items()}
 
     @classmethod
-    async def get_by_phone(cls, db: Database, phone_number: str) -> 'Master':
+    async def get_by_phone(cls, db: DatabaseExecutor, phone_number: str) -> 'Master':
         """
         Получает мастера по номеру телефона.
 
         Args:
-            db (Database): Объект подключения к базе данных
+            db (DatabaseExecutor): Подключение к базе данных или открытая транзакция
             phone_number (str): Номер телефона
 
         Returns:
             Master: Объект мастера или None, если не найден
         """
-        query = """
-        SELECT id, first_name, last_name, phone_number, specialization, 
-               photo_url, description, experience_years, created_at, updated_at
-        FROM masters
-        WHERE phone_number = $1
-        """
+        cacheable = is_cacheable(db)
+        if cacheable:
+            # Телефон ссылается на ID; строка проверяется, т.к. телефон мог смениться
+            master_id = master_cache.get(('phone', phone_number))
+            row = master_cache.get(('id', master_id)) if master_id is not None else None
+            if row is not None and row['phone_number'] == phone_number:
+                return cls.from_row(row)
 
-        row = await db.fetchrow(query, phone_number)
+        row = await db.fetchrow(SELECT_MASTER_BY_PHONE, phone_number, use_primary=cacheable)
         if not row:
             return None
 
-        return cls(**row)
+        if cacheable:
+            master_cache.set(('id', row['id']), row)
+            master_cache.set(('phone', phone_number), row['id'])
+        return cls.from_row(row)
 
-    async def update(self, db: Database) -> None:
+    @classmethod
+    async def search(cls, db: DatabaseExecutor, specialization: str = None, name: str = None,
+                     cursor: int = None, forward: bool = True, limit: int = 5) -> tuple:
         """
-        Обновляет информацию о мастере в базе данных.
+        Ищет мастеров по специализации и/или части ФИО с keyset-пагинацией.
+
+        Мастера упорядочены по (specialization, id). Курсор - ID мастера на
+        границе текущей страницы: следующая страница начинается после него,
+        предыдущая заканчивается перед ним.
 
         Args:
-            db (Database): Объект подключения к базе данных
+            db (DatabaseExecutor): Подключение к базе данных или открытая транзакция
+            specialization (str, optional): Точная специализация
+            name (str, optional): Часть фамилии и имени
+            cursor (int, optional): ID мастера на границе страницы
+            forward (bool): True - страница после курсора, False - перед ним
+            limit (int): Размер страницы
+
+        Returns:
+            tuple: (список объектов Master в порядке сортировки,
+                есть ли еще страницы в направлении поиска)
         """
-        query = """
+        conditions = []
+        args = []
+
+        if specialization:
+            args.append(specialization)
+            conditions.append(f"specialization = ${len(args)}")
+
+        if name:
+            pattern = name.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            args.append(f"%{pattern}%")
+            conditions.append(f"(last_name || ' ' || first_name) ILIKE ${len(args)}")
+
+        if cursor is not None:
+            args.append(cursor)
+            operator = ">" if forward else "<"
+            conditions.append(
+                f"(specialization, id) {operator} "
+                f"(SELECT specialization, id FROM masters WHERE id = ${len(args)})"
+            )
+
+        order = "ASC" if forward else "DESC"
+        args.append(limit + 1)
+        query = f"""
+        SELECT id, first_name, last_name, phone_number, specialization,
+               photo_url, description, experience_years, created_at, updated_at, version
+        FROM masters
+        {"WHERE " + " AND ".join(conditions) if conditions else ""}
+        ORDER BY specialization {order}, id {order}
+        LIMIT ${len(args)}
+        """
+
+        rows = await db.fetch(query, *args)
+        has_more = len(rows) > limit
+        masters = [cls.from_row(row) for row in rows[:limit]]
+        if not forward:
+            masters.reverse()
+
+        return masters, has_more
+
+    @classmethod
+    async def get_specializations(cls, db: DatabaseExecutor) -> list:
+        """
+        Получает список специализаций, по которым есть мастера.
+
+        Args:
+            db (DatabaseExecutor): Подключение к базе данных или открытая транзакция
+
+        Returns:
+            list: Отсортированный список специализаций
+        """
+        rows = await db.fetch("SELECT DISTINCT specialization FROM masters ORDER BY specialization")
+        return [row['specialization'] for row in rows]
+
+    async def update(self, db: DatabaseExecutor) -> bool:
+        """
+        Сохраняет в базу измененные поля мастера.
+
+        UPDATE перечисляет только поля, измененные после чтения (changed_fields),
+        а version и updated_at выставляет сервер. Потерянные обновления
+        отсекаются без блокировок: строка обновляется, только если ее версия
+        совпадает с прочитанной, иначе ее уже изменил кто-то другой.
+
+        Новые версия, updated_at и сохраненное состояние попадают в объект после
+        COMMIT: при откате транзакции объект остается согласованным с базой.
+        Повторный вызов в той же транзакции учитывает ее незафиксированную версию.
+
+        Args:
+            db (DatabaseExecutor): Подключение к базе данных или открытая транзакция
+
+        Returns:
+            bool: True, если запрос выполнялся; False, если изменений не было
+
+        Raises:
+            ConcurrentUpdateError: Если мастер изменен или удален после чтения
+        """
+        loaded, version = self._loaded, self.version
+        # Повторное изменение в той же транзакции сверяется с ее незафиксированной версией
+        if self._pending is not None and self._pending[0] is db:
+            loaded = self._pending[1]
+            version = loaded[-1]
+
+        changed = self._changed_since(loaded)
+        if not changed:
+            return False
+
+        args = list(changed.values())
+        assignments = [f"{name} = ${position}" for position, name in enumerate(changed, start=1)]
+        args.append(self.id)
+        conditions = [f"id = ${len(args)}"]
+        # Объект без версии (собран вручную) обновляется без проверки
+        if version is not None:
+            args.append(version)
+            conditions.append(f"version = ${len(args)}")
+
+        query = f"""
         UPDATE masters
-        SET first_name = $1, last_name = $2, phone_number = $3, specialization = $4,
-            photo_url = $5, description = $6, experience_years = $7, updated_at = NOW()
-        WHERE id = $8
+        SET {", ".join(assignments)}, updated_at = NOW(), version = version + 1
+        WHERE {" AND ".join(conditions)}
+        RETURNING updated_at, version
         """
 
-        await db.execute(query, self.first_name, self.last_name, self.phone_number,
-                         self.specialization, self.photo_url, self.description,
-                         self.experience_years, self.id)
+        row = await db.fetchrow(query, *args, use_primary=True)
+        if not row:
+            # В кэше, скорее всего, устаревшая строка: следующее чтение пойдет в базу
+            master_cache.invalidate(('id', self.id))
+            raise ConcurrentUpdateError(f"Мастер {self.id} изменен или удален другим запросом")
 
-    async def delete(self, db: Database) -> None:
+        # Сохраненным считается состояние на момент UPDATE, а не на момент COMMIT
+        saved = self._snapshot()[:-2] + (row['updated_at'], row['version'])
+        self._pending = (db, saved)
+
+        def apply() -> None:
+            self.updated_at, self.version = row['updated_at'], row['version']
+            self._loaded = saved
+            self._pending = None
+
+        run_after_commit(db, apply)
+        invalidate_after_write(db, master_cache, ('id', self.id))
+        if 'specialization' in changed:
+            specialization = self.specialization
+            run_after_commit(db, lambda: availability_index.set_master(self.id, specialization))
+        return True
+
+    async def delete(self, db: DatabaseExecutor) -> None:
         """
         Удаляет мастера из базы данных.
 
         Args:
-            db (Database): Объект подключения к базе данных
+            db (DatabaseExecutor): Подключение к базе данных или открытая транзакция
         """
         query = "DELETE FROM masters WHERE id = $1"
-        await db.execute(query, self.id)
\ No newline at end of file
+        await db.execute(query, self.id)
+
+        # Услуги и график удаляются каскадно вместе с мастером
+        def invalidate() -> None:
+            master_cache.invalidate(('id', self.id))
+            service_cache.invalidate(('master', self.id))
+            service_cache.invalidate_where(
+                lambda value: not isinstance(value, list) and value['master_id'] == self.id
+            )
+            schedule_cache.invalidate(('master', self.id))
+
+        run_after_write(db, invalidate)
+        run_after_commit(db, lambda: availability_index.remove_master(self.id))
\ No newline at end of file
@@ -3,7 +3,44 @@
 """
 
 from datetime import datetime, time
-from bot.database.database import Database
+from bot.database.database import DatabaseExecutor
+from bot.database.cache import schedule_cache, is_cacheable, invalidate_after_write
+
+SELECT_SCHEDULES_BY_MASTER_ID = """
+SELECT id, master_id, day_of_week, is_working, start_time, end_time,
+       break_start_time, break_end_time, created_at
+FROM working_schedules
+WHERE master_id = $1
+ORDER BY day_of_week
+"""
+
+SELECT_SCHEDULE_BY_MASTER_AND_DAY = """
+SELECT id, master_id, day_of_week, is_working, start_time, end_time,
+       break_start_time, break_end_time, created_at
+FROM working_schedules
+WHERE master_id = $1 AND day_of_week = $2
+"""
+
+# Неизмененные дни отсекает условие DO UPDATE ... WHERE: для них строка не
+# перезаписывается и не попадает в RETURNING
+UPSERT_WEEK = """
+INSERT INTO working_schedules (master_id, day_of_week, is_working,
+                               start_time, end_time, break_start_time, break_end_time)
+SELECT $1::int, d.*
+FROM unnest($2::int[], $3::bool[], $4::time[], $5::time[], $6::time[], $7::time[]) AS d
+ON CONFLICT (master_id, day_of_week) DO UPDATE
+SET is_working = EXCLUDED.is_working,
+    start_time = EXCLUDED.start_time,
+    end_time = EXCLUDED.end_time,
+    break_start_time = EXCLUDED.break_start_time,
+    break_end_time = EXCLUDED.break_end_time
+WHERE (working_schedules.is_working, working_schedules.start_time, working_schedules.end_time,
+       working_schedules.break_start_time, working_schedules.break_end_time)
+      IS DISTINCT FROM
+      (EXCLUDED.is_working, EXCLUDED.start_time, EXCLUDED.end_time,
+       EXCLUDED.break_start_time, EXCLUDED.break_end_time)
+RETURNING day_of_week
+"""
 
 
 class WorkingSchedule:
@@ -11,6 +48,12 @@ class WorkingSchedule:
     Модель графика работы мастера.
     """
 
+    # Порядок совпадает с порядком столбцов в SELECT/RETURNING: на нем построен from_row
+    __slots__ = (
+        'id', 'master_id', 'day_of_week', 'is_working', 'start_time', 'end_time',
+        'break_start_time', 'break_end_time', 'created_at'
+    )
+
     def __init__(self, id: int = None, master_id: int = None, day_of_week: int = None,
                  is_working: bool = True, start_time: time = None, end_time: time = None,
                  break_start_time: time = None, break_end_time: time = None,
@@ -40,7 +83,27 @@ class WorkingSchedule:
         self.created_at = created_at
 
     @classmethod
-    async def create(cls, db: Database, master_id: int, day_of_week: int,
+    def from_row(cls, row) -> 'WorkingSchedule':
+        """
+        Быстро создает объект из строки запроса.
+
+        Значения берутся по позициям, без промежуточного словаря, поэтому
+        запрос должен возвращать все столбцы в порядке __slots__.
+
+        Args:
+            row (Record): Строка результата запроса
+
+        Returns:
+            WorkingSchedule: Объект модели
+        """
+        schedule = cls.__new__(cls)
+        (schedule.id, schedule.master_id, schedule.day_of_week, schedule.is_working,
+         schedule.start_time, schedule.end_time, schedule.break_start_time,
+         schedule.break_end_time, schedule.created_at) = row
+        return schedule
+
+    @classmethod
+    async def create(cls, db: DatabaseExecutor, master_id: int, day_of_week: int,
                      is_working: bool = True, start_time: str = None,
                      end_time: str = None, break_start_time: str = None,
                      break_end_time: str = None) -> 'WorkingSchedule':
@@ -48,7 +111,7 @@ class WorkingSchedule:
         Создает запись графика работы в базе данных.
 
         Args:
-            db (Database): Объект подключения к базе данных
+            db (DatabaseExecutor): Подключение к базе данных или открытая транзакция
             master_id (int): ID мастера
             day_of_week (int): День недели (1=Пн, 7=Вс)
             is_working (bool): Рабочий день или выходной
@@ -68,7 +131,9 @@ class WorkingSchedule:
         """
 
         row = await db.fetchrow(query, master_id, day_of_week, is_working,
-                                start_time, end_time, break_start_time, break_end_time)
+                                start_time, end_time, break_start_time, break_end_time,
+                                use_primary=True)
+        invalidate_after_write(db, schedule_cache, ('master', master_id))
 
         schedule = cls(
             id=row['id'],
@@ -85,50 +150,141 @@ class WorkingSchedule:
         return schedule
 
     @classmethod
-    async def get_by_master_id(cls, db: Database, master_id: int) -> list:
+    async def bulk_create(cls, db: DatabaseExecutor, schedules: list) -> list:
+        """
+        Создает несколько записей графика работы одним запросом.
+
+        Args:
+            db (DatabaseExecutor): Подключение к базе данных или открытая транзакция
+            schedules (list): Список словарей с ключами master_id, day_of_week и
+                необязательными is_working, start_time, end_time,
+                break_start_time, break_end_time (время - объекты time)
+
+        Returns:
+            list: ID созданных записей в порядке входного списка
+        """
+        if not schedules:
+            return []
+
+        # Порядок RETURNING не гарантирован: ID выдаются заранее и
+        # возвращаются по номеру строки во входных массивах
+        query = """
+        WITH input AS MATERIALIZED (
+            SELECT nextval(pg_get_serial_sequence('working_schedules', 'id')) AS id, u.*
+            FROM unnest($1::int[], $2::int[], $3::bool[], $4::time[],
+                        $5::time[], $6::time[], $7::time[])
+                 WITH ORDINALITY AS u(master_id, day_of_week, is_working, start_time,
+                                      end_time, break_start_time, break_end_time, n)
+        ),
+        inserted AS (
+            INSERT INTO working_schedules (id, master_id, day_of_week, is_working,
+                                           start_time, end_time, break_start_time, break_end_time)
+            SELECT id, master_id, day_of_week, is_working,
+                   start_time, end_time, break_start_time, break_end_time
+            FROM input
+        )
+        SELECT id FROM input ORDER BY n
+        """
+
+        rows = await db.fetch(
+            query,
+            [s['master_id'] for s in schedules],
+            [s['day_of_week'] for s in schedules],
+            [s.get('is_working', True) for s in schedules],
+            [s.get('start_time') for s in schedules],
+            [s.get('end_time') for s in schedules],
+            [s.get('break_start_time') for s in schedules],
+            [s.get('break_end_time') for s in schedules],
+            use_primary=True
+        )
+        invalidate_after_write(db, schedule_cache, *{('master', s['master_id']) for s in schedules})
+        return [row['id'] for row in rows]
+
+    @classmethod
+    async def upsert_week(cls, db: DatabaseExecutor, master_id: int, days: list) -> list:
+        """
+        Сохраняет график мастера на несколько дней недели одним запросом.
+
+        Отсутствующие дни создаются, существующие перезаписываются. Дни,
+        которых нет в days, не меняются. Возвращаются только дни, в которых
+        что-то действительно изменилось, - их и нужно передать в
+        SlotGenerator.regenerate_master:
+
+            changed = await WorkingSchedule.upsert_week(db, master_id, days)
+            if changed:
+                await SlotGenerator(db).regenerate_master(master_id, changed)
+
+        Args:
+            db (DatabaseExecutor): Подключение к базе данных или открытая транзакция
+            master_id (int): ID мастера
+            days (list): Список словарей с ключом day_of_week и необязательными
+                is_working, start_time, end_time, break_start_time,
+                break_end_time (время - объекты time)
+
+        Returns:
+            list: Измененные дни недели по возрастанию
+
+        Raises:
+            ValueError: Если день недели указан несколько раз
+        """
+        if not days:
+            return []
+
+        days_of_week = [d['day_of_week'] for d in days]
+        if len(set(days_of_week)) != len(days_of_week):
+            raise ValueError(f"Дни недели повторяются: {days_of_week}")
+
+        rows = await db.fetch(
+            UPSERT_WEEK,
+            master_id,
+            days_of_week,
+            [d.get('is_working', True) for d in days],
+            [d.get('start_time') for d in days],
+            [d.get('end_time') for d in days],
+            [d.get('break_start_time') for d in days],
+            [d.get('break_end_time') for d in days],
+            use_primary=True
+        )
+        if rows:
+            invalidate_after_write(db, schedule_cache, ('master', master_id))
+        return sorted(row['day_of_week'] for row in rows)
+
+    @classmethod
+    async def get_by_master_id(cls, db: DatabaseExecutor, master_id: int) -> list:
         """
         Получает график работы мастера.
 
         Args:
-            db (Database): Объект подключения к базе данных
+            db (DatabaseExecutor): Подключение к базе данных или открытая транзакция
             master_id (int): ID мастера
 
         Returns:
             list: Список объектов графика работы
         """
-        query = """
-        SELECT id, master_id, day_of_week, is_working, start_time, end_time,
-               break_start_time, break_end_time, created_at
-        FROM working_schedules
-        WHERE master_id = $1
-        ORDER BY day_of_week
-        """
+        cacheable = is_cacheable(db)
+        rows = schedule_cache.get(('master', master_id)) if cacheable else None
+        if rows is None:
+            rows = await db.fetch(SELECT_SCHEDULES_BY_MASTER_ID, master_id, use_primary=cacheable)
+            if cacheable:
+                schedule_cache.set(('master', master_id), rows)
 
-        rows = await db.fetch(query, master_id)
-        return [cls(**row) for row in rows]
+        return [cls.from_row(row) for row in rows]
 
     @classmethod
-    async def get_by_master_and_day(cls, db: Database, master_id: int, day_of_week: int) -> 'WorkingSchedule':
+    async def get_by_master_and_day(cls, db: DatabaseExecutor, master_id: int, day_of_week: int) -> 'WorkingSchedule':
         """
         Получает график работы мастера на конкретный день.
 
         Args:
-            db (Database): Объект подключения к базе данных
+            db (DatabaseExecutor): Подключение к базе данных или открытая транзакция
             master_id (int): ID мастера
             day_of_week (int): День недели (1=Пн, 7=Вс)
 
         Returns:
             WorkingSchedule: Объект графика работы или None, если не найден
         """
-        query = """
-        SELECT id, master_id, day_of_week, is_working, start_time, end_time,
-               break_start_time, break_end_time, created_at
-        FROM working_schedules
-        WHERE master_id = $1 AND day_of_week = $2
-        """
-
-        row = await db.fetchrow(query, master_id, day_of_week)
+        row = await db.fetchrow(SELECT_SCHEDULE_BY_MASTER_AND_DAY, master_id, day_of_week)
         if not row:
             return None
 
-        return cls(**row)
\ No newline at end of file
+        return cls.from_row(row)
\ No newline at end of file
@@ -3,7 +3,45 @@
 """
 
 from datetime import datetime, timedelta
-from bot.database.database import Database
+from bot.database.database import DatabaseExecutor
+from bot.database.cache import service_cache, is_cacheable, invalidate_after_write
+
+SELECT_SERVICES_BY_MASTER_ID = """
+SELECT id, master_id, name, description, price, duration, created_at
+FROM services
+WHERE master_id = $1
+ORDER BY created_at
+"""
+
+SELECT_SERVICES_BY_MASTER_IDS = """
+SELECT id, master_id, name, description, price, duration, created_at
+FROM services
+WHERE master_id = ANY($1::int[])
+ORDER BY master_id, created_at
+"""
+
+SELECT_SERVICE_BY_ID = """
+SELECT id, master_id, name, description, price, duration, created_at
+FROM services
+WHERE id = $1
+"""
+
+
+async def fetch_service_rows_by_master_ids(db: DatabaseExecutor, master_ids: list) -> dict:
+    """
+    Загружает услуги нескольких мастеров одним запросом.
+
+    Args:
+        db (DatabaseExecutor): Подключение к базе данных или открытая транзакция
+        master_ids (list): ID мастеров
+
+    Returns:
+        dict: Списки строк услуг по ID мастера (для каждого переданного ID)
+    """
+    services = {master_id: [] for master_id in master_ids}
+    for row in await db.fetch(SELECT_SERVICES_BY_MASTER_IDS, master_ids):
+        services[row['master_id']].append(row)
+    return services
 
 
 class Service:
@@ -11,6 +49,11 @@ class Service:
     Модель услуги мастера.
     """
 
+    # Порядок совпадает с порядком столбцов в SELECT/RETURNING: на нем построен from_row
+    __slots__ = (
+        'id', 'master_id', 'name', 'description', 'price', 'duration', 'created_at'
+    )
+
     def __init__(self, id: int = None, master_id: int = None, name: str = "",
                  description: str = "", price: str = "", duration: timedelta = None,
                  created_at: datetime = None):
@@ -35,13 +78,32 @@ class Service:
         self.created_at = created_at
 
     @classmethod
-    async def create(cls, db: Database, master_id: int, name: str,
+    def from_row(cls, row) -> 'Service':
+        """
+        Быстро создает объект из строки запроса.
+
+        Значения берутся по позициям, без промежуточного словаря, поэтому
+        запрос должен возвращать все столбцы в порядке __slots__.
+
+        Args:
+            row (Record): Строка результата запроса
+
+        Returns:
+            Service: Объект модели
+        """
+        service = cls.__new__(cls)
+        (service.id, service.master_id, service.name, service.description, service.price,
+         service.duration, service.created_at) = row
+        return service
+
+    @classmethod
+    async def create(cls, db: DatabaseExecutor, master_id: int, name: str,
                      price: str, description: str = "", duration: str = None) -> 'Service':
         """
         Создает новую услугу в базе данных.
 
         Args:
-            db (Database): Объект подключения к базе данных
+            db (DatabaseExecutor): Подключение к базе данных или открытая транзакция
             master_id (int): ID мастера
             name (str): Название услуги
             price (str): Цена услуги
@@ -61,7 +123,9 @@ class Service:
         if duration:
             duration_interval = duration  # В PostgreSQL INTERVAL формат
 
-        row = await db.fetchrow(query, master_id, name, description, price, duration_interval)
+        row = await db.fetchrow(query, master_id, name, description, price, duration_interval,
+                                use_primary=True)
+        invalidate_after_write(db, service_cache, ('master', master_id))
 
         service = cls(
             id=row['id'],
@@ -76,47 +140,109 @@ class Service:
         return service
 
     @classmethod
-    async def get_by_master_id(cls, db: Database, master_id: int) -> list:
+    async def bulk_create(cls, db: DatabaseExecutor, services: list) -> list:
+        """
+        Создает несколько услуг одним запросом.
+
+        Args:
+            db (DatabaseExecutor): Подключение к базе данных или открытая транзакция
+            services (list): Список словарей с ключами master_id, name, price и
+                необязательными description, duration (timedelta)
+
+        Returns:
+            list: ID созданных услуг в порядке входного списка
+        """
+        if not services:
+            return []
+
+        # Порядок RETURNING не гарантирован: ID выдаются заранее и
+        # возвращаются по номеру строки во входных массивах
+        query = """
+        WITH input AS MATERIALIZED (
+            SELECT nextval(pg_get_serial_sequence('services', 'id')) AS id, u.*
+            FROM unnest($1::int[], $2::varchar[], $3::text[], $4::text[], $5::interval[])
+                 WITH ORDINALITY AS u(master_id, name, description, price, duration, n)
+        ),
+        inserted AS (
+            INSERT INTO services (id, master_id, name, description, price, duration)
+            SELECT id, master_id, name, description, price, duration FROM input
+        )
+        SELECT id FROM input ORDER BY n
+        """
+
+        rows = await db.fetch(
+            query,
+            [s['master_id'] for s in services],
+            [s['name'] for s in services],
+            [s.get('description', "") for s in services],
+            [s['price'] for s in services],
+            [s.get('duration') for s in services],
+            use_primary=True
+        )
+        invalidate_after_write(db, service_cache, *{('master', s['master_id']) for s in services})
+        return [row['id'] for row in rows]
+
+    @classmethod
+    async def get_by_master_id(cls, db: DatabaseExecutor, master_id: int) -> list:
         """
         Получает все услуги мастера.
 
         Args:
-            db (Database): Объект подключения к базе данных
+            db (DatabaseExecutor): Подключение к базе данных или открытая транзакция
             master_id (int): ID мастера
 
         Returns:
             list: Список объектов услуг
         """
-        query = """
-        SELECT id, master_id, name, description, price, duration, created_at
-        FROM services
-        WHERE master_id = $1
-        ORDER BY created_at
+        if is_cacheable(db):
+            rows = service_cache.get(('master', master_id))
+            if rows is None:
+                # Одновременные запросы из разных обработчиков уходят одним ANY($1);
+                # кэш заполняется только из основной базы (см. is_cacheable)
+                with db.use_primary():
+                    loader = db.loader('services_by_master_id', fetch_service_rows_by_master_ids)
+                    rows = await loader.load(master_id)
+                service_cache.set(('master', master_id), rows)
+        else:
+            rows = await db.fetch(SELECT_SERVICES_BY_MASTER_ID, master_id)
+
+        return [cls.from_row(row) for row in rows]
+
+    @classmethod
+    async def get_by_master_ids(cls, db: DatabaseExecutor, master_ids: list) -> dict:
         """
+        Получает услуги нескольких мастеров одним запросом.
 
-        rows = await db.fetch(query, master_id)
-        return [cls(**row) for row in rows]
+        Args:
+            db (DatabaseExecutor): Подключение к базе данных или открытая транзакция
+            master_ids (list): ID мастеров
+
+        Returns:
+            dict: Списки объектов Service по ID мастера
+        """
+        rows = await fetch_service_rows_by_master_ids(db, list(master_ids))
+        return {master_id: [cls.from_row(row) for row in service_rows]
+                for master_id, service_rows in rows.items()}
 
     @classmethod
-    async def get_by_id(cls, db: Database, service_id: int) -> 'Service':
+    async def get_by_id(cls, db: DatabaseExecutor, service_id: int) -> 'Service':
         """
         Получает услугу по ID.
 
         Args:
-            db (Database): Объект подключения к базе данных
+            db (DatabaseExecutor): Подключение к базе данных или открытая транзакция
             service_id (int): ID услуги
 
         Returns:
             Service: Объект услуги или None, если не найден
         """
-        query = """
-        SELECT id, master_id, name, description, price, duration, created_at
-        FROM services
-        WHERE id = $1
-        """
-
-        row = await db.fetchrow(query, service_id)
-        if not row:
-            return None
-
-        return cls(**row)
\ No newline at end of file
+        cacheable = is_cacheable(db)
+        row = service_cache.get(('id', service_id)) if cacheable else None
+        if row is None:
+            row = await db.fetchrow(SELECT_SERVICE_BY_ID, service_id, use_primary=cacheable)
+            if not row:
+                return None
+            if cacheable:
+                service_cache.set(('id', service_id), row)
+
+        return cls.from_row(row)
\ No newline at end of file
@@ -0,0 +1,135 @@
+"""
+Модель временного слота и методы работы с ней.
+"""
+
+from datetime import date, datetime, time
+from bot.database.database import DatabaseExecutor, run_after_commit
+from bot.scheduling.availability import availability_index
+
+# Столбцы, которые заполняются при массовой вставке слотов
+TIME_SLOT_COPY_COLUMNS = ['master_id', 'date', 'start_time', 'end_time']
+
+
+def mark_created_free(db: DatabaseExecutor, slots: list) -> None:
+    """
+    После COMMIT добавляет новые слоты в индекс свободного времени.
+
+    Args:
+        db (DatabaseExecutor): Подключение к базе данных или открытая транзакция
+        slots (list): Список кортежей (master_id, date, start_time, end_time)
+    """
+    def apply() -> None:
+        for master_id, day, start_time, end_time in slots:
+            availability_index.apply_slot(master_id, day, start_time, end_time, True)
+
+    run_after_commit(db, apply)
+
+
+class TimeSlot:
+    """
+    Модель временного слота для записи к мастеру.
+    """
+
+    # Порядок совпадает с порядком столбцов в SELECT/RETURNING: на нем построен from_row
+    __slots__ = (
+        'id', 'master_id', 'date', 'start_time', 'end_time', 'is_available',
+        'booking_id', 'created_at'
+    )
+
+    def __init__(self, id: int = None, master_id: int = None, date: date = None,
+                 start_time: time = None, end_time: time = None,
+                 is_available: bool = True, booking_id: int = None,
+                 created_at: datetime = None):
+        """
+        Инициализирует объект временного слота.
+
+        Args:
+            id (int, optional): ID слота
+            master_id (int): ID мастера
+            date (date): Дата слота
+            start_time (time): Время начала
+            end_time (time): Время окончания
+            is_available (bool): Доступность для записи
+            booking_id (int, optional): ID бронирования
+            created_at (datetime, optional): Дата создания
+        """
+        self.id = id
+        self.master_id = master_id
+        self.date = date
+        self.start_time = start_time
+        self.end_time = end_time
+        self.is_available = is_available
+        self.booking_id = booking_id
+        self.created_at = created_at
+
+    @classmethod
+    def from_row(cls, row) -> 'TimeSlot':
+        """
+        Быстро создает объект из строки запроса.
+
+        Значения берутся по позициям, без промежуточного словаря, поэтому
+        запрос должен возвращать все столбцы в порядке __slots__.
+
+        Args:
+            row (Record): Строка результата запроса
+
+        Returns:
+            TimeSlot: Объект модели
+        """
+        slot = cls.__new__(cls)
+        (slot.id, slot.master_id, slot.date, slot.start_time, slot.end_time,
+         slot.is_available, slot.booking_id, slot.created_at) = row
+        return slot
+
+    @classmethod
+    async def bulk_create(cls, db: DatabaseExecutor, slots: list) -> list:
+        """
+        Создает несколько слотов одним запросом и возвращает их ID.
+
+        Args:
+            db (DatabaseExecutor): Подключение к базе данных или открытая транзакция
+            slots (list): Список кортежей (master_id, date, start_time, end_time)
+
+        Returns:
+            list: ID созданных слотов в порядке входного списка
+        """
+        if not slots:
+            return []
+
+        # Порядок RETURNING не гарантирован: ID выдаются заранее и
+        # возвращаются по номеру строки во входных массивах
+        query = """
+        WITH input AS MATERIALIZED (
+            SELECT nextval(pg_get_serial_sequence('time_slots', 'id')) AS id, u.*
+            FROM unnest($1::int[], $2::date[], $3::time[], $4::time[])
+                 WITH ORDINALITY AS u(master_id, date, start_time, end_time, n)
+        ),
+        inserted AS (
+            INSERT INTO time_slots (id, master_id, date, start_time, end_time)
+            SELECT id, master_id, date, start_time, end_time FROM input
+        )
+        SELECT id FROM input ORDER BY n
+        """
+
+        master_ids, dates, start_times, end_times = zip(*slots)
+        rows = await db.fetch(query, list(master_ids), list(dates),
+                              list(start_times), list(end_times), use_primary=True)
+        mark_created_free(db, slots)
+        return [row['id'] for row in rows]
+
+    @classmethod
+    async def copy_records(cls, db: DatabaseExecutor, slots: list) -> None:
+        """
+        Загружает слоты через COPY без возврата ID.
+
+        Подходит для заполнения больших периодов, когда ID не нужны сразу.
+
+        Args:
+            db (DatabaseExecutor): Подключение к базе данных или открытая транзакция
+            slots (list): Список кортежей (master_id, date, start_time, end_time)
+        """
+        if not slots:
+            return
+
+        await db.copy_records_to_table('time_slots', slots, TIME_SLOT_COPY_COLUMNS)
+        mark_created_free(db, slots)
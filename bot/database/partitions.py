@@ -0,0 +1,145 @@
+"""
+Обслуживание месячных секций таблицы time_slots.
+
+Секции создаются заранее на SLOT_PARTITION_MONTHS_AHEAD месяцев вперед (и не
+меньше, чем на горизонт SLOT_HORIZON_DAYS), чтобы генерация слотов не
+упиралась в отсутствующую секцию. Секции старше
+SLOT_PARTITION_RETENTION_MONTHS отсоединяются и удаляются (или остаются
+отдельными таблицами для архива), поэтому запросы к ближайшему расписанию
+затрагивают только несколько свежих секций.
+"""
+
+import re
+from datetime import date, timedelta
+from bot.database.database import Database
+from config.settings import get_settings
+
+# Имя секции: time_slots_y2025m01 (см. create_time_slots_partition в миграции 008)
+PARTITION_NAME_PATTERN = re.compile(r"^time_slots_y(\d{4})m(\d{2})$")
+
+CREATE_PARTITION = "SELECT create_time_slots_partition($1::date) AS name"
+
+SELECT_PARTITIONS = """
+SELECT c.relname AS name
+FROM pg_inherits i
+JOIN pg_class c ON c.oid = i.inhrelid
+WHERE i.inhparent = 'time_slots'::regclass
+ORDER BY c.relname
+"""
+
+
+def add_months(day: date, months: int) -> date:
+    """
+    Возвращает первое число месяца, отстоящего от day на months месяцев.
+
+    Args:
+        day (date): Исходная дата
+        months (int): Сдвиг в месяцах (может быть отрицательным)
+
+    Returns:
+        date: Первое число нужного месяца
+    """
+    index = day.year * 12 + day.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+class PartitionManager:
+    """
+    Создание будущих и удаление устаревших секций time_slots.
+    """
+
+    def __init__(self, database: Database, months_ahead: int = None,
+                 retention_months: int = None, drop_expired: bool = None):
+        """
+        Инициализирует менеджер секций.
+
+        Args:
+            database (Database): Объект подключения к базе данных
+            months_ahead (int, optional): На сколько месяцев вперед держать секции
+            retention_months (int, optional): Сколько прошедших месяцев хранить
+            drop_expired (bool, optional): Удалять отсоединенные секции (иначе
+                оставить как архив)
+
+        Значения по умолчанию берутся из настроек SLOT_PARTITION_*.
+        """
+        settings = get_settings()
+        self.database = database
+        self.months_ahead = settings.SLOT_PARTITION_MONTHS_AHEAD if months_ahead is None else months_ahead
+        self.retention_months = (settings.SLOT_PARTITION_RETENTION_MONTHS
+                                 if retention_months is None else retention_months)
+        self.drop_expired = settings.SLOT_PARTITION_DROP_EXPIRED if drop_expired is None else drop_expired
+
+    async def get_partitions(self) -> dict:
+        """
+        Возвращает секции time_slots по первому числу месяца.
+
+        Returns:
+            dict: Имя секции по дате начала месяца
+        """
+        rows = await self.database.fetch(SELECT_PARTITIONS, use_primary=True)
+        partitions = {}
+        for row in rows:
+            match = PARTITION_NAME_PATTERN.match(row['name'])
+            if match:
+                partitions[date(int(match.group(1)), int(match.group(2)), 1)] = row['name']
+        return partitions
+
+    async def create_future_partitions(self, today: date = None) -> list:
+        """
+        Создает недостающие секции с текущего месяца на months_ahead вперед.
+
+        Если горизонт генерации слотов длиннее, секции создаются до его конца.
+
+        Args:
+            today (date, optional): Текущая дата
+
+        Returns:
+            list: Имена созданных секций
+        """
+        today = today or date.today()
+        last_month = max(add_months(today, self.months_ahead),
+                         add_months(today + timedelta(days=get_settings().SLOT_HORIZON_DAYS), 0))
+        existing = await self.get_partitions()
+        created = []
+        month = add_months(today, 0)
+        while month <= last_month:
+            if month not in existing:
+                row = await self.database.fetchrow(CREATE_PARTITION, month, use_primary=True)
+                created.append(row['name'])
+            month = add_months(month, 1)
+        return created
+
+    async def remove_expired_partitions(self, today: date = None) -> list:
+        """
+        Отсоединяет секции, которые целиком старше срока хранения.
+
+        Args:
+            today (date, optional): Текущая дата
+
+        Returns:
+            list: Имена отсоединенных секций
+        """
+        cutoff = add_months(today or date.today(), -self.retention_months)
+        removed = []
+        for month, name in sorted((await self.get_partitions()).items()):
+            if month >= cutoff:
+                break
+            # Имя взято из pg_class и совпало с шаблоном - подставлять в SQL безопасно
+            async with self.database.transaction() as tx:
+                await tx.execute(f'ALTER TABLE time_slots DETACH PARTITION "{name}"')
+                if self.drop_expired:
+                    await tx.execute(f'DROP TABLE "{name}"')
+            removed.append(name)
+        return removed
+
+    async def run_maintenance(self, today: date = None) -> None:
+        """
+        Создает будущие секции и удаляет устаревшие.
+
+        Args:
+            today (date, optional): Текущая дата
+        """
+        created = await self.create_future_partitions(today)
+        removed = await self.remove_expired_partitions(today)
+        action = "удалено" if self.drop_expired else "отсоединено"
+        print(f"Секции time_slots: создано {len(created)}, {action} {len(removed)}")
@@ -0,0 +1,223 @@
+"""
+Модуль хранения состояния диалогов бота в PostgreSQL.
+
+user_data и chat_data загружаются один раз при старте и дальше живут в памяти
+Application. Загружается только состояние, менявшееся за последние
+PERSISTENCE_LOAD_DAYS дней: объем загрузки и память растут с числом активных,
+а не всех когда-либо писавших пользователей. Вернувшийся после перерыва
+пользователь начинает диалог с пустыми user_data.
+
+Изменения копятся в буфере и записываются пакетом (один upsert на тип
+данных) после каждого цикла update_persistence, а не после каждого
+обновления. Неудачная запись повторяется в фоне с растущей паузой; ошибка
+финальной записи при остановке бота пробрасывается.
+"""
+
+import asyncio
+import json
+from telegram.ext import BasePersistence, PersistenceInput
+from bot.database.database import Database
+from config.settings import get_settings
+
+SELECT_PERSISTED_DATA = """
+SELECT id, data
+FROM bot_persistence
+WHERE kind = $1
+  AND ($2::int = 0 OR updated_at > NOW() - make_interval(days => $2::int))
+"""
+
+UPSERT_PERSISTED_DATA = """
+INSERT INTO bot_persistence (kind, id, data, updated_at)
+SELECT $1, u.id, u.data::jsonb, NOW()
+FROM unnest($2::bigint[], $3::text[]) AS u(id, data)
+ON CONFLICT (kind, id) DO UPDATE
+SET data = EXCLUDED.data, updated_at = NOW()
+"""
+
+DELETE_PERSISTED_DATA = "DELETE FROM bot_persistence WHERE kind = $1 AND id = ANY($2::bigint[])"
+
+# Паузы между повторами неудачной записи, секунды
+FLUSH_RETRY_MIN_DELAY = 1.0
+FLUSH_RETRY_MAX_DELAY = 60.0
+
+
+class PostgresPersistence(BasePersistence):
+    """
+    Хранение user_data и chat_data в таблице bot_persistence.
+    """
+
+    def __init__(self, database: Database, update_interval: float = None, load_days: int = None):
+        """
+        Инициализирует хранилище.
+
+        Args:
+            database (Database): Объект подключения к базе данных; подключается
+                при первой загрузке, если еще не подключен
+            update_interval (float, optional): Как часто Application передает
+                изменения, секунды (по умолчанию PERSISTENCE_UPDATE_INTERVAL)
+            load_days (int, optional): За сколько дней загружать состояние при
+                старте, 0 - все (по умолчанию PERSISTENCE_LOAD_DAYS)
+        """
+        settings = get_settings()
+        if update_interval is None:
+            update_interval = settings.PERSISTENCE_UPDATE_INTERVAL
+        super().__init__(
+            store_data=PersistenceInput(bot_data=False, callback_data=False),
+            update_interval=update_interval
+        )
+        self.database = database
+        self.load_days = settings.PERSISTENCE_LOAD_DAYS if load_days is None else load_days
+        self._dirty = {'user': {}, 'chat': {}}
+        self._dropped = {'user': set(), 'chat': set()}
+        self._flush_task = None
+        self._flush_lock = asyncio.Lock()
+
+    async def _load(self, kind: str) -> dict:
+        """
+        Загружает недавно менявшиеся данные одного типа.
+
+        Args:
+            kind (str): 'user' или 'chat'
+
+        Returns:
+            dict: Данные по Telegram ID
+        """
+        await self.database.connect()
+        rows = await self.database.fetch(SELECT_PERSISTED_DATA, kind, self.load_days, use_primary=True)
+        return {row['id']: json.loads(row['data']) for row in rows}
+
+    def _mark_dirty(self, kind: str, key: int, data: dict) -> None:
+        """
+        Ставит данные в буфер записи и планирует сброс буфера.
+
+        Application передает изменения пачкой через asyncio.gather, поэтому
+        сброс откладывается до конца текущего прохода цикла событий и
+        записывает всю пачку одним запросом.
+
+        Args:
+            kind (str): 'user' или 'chat'
+            key (int): Telegram ID
+            data (dict): Данные (сериализуются сразу, чтобы зафиксировать состояние)
+        """
+        self._dropped[kind].discard(key)
+        self._dirty[kind][key] = json.dumps(data, ensure_ascii=False, default=str)
+        self._schedule_flush()
+
+    def _schedule_flush(self) -> None:
+        """
+        Запускает фоновый сброс буфера, если он еще не запланирован.
+
+        Пока фоновый сброс ждет повтора после ошибки, новые изменения уйдут
+        вместе с повтором.
+        """
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.get_running_loop().create_task(self._flush_in_background())
+
+    async def _flush_in_background(self) -> None:
+        """
+        Сбрасывает буфер, повторяя запись после ошибки с растущей паузой.
+        """
+        delay = FLUSH_RETRY_MIN_DELAY
+        while True:
+            async with self._flush_lock:
+                try:
+                    await self._write_buffered()
+                    return
+                except Exception as e:
+                    print(f"Не удалось сохранить состояние диалогов, повтор через {delay:.0f} с: {e}")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, FLUSH_RETRY_MAX_DELAY)
+
+    async def get_user_data(self) -> dict:
+        return await self._load('user')
+
+    async def get_chat_data(self) -> dict:
+        return await self._load('chat')
+
+    async def get_bot_data(self) -> dict:
+        return {}
+
+    async def get_callback_data(self):
+        return None
+
+    async def get_conversations(self, name: str) -> dict:
+        return {}
+
+    async def update_conversation(self, name: str, key: tuple, new_state) -> None:
+        return
+
+    async def update_user_data(self, user_id: int, data: dict) -> None:
+        self._mark_dirty('user', user_id, data)
+
+    async def update_chat_data(self, chat_id: int, data: dict) -> None:
+        self._mark_dirty('chat', chat_id, data)
+
+    async def update_bot_data(self, data: dict) -> None:
+        return
+
+    async def update_callback_data(self, data) -> None:
+        return
+
+    async def drop_user_data(self, user_id: int) -> None:
+        self._dirty['user'].pop(user_id, None)
+        self._dropped['user'].add(user_id)
+        self._schedule_flush()
+
+    async def drop_chat_data(self, chat_id: int) -> None:
+        self._dirty['chat'].pop(chat_id, None)
+        self._dropped['chat'].add(chat_id)
+        self._schedule_flush()
+
+    async def refresh_user_data(self, user_id: int, user_data: dict) -> None:
+        return
+
+    async def refresh_chat_data(self, chat_id: int, chat_data: dict) -> None:
+        return
+
+    async def refresh_bot_data(self, bot_data: dict) -> None:
+        return
+
+    async def flush(self) -> None:
+        """
+        Записывает накопленные изменения одной транзакцией.
+
+        Application вызывает метод при остановке. Сбросы выполняются по
+        очереди, поэтому финальный сброс дожидается фоновой записи, а
+        ожидающий повтора фоновый сброс отменяет: его изменения уходят здесь.
+
+        Raises:
+            Exception: Если записать изменения не удалось (они остаются в буфере)
+        """
+        async with self._flush_lock:
+            # Под блокировкой фоновая задача не пишет в базу - ее можно отменить
+            task = self._flush_task
+            if task is not None and not task.done():
+                task.cancel()
+            await self._write_buffered()
+
+    async def _write_buffered(self) -> None:
+        """
+        Забирает буфер изменений и записывает его в базу.
+
+        Raises:
+            Exception: Ошибка записи; изменения возвращаются в буфер
+        """
+        dirty, self._dirty = self._dirty, {'user': {}, 'chat': {}}
+        dropped, self._dropped = self._dropped, {'user': set(), 'chat': set()}
+        if not any(dirty.values()) and not any(dropped.values()):
+            return
+
+        try:
+            async with self.database.transaction() as tx:
+                for kind, entries in dirty.items():
+                    if entries:
+                        await tx.execute(UPSERT_PERSISTED_DATA, kind, list(entries), list(entries.values()))
+                for kind, keys in dropped.items():
+                    if keys:
+                        await tx.execute(DELETE_PERSISTED_DATA, kind, list(keys))
+        except Exception:
+            for kind in dirty:
+                for key, data in dirty[kind].items():
+                    self._dirty[kind].setdefault(key, data)
+                self._dropped[kind] |= dropped[kind] - set(self._dirty[kind])
+            raise
@@ -0,0 +1,217 @@
+"""
+Модуль статистики запросов к базе данных.
+
+Собирает гистограммы длительности по нормализованному тексту запроса,
+время ожидания соединения из пула и выводит медленные запросы.
+"""
+
+import re
+from functools import lru_cache
+
+# Границы корзин гистограмм в секундах
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"(?<!\$)\b\d+(?:\.\d+)?\b")
+_WHITESPACE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=4096)
+def normalize_query(query: str) -> str:
+    """
+    Приводит запрос к форме, общей для всех его вызовов.
+
+    Литералы заменяются на '?', пробелы схлопываются; параметры $N остаются.
+
+    Args:
+        query (str): SQL-запрос
+
+    Returns:
+        str: Нормализованный запрос
+    """
+    query = _STRING_LITERAL.sub("?", query)
+    query = _NUMBER_LITERAL.sub("?", query)
+    return _WHITESPACE.sub(" ", query).strip()
+
+
+def redact_args(args: tuple) -> str:
+    """
+    Описывает параметры запроса без их значений.
+
+    Args:
+        args (tuple): Параметры запроса
+
+    Returns:
+        str: Строка вида "$1=<int>, $2=<str:12>"
+    """
+    parts = []
+    for position, value in enumerate(args, start=1):
+        kind = type(value).__name__
+        if isinstance(value, (str, bytes, list, tuple)):
+            kind = f"{kind}:{len(value)}"
+        parts.append(f"${position}=<{kind}>")
+    return ", ".join(parts)
+
+
+def _escape_label(value: str) -> str:
+    """Экранирует значение метки Prometheus."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class Histogram:
+    """
+    Гистограмма длительностей с фиксированными корзинами.
+    """
+
+    def __init__(self):
+        """
+        Инициализирует пустую гистограмму.
+        """
+        self.buckets = [0] * len(LATENCY_BUCKETS)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        """
+        Добавляет измерение.
+
+        Args:
+            value (float): Длительность в секундах
+        """
+        for index, bound in enumerate(LATENCY_BUCKETS):
+            if value <= bound:
+                self.buckets[index] += 1
+                break
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, q: float) -> float:
+        """
+        Оценивает квантиль по верхней границе корзины.
+
+        Args:
+            q (float): Квантиль от 0 до 1
+
+        Returns:
+            float: Оценка в секундах
+        """
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for index, bound in enumerate(LATENCY_BUCKETS):
+            seen += self.buckets[index]
+            if seen >= rank:
+                return bound
+        return self.max
+
+    def render(self, name: str, labels: str) -> list:
+        """
+        Выводит гистограмму в текстовом формате Prometheus.
+
+        Args:
+            name (str): Имя метрики
+            labels (str): Метки без фигурных скобок
+
+        Returns:
+            list: Строки метрики
+        """
+        prefix = f"{labels}," if labels else ""
+        lines = []
+        cumulative = 0
+        for bound, count in zip(LATENCY_BUCKETS, self.buckets):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{prefix}le="{bound}"}} {cumulative}')
+        lines.append(f'{name}_bucket{{{prefix}le="+Inf"}} {self.count}')
+        suffix = f"{{{labels}}}" if labels else ""
+        lines.append(f"{name}_sum{suffix} {self.total}")
+        lines.append(f"{name}_count{suffix} {self.count}")
+        return lines
+
+
+class QueryStats:
+    """
+    Статистика запросов одного объекта Database.
+    """
+
+    def __init__(self, slow_query_threshold: float):
+        """
+        Инициализирует статистику.
+
+        Args:
+            slow_query_threshold (float): Порог медленного запроса в секундах
+        """
+        self.slow_query_threshold = slow_query_threshold
+        self.queries = {}
+        self.acquire = Histogram()
+        self.slow_queries = 0
+
+    def record_query(self, query: str, duration: float, args: tuple) -> None:
+        """
+        Учитывает выполненный запрос.
+
+        Args:
+            query (str): SQL-запрос
+            duration (float): Длительность в секундах
+            args (tuple): Параметры запроса (значения не сохраняются)
+        """
+        shape = normalize_query(query)
+        histogram = self.queries.get(shape)
+        if histogram is None:
+            histogram = self.queries[shape] = Histogram()
+        histogram.observe(duration)
+
+        if duration >= self.slow_query_threshold:
+            self.slow_queries += 1
+            print(f"Медленный запрос ({duration * 1000:.1f} мс): {shape} [{redact_args(args)}]")
+
+    def record_acquire(self, duration: float) -> None:
+        """
+        Учитывает ожидание соединения из пула.
+
+        Args:
+            duration (float): Длительность в секундах
+        """
+        self.acquire.observe(duration)
+
+    def top(self, limit: int = 10) -> list:
+        """
+        Возвращает запросы с наибольшим суммарным временем.
+
+        Args:
+            limit (int): Количество запросов
+
+        Returns:
+            list: Кортежи (нормализованный запрос, Histogram)
+        """
+        return sorted(self.queries.items(), key=lambda item: item[1].total, reverse=True)[:limit]
+
+    def render_prometheus(self) -> str:
+        """
+        Выводит всю статистику в текстовом формате Prometheus.
+
+        Returns:
+            str: Текст метрик
+        """
+        lines = [
+            "# HELP db_query_duration_seconds Длительность запросов по нормализованному SQL",
+            "# TYPE db_query_duration_seconds histogram",
+        ]
+        for shape, histogram in self.queries.items():
+            lines.extend(histogram.render("db_query_duration_seconds", f'query="{_escape_label(shape)}"'))
+
+        lines.extend([
+            "# HELP db_pool_acquire_seconds Ожидание соединения из пула",
+            "# TYPE db_pool_acquire_seconds histogram",
+        ])
+        lines.extend(self.acquire.render("db_pool_acquire_seconds", ""))
+
+        lines.extend([
+            "# HELP db_slow_queries_total Количество медленных запросов",
+            "# TYPE db_slow_queries_total counter",
+            f"db_slow_queries_total {self.slow_queries}",
+        ])
+        return "\n".join(lines) + "\n"
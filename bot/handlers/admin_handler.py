@@ -0,0 +1,51 @@
+"""
+Обработчики служебных команд администраторов.
+"""
+
+from telegram import Update
+from telegram.ext import ContextTypes
+from bot.database.cache import master_cache, service_cache, schedule_cache
+from config.settings import get_settings
+
+
+def is_admin(update: Update) -> bool:
+    """Проверяет, что команду отправил администратор."""
+    return update.effective_user is not None and update.effective_user.id in get_settings().ADMIN_IDS
+
+
+async def show_db_stats(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Отправляет сводку по самым затратным запросам и полную статистику в формате Prometheus."""
+    if not is_admin(update):
+        return
+
+    db = context.bot_data['db']
+    stats = db.stats
+    lines = ["Статистика запросов к базе данных\n"]
+    for shape, histogram in stats.top(10):
+        lines.append(
+            f"{histogram.count} выз., всего {histogram.total * 1000:.0f} мс, "
+            f"p95 ≤ {histogram.quantile(0.95) * 1000:.1f} мс, макс {histogram.max * 1000:.1f} мс\n"
+            f"{shape[:200]}\n"
+        )
+    lines.append(
+        f"Ожидание пула: p95 ≤ {stats.acquire.quantile(0.95) * 1000:.1f} мс, "
+        f"макс {stats.acquire.max * 1000:.1f} мс"
+    )
+    lines.append(f"Медленных запросов: {stats.slow_queries}")
+    pool = db.pool_status()
+    lines.append(
+        f"Пул: занято {pool['in_use']}, свободно {pool['idle']}, "
+        f"ждут {pool['waiting']}, максимум {pool['max_size']}"
+    )
+    for name, cache in (("мастера", master_cache), ("услуги", service_cache), ("графики", schedule_cache)):
+        cache_stats = cache.stats()
+        lines.append(
+            f"Кэш ({name}): {cache_stats['size']} записей, "
+            f"попаданий {cache_stats['hit_rate']:.0%} ({cache_stats['hits']}/{cache_stats['hits'] + cache_stats['misses']})"
+        )
+
+    await update.message.reply_text("\n".join(lines)[:4096])
+    await update.message.reply_document(
+        db.render_metrics().encode("utf-8"),
+        filename="db_stats.prom"
+    )
@@ -0,0 +1,25 @@
+"""
+Обработчик ошибок при обработке обновлений.
+"""
+
+import traceback
+from telegram import Update
+from telegram.ext import ContextTypes
+from bot.database.database import DatabaseBusyError
+
+BUSY_TEXT = "Сервис сейчас перегружен, попробуй ещё раз через несколько секунд."
+
+
+async def handle_error(update: object, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Отвечает пользователю при перегрузке базы данных, остальные ошибки выводит в консоль."""
+    if not isinstance(context.error, DatabaseBusyError):
+        traceback.print_exception(context.error)
+        return
+
+    if not isinstance(update, Update):
+        return
+
+    if update.callback_query:
+        await update.callback_query.answer(BUSY_TEXT, show_alert=True)
+    elif update.effective_message:
+        await update.effective_message.reply_text(BUSY_TEXT)
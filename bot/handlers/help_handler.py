@@ -2,6 +2,7 @@
 Обработчики раздела помощи.
 """
 
+import asyncio
 from telegram import Update
 from telegram.ext import ContextTypes
 from bot.keyboards.help_keyboard import get_help_keyboard
@@ -13,8 +14,10 @@ async def show_help_message(update: Update, context: ContextTypes.DEFAULT_TYPE)
         "Если тебе нужна помощь, хочешь сообщить об ошибке "
         "или поделиться обратной связью, мой мастер всегда на связи!")
 
-    await update.callback_query.message.edit_text(
-        help_text,
-        reply_markup=keyboard
-    )
-    await update.callback_query.answer()
\ No newline at end of file
+    await asyncio.gather(
+        update.callback_query.message.edit_text(
+            help_text,
+            reply_markup=keyboard
+        ),
+        update.callback_query.answer()
+    )
\ No newline at end of file
@@ -2,6 +2,7 @@
 Обработчики процесса регистрации мастера.
 """
 
+import asyncio
 import re
 from telegram import Update
 from telegram.ext import ContextTypes
@@ -27,8 +28,10 @@ async def show_registration_benefits(update: Update, context: ContextTypes.DEFAU
     text = get_registration_benefits_text()
 
     if update.callback_query:
-        await update.callback_query.message.edit_text(text, reply_markup=keyboard)
-        await update.callback_query.answer()
+        await asyncio.gather(
+            update.callback_query.message.edit_text(text, reply_markup=keyboard),
+            update.callback_query.answer()
+        )
     else:
         await update.message.reply_text(text, reply_markup=keyboard)
 
@@ -38,12 +41,14 @@ async def start_master_registration_process(update: Update, context: ContextType
     keyboard = get_terms_agreement_keyboard()
     text = get_terms_text()
 
-    await update.callback_query.message.edit_text(
-        text,
-        reply_markup=keyboard,
-        parse_mode="HTML"
+    await asyncio.gather(
+        update.callback_query.message.edit_text(
+            text,
+            reply_markup=keyboard,
+            parse_mode="HTML"
+        ),
+        update.callback_query.answer()
     )
-    await update.callback_query.answer()
 
 
 async def handle_terms_acceptance(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
@@ -51,13 +56,17 @@ async def handle_terms_acceptance(update: Update, context: ContextTypes.DEFAULT_
     keyboard = get_back_to_terms_keyboard()
     text = get_full_name_input_text()
 
+    # Шаги регистрации и поиска взаимоисключающие: сообщение уходит обработчику одного шага
+    context.user_data.pop('search_step', None)
     context.user_data['registration_step'] = 'full_name_input'
 
-    await update.callback_query.message.edit_text(
-        text,
-        reply_markup=keyboard
+    await asyncio.gather(
+        update.callback_query.message.edit_text(
+            text,
+            reply_markup=keyboard
+        ),
+        update.callback_query.answer()
     )
-    await update.callback_query.answer()
 
 
 async def handle_full_name_input(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
@@ -167,11 +176,13 @@ async def handle_terms_decline(update: Update, context: ContextTypes.DEFAULT_TYP
     """Обрабатывает отказ пользователя от условий."""
     keyboard = get_main_menu_keyboard()
 
-    await update.callback_query.message.edit_text(
-        "Добро пожаловать! Чем могу помочь?",
-        reply_markup=keyboard
+    await asyncio.gather(
+        update.callback_query.message.edit_text(
+            "Добро пожаловать! Чем могу помочь?",
+            reply_markup=keyboard
+        ),
+        update.callback_query.answer()
     )
-    await update.callback_query.answer()
 
 
 async def return_to_main_menu_from_registration(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
@@ -183,11 +194,13 @@ async def return_to_main_menu_from_registration(update: Update, context: Context
 
     keyboard = get_main_menu_keyboard()
 
-    await update.callback_query.message.edit_text(
-        "Добро пожаловать! Чем могу помочь?",
-        reply_markup=keyboard
+    await asyncio.gather(
+        update.callback_query.message.edit_text(
+            "Добро пожаловать! Чем могу помочь?",
+            reply_markup=keyboard
+        ),
+        update.callback_query.answer()
     )
-    await update.callback_query.answer()
 
 
 async def return_to_terms_from_registration(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
@@ -200,16 +213,19 @@ async def return_to_terms_from_registration(update: Update, context: ContextType
     keyboard = get_terms_agreement_keyboard()
     text = get_terms_text()
 
-    await update.callback_query.message.edit_text(
-        text,
-        reply_markup=keyboard,
-        parse_mode="HTML"
+    await asyncio.gather(
+        update.callback_query.message.edit_text(
+            text,
+            reply_markup=keyboard,
+            parse_mode="HTML"
+        ),
+        update.callback_query.answer()
     )
-    await update.callback_query.answer()
 
 
 async def return_to_full_name_input(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Возвращает пользователя к вводу ФИО."""
+    context.user_data.pop('search_step', None)
     context.user_data['registration_step'] = 'full_name_input'
 
     # Очищаем телефон из временных данных если он был
@@ -219,8 +235,10 @@ async def return_to_full_name_input(update: Update, context: ContextTypes.DEFAUL
     text = get_full_name_input_text()
     keyboard = get_back_to_terms_keyboard()
 
-    await update.callback_query.message.edit_text(
-        text,
-        reply_markup=keyboard
-    )
-    await update.callback_query.answer()
\ No newline at end of file
+    await asyncio.gather(
+        update.callback_query.message.edit_text(
+            text,
+            reply_markup=keyboard
+        ),
+        update.callback_query.answer()
+    )
\ No newline at end of file
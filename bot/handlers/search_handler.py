@@ -0,0 +1,193 @@
+"""
+Обработчики поиска мастера.
+"""
+
+import asyncio
+from datetime import date, datetime, timedelta
+from telegram import Update
+from telegram.ext import ContextTypes
+from bot.database.cache import TTLCache
+from bot.database.models.master import Master
+from bot.scheduling.availability import availability_index
+from bot.keyboards.search_keyboard import (
+    decode_cursor,
+    specialization_key,
+    get_specializations_keyboard,
+    get_search_results_keyboard,
+    get_back_to_search_keyboard
+)
+from bot.texts.search_texts import (
+    get_search_start_text,
+    get_name_search_text,
+    get_no_masters_text,
+    get_search_results_text,
+    get_nearest_windows_text
+)
+from config.settings import get_settings
+
+# Страницы результатов и список специализаций, общие для всех пользователей
+# Время жизни записей - SEARCH_CACHE_TTL, передается при сохранении
+search_cache = TTLCache(maxsize=2048)
+
+
+async def get_specializations(context: ContextTypes.DEFAULT_TYPE) -> tuple:
+    """Возвращает кортеж специализаций из кэша или базы данных."""
+    specializations = search_cache.get('specializations')
+    if specializations is None:
+        # Кортеж - ключ кэша клавиатуры специализаций
+        specializations = tuple(await Master.get_specializations(context.bot_data['db']))
+        search_cache.set('specializations', specializations, ttl=get_settings().SEARCH_CACHE_TTL)
+    return specializations
+
+
+async def get_search_page(context: ContextTypes.DEFAULT_TYPE, cursor: int = None,
+                          forward: bool = True) -> tuple:
+    """Возвращает страницу результатов текущего поиска пользователя из кэша или базы данных."""
+    params = context.user_data.get('master_search', {})
+    key = (params.get('specialization'), params.get('name'), cursor, forward)
+
+    page = search_cache.get(key)
+    if page is None:
+        settings = get_settings()
+        page = await Master.search(
+            context.bot_data['db'],
+            specialization=params.get('specialization'),
+            name=params.get('name'),
+            cursor=cursor,
+            forward=forward,
+            limit=settings.SEARCH_PAGE_SIZE
+        )
+        search_cache.set(key, page, ttl=settings.SEARCH_CACHE_TTL)
+    return page
+
+
+async def send_search_page(update: Update, context: ContextTypes.DEFAULT_TYPE,
+                           cursor: int = None, forward: bool = True) -> None:
+    """Показывает страницу результатов поиска."""
+    masters, has_more = await get_search_page(context, cursor, forward)
+    if not masters and cursor is not None:
+        # Мастера на границе страницы удалили - начинаем с первой страницы
+        cursor, forward = None, True
+        masters, has_more = await get_search_page(context)
+
+    if not masters:
+        text = get_no_masters_text()
+        keyboard = get_search_results_keyboard()
+    else:
+        if forward:
+            has_prev, has_next = cursor is not None, has_more
+        else:
+            has_prev, has_next = has_more, True
+        text = get_search_results_text(masters)
+        keyboard = get_search_results_keyboard(
+            prev_cursor=masters[0].id if has_prev else None,
+            next_cursor=masters[-1].id if has_next else None,
+            show_windows='specialization' in context.user_data.get('master_search', {})
+        )
+
+    if update.callback_query:
+        await asyncio.gather(
+            update.callback_query.message.edit_text(text, reply_markup=keyboard),
+            update.callback_query.answer()
+        )
+    else:
+        await update.message.reply_text(text, reply_markup=keyboard)
+
+
+async def show_master_search(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Показывает выбор специализации и поиск по имени."""
+    context.user_data.pop('search_step', None)
+    specializations = await get_specializations(context)
+
+    await asyncio.gather(
+        update.callback_query.message.edit_text(
+            get_search_start_text(),
+            reply_markup=get_specializations_keyboard(specializations)
+        ),
+        update.callback_query.answer()
+    )
+
+
+async def handle_specialization_choice(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Начинает поиск по специализации, ключ которой передан в callback_data."""
+    key = context.args[0] if context.args else None
+    specializations = await get_specializations(context)
+    specialization = next((s for s in specializations if specialization_key(s) == key), None)
+
+    # Специализации уже нет в списке - показываем актуальный список
+    if specialization is None:
+        await show_master_search(update, context)
+        return
+
+    context.user_data['master_search'] = {'specialization': specialization}
+    await send_search_page(update, context)
+
+
+async def start_name_search(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Запрашивает имя мастера для поиска."""
+    context.user_data.pop('registration_step', None)
+    context.user_data['search_step'] = 'name_input'
+
+    await asyncio.gather(
+        update.callback_query.message.edit_text(
+            get_name_search_text(),
+            reply_markup=get_back_to_search_keyboard()
+        ),
+        update.callback_query.answer()
+    )
+
+
+async def handle_master_search_input(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Обрабатывает введенное имя мастера."""
+    if context.user_data.get('search_step') != 'name_input':
+        return
+
+    context.user_data.pop('search_step', None)
+    context.user_data['master_search'] = {'name': update.message.text.strip()}
+    await send_search_page(update, context)
+
+
+async def handle_master_search_page(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Листает результаты поиска вперед (fm:n) или назад (fm:p) по курсору из callback_data."""
+    try:
+        cursor = decode_cursor(context.args[0]) if context.args else None
+    except ValueError:
+        cursor = None
+    if cursor is None:
+        # Курсора нет или он испорчен - показываем первую страницу
+        await send_search_page(update, context)
+        return
+
+    forward = update.callback_query.data.startswith("fm:n:")
+    await send_search_page(update, context, cursor, forward=forward)
+
+
+async def show_nearest_windows(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Показывает ближайшие свободные окна мастеров выбранной специализации по индексу свободного времени."""
+    specialization = context.user_data.get('master_search', {}).get('specialization')
+    if specialization is None:
+        await show_master_search(update, context)
+        return
+
+    settings = get_settings()
+    now = datetime.now()
+    today = date.today()
+    windows = availability_index.find_windows(
+        specialization,
+        settings.SLOT_DEFAULT_DURATION_MINUTES,
+        today,
+        today + timedelta(days=settings.SLOT_HORIZON_DAYS - 1),
+        limit=settings.SEARCH_PAGE_SIZE,
+        not_before=now.time()
+    )
+    masters = {}
+    if windows:
+        masters = await Master.get_many_by_ids(context.bot_data['db'], {w.master_id for w in windows})
+
+    await asyncio.gather(
+        update.callback_query.message.edit_text(
+            get_nearest_windows_text(windows, masters),
+            reply_markup=get_search_results_keyboard()
+        ),
+        update.callback_query.answer()
+    )
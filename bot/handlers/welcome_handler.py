@@ -2,6 +2,7 @@
 Обработчики приветственных сообщений и главного меню.
 """
 
+import asyncio
 from telegram import Update
 from telegram.ext import ContextTypes
 from bot.keyboards.main_menu_keyboard import get_main_menu_keyboard
@@ -20,11 +21,13 @@ async def show_welcome_message(update: Update, context: ContextTypes.DEFAULT_TYP
             reply_markup=keyboard
         )
     elif update.callback_query:
-        await update.callback_query.message.edit_text(
-            welcome_text,
-            reply_markup=keyboard
+        await asyncio.gather(
+            update.callback_query.message.edit_text(
+                welcome_text,
+                reply_markup=keyboard
+            ),
+            update.callback_query.answer()
         )
-        await update.callback_query.answer()
 
 
 async def show_main_menu(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
@@ -34,8 +37,10 @@ async def show_main_menu(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
         "Добро пожаловать! Чем могу помочь?"
     )
 
-    await update.callback_query.message.edit_text(
-        welcome_text,
-        reply_markup=keyboard
-    )
-    await update.callback_query.answer()
\ No newline at end of file
+    await asyncio.gather(
+        update.callback_query.message.edit_text(
+            welcome_text,
+            reply_markup=keyboard
+        ),
+        update.callback_query.answer()
+    )
\ No newline at end of file
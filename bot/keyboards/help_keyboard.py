@@ -2,12 +2,14 @@
 Модуль клавиатуры раздела помощи.
 """
 
-from telegram import InlineKeyboardButton, InlineKeyboardMarkup
+from telegram import InlineKeyboardButton
+from bot.keyboards.prebuilt import PrebuiltInlineKeyboardMarkup
 
+HELP_KEYBOARD = PrebuiltInlineKeyboardMarkup([
+    [InlineKeyboardButton("Связаться с создателем", url="https://t.me/D1S3CT")],
+    [InlineKeyboardButton("Назад", callback_data="back_to_main")]
+])
 
-def get_help_keyboard() -> InlineKeyboardMarkup:
-    keyboard = [
-        [InlineKeyboardButton("Связаться с создателем", url="https://t.me/D1S3CT")],
-        [InlineKeyboardButton("Назад", callback_data="back_to_main")]
-    ]
-    return InlineKeyboardMarkup(keyboard)
\ No newline at end of file
+
+def get_help_keyboard() -> PrebuiltInlineKeyboardMarkup:
+    return HELP_KEYBOARD
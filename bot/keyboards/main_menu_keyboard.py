@@ -2,25 +2,29 @@
 Модуль клавиатуры главного меню бота.
 """
 
-from telegram import InlineKeyboardButton, InlineKeyboardMarkup
+from telegram import InlineKeyboardButton
+from bot.keyboards.prebuilt import PrebuiltInlineKeyboardMarkup
+
+# Располагаем кнопки в линию (по 2 в ряд)
+MAIN_MENU_KEYBOARD = PrebuiltInlineKeyboardMarkup([
+    [
+        InlineKeyboardButton("Найти мастера", callback_data="find_master"),
+        InlineKeyboardButton("Мои записи", callback_data="my_appointments")
+    ],
+    [
+        InlineKeyboardButton("Стать мастером", callback_data="become_master"),
+        InlineKeyboardButton("Помощь", callback_data="help")
+    ]
+])
 
 
-def get_main_menu_keyboard() -> InlineKeyboardMarkup:
+def get_main_menu_keyboard() -> PrebuiltInlineKeyboardMarkup:
     """
-    Создает и возвращает inline-клавиатуру главного меню с emoji и горизонтальным расположением.
+    Возвращает inline-клавиатуру главного меню с горизонтальным расположением.
+
+    Клавиатура строится один раз при импорте модуля.
 
     Returns:
-        InlineKeyboardMarkup: Inline-клавиатура с основными кнопками
+        PrebuiltInlineKeyboardMarkup: Inline-клавиатура с основными кнопками
     """
-    # Располагаем кнопки в линию (по 2 в ряд)
-    keyboard = [
-        [
-            InlineKeyboardButton("Найти мастера", callback_data="find_master"),
-            InlineKeyboardButton("Мои записи", callback_data="my_appointments")
-        ],
-        [
-            InlineKeyboardButton("Стать мастером", callback_data="become_master"),
-            InlineKeyboardButton("Помощь", callback_data="help")
-        ]
-    ]
-    return InlineKeyboardMarkup(keyboard)
\ No newline at end of file
+    return MAIN_MENU_KEYBOARD
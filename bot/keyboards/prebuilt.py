@@ -0,0 +1,60 @@
+"""
+Неизменяемые клавиатуры, которые строятся и сериализуются один раз.
+
+Разметка PTB после создания заморожена, поэтому один объект можно отдавать
+во все обработчики. Классы ниже дополнительно запоминают результат to_dict():
+при каждой отправке PTB сериализует reply_markup заново, а для статической
+клавиатуры результат всегда одинаковый.
+"""
+
+from functools import lru_cache
+from telegram import InlineKeyboardMarkup, ReplyKeyboardMarkup, ReplyKeyboardRemove
+
+# Сколько вариантов каждой параметризованной клавиатуры держать в памяти
+DYNAMIC_KEYBOARD_CACHE_SIZE = 1024
+
+
+class _SerializedOnce:
+    """
+    Запоминает результат to_dict() замороженной разметки.
+    """
+
+    __slots__ = ()
+
+    def to_dict(self, recursive: bool = True) -> dict:
+        if not recursive:
+            return super().to_dict(recursive=False)
+        try:
+            return self._serialized
+        except AttributeError:
+            # Объект заморожен PTB, поэтому кэш записывается в обход __setattr__
+            serialized = super().to_dict()
+            object.__setattr__(self, "_serialized", serialized)
+            return serialized
+
+
+class PrebuiltInlineKeyboardMarkup(_SerializedOnce, InlineKeyboardMarkup):
+    __slots__ = ("_serialized",)
+
+
+class PrebuiltReplyKeyboardMarkup(_SerializedOnce, ReplyKeyboardMarkup):
+    __slots__ = ("_serialized",)
+
+
+class PrebuiltReplyKeyboardRemove(_SerializedOnce, ReplyKeyboardRemove):
+    __slots__ = ("_serialized",)
+
+
+def cached_keyboard(builder):
+    """
+    Кэширует параметризованную клавиатуру по набору аргументов (LRU).
+
+    Аргументы должны быть хешируемыми, а builder - возвращать Prebuilt-разметку.
+
+    Args:
+        builder: Функция, строящая клавиатуру
+
+    Returns:
+        Функция с тем же интерфейсом и LRU-кэшем
+    """
+    return lru_cache(maxsize=DYNAMIC_KEYBOARD_CACHE_SIZE)(builder)
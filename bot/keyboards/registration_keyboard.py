@@ -2,43 +2,59 @@
 Модуль клавиатуры регистрации мастера.
 """
 
-from telegram import InlineKeyboardButton, InlineKeyboardMarkup, KeyboardButton, ReplyKeyboardMarkup, ReplyKeyboardRemove
+from telegram import InlineKeyboardButton, KeyboardButton
+from bot.keyboards.prebuilt import (
+    PrebuiltInlineKeyboardMarkup,
+    PrebuiltReplyKeyboardMarkup,
+    PrebuiltReplyKeyboardRemove
+)
+
+REGISTRATION_START_KEYBOARD = PrebuiltInlineKeyboardMarkup([
+    [InlineKeyboardButton("Начать регистрацию", callback_data="start_master_registration")],
+    [InlineKeyboardButton("Вернуться в меню", callback_data="back_to_main")]
+])
+
+TERMS_AGREEMENT_KEYBOARD = PrebuiltInlineKeyboardMarkup([
+    [InlineKeyboardButton("Согласен", callback_data="accept_terms")],
+    [InlineKeyboardButton("Отказаться", callback_data="decline_terms")]
+])
+
+BACK_TO_TERMS_KEYBOARD = PrebuiltInlineKeyboardMarkup([
+    [InlineKeyboardButton("Назад", callback_data="back_to_terms")]
+])
+
+CONTACT_AND_BACK_KEYBOARD = PrebuiltReplyKeyboardMarkup(
+    [
+        [KeyboardButton("Поделиться контактом", request_contact=True)],
+        ["Назад"]
+    ],
+    resize_keyboard=True,
+    one_time_keyboard=True
+)
 
+REMOVE_KEYBOARD = PrebuiltReplyKeyboardRemove()
 
 
-def get_registration_start_keyboard() -> InlineKeyboardMarkup:
-    """Создает клавиатуру для начала регистрации."""
-    keyboard = [
-        [InlineKeyboardButton("Начать регистрацию", callback_data="start_master_registration")],
-        [InlineKeyboardButton("Вернуться в меню", callback_data="back_to_main")]
-    ]
-    return InlineKeyboardMarkup(keyboard)
+def get_registration_start_keyboard() -> PrebuiltInlineKeyboardMarkup:
+    """Возвращает клавиатуру для начала регистрации."""
+    return REGISTRATION_START_KEYBOARD
 
 
-def get_terms_agreement_keyboard() -> InlineKeyboardMarkup:
-    """Создает клавиатуру для согласия с условиями."""
-    keyboard = [
-        [InlineKeyboardButton("Согласен", callback_data="accept_terms")],
-        [InlineKeyboardButton("Отказаться", callback_data="decline_terms")]
-    ]
-    return InlineKeyboardMarkup(keyboard)
+def get_terms_agreement_keyboard() -> PrebuiltInlineKeyboardMarkup:
+    """Возвращает клавиатуру для согласия с условиями."""
+    return TERMS_AGREEMENT_KEYBOARD
 
 
-def get_back_to_terms_keyboard() -> InlineKeyboardMarkup:
-    """Создает клавиатуру для возврата к условиям."""
-    keyboard = [
-        [InlineKeyboardButton("Назад", callback_data="back_to_terms")]
-    ]
-    return InlineKeyboardMarkup(keyboard)
+def get_back_to_terms_keyboard() -> PrebuiltInlineKeyboardMarkup:
+    """Возвращает клавиатуру для возврата к условиям."""
+    return BACK_TO_TERMS_KEYBOARD
+
+
+def get_contact_and_back_keyboard() -> PrebuiltReplyKeyboardMarkup:
+    """Возвращает клавиатуру с кнопкой для отправки контакта и кнопкой 'Назад'."""
+    return CONTACT_AND_BACK_KEYBOARD
 
-def get_contact_and_back_keyboard() -> ReplyKeyboardMarkup:
-    """Создаёт клавиатуру с кнопкой для отправки контакта и кнопкой 'Назад'."""
-    keyboard = [
-        [KeyboardButton("Поделиться контактом", request_contact=True)],
-        ["Назад"]
-    ]
-    return ReplyKeyboardMarkup(keyboard, resize_keyboard=True, one_time_keyboard=True)
 
-def get_remove_keyboard():
+def get_remove_keyboard() -> PrebuiltReplyKeyboardRemove:
     """Убирает клавиатуру."""
-    return ReplyKeyboardRemove()
\ No newline at end of file
+    return REMOVE_KEYBOARD
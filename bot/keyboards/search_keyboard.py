@@ -0,0 +1,72 @@
+"""
+Модуль клавиатуры поиска мастера.
+"""
+
+import hashlib
+from telegram import InlineKeyboardButton
+from bot.keyboards.prebuilt import PrebuiltInlineKeyboardMarkup, cached_keyboard
+from bot.router import pack
+
+# Алфавит курсора: ID мастера кодируется в base36, чтобы уложиться в 64 байта callback_data
+CURSOR_ALPHABET = "0123456789abcdefghijklmnopqrstuvwxyz"
+
+
+def encode_cursor(master_id: int) -> str:
+    """Кодирует ID мастера в короткую строку base36."""
+    if master_id == 0:
+        return "0"
+    digits = []
+    while master_id:
+        master_id, remainder = divmod(master_id, 36)
+        digits.append(CURSOR_ALPHABET[remainder])
+    return "".join(reversed(digits))
+
+
+def decode_cursor(cursor: str) -> int:
+    """Декодирует курсор base36 обратно в ID мастера."""
+    return int(cursor, 36)
+
+
+def specialization_key(specialization: str) -> str:
+    """Возвращает короткий ключ специализации для callback_data, не зависящий от порядка списка."""
+    return hashlib.blake2s(specialization.encode("utf-8"), digest_size=5).hexdigest()
+
+
+@cached_keyboard
+def get_specializations_keyboard(specializations: tuple) -> PrebuiltInlineKeyboardMarkup:
+    """Создает клавиатуру выбора специализации и поиска по имени (кэшируется по списку специализаций)."""
+    keyboard = [
+        [InlineKeyboardButton(specialization, callback_data=pack("fm:s", specialization_key(specialization)))]
+        for specialization in specializations
+    ]
+    keyboard.append([InlineKeyboardButton("Поиск по имени", callback_data="fm:name")])
+    keyboard.append([InlineKeyboardButton("Назад", callback_data="back_to_main")])
+    return PrebuiltInlineKeyboardMarkup(keyboard)
+
+
+@cached_keyboard
+def get_search_results_keyboard(prev_cursor: int = None, next_cursor: int = None,
+                                show_windows: bool = False) -> PrebuiltInlineKeyboardMarkup:
+    """Создает клавиатуру листания результатов поиска (кэшируется по курсорам и кнопке окон)."""
+    navigation = []
+    if prev_cursor is not None:
+        navigation.append(InlineKeyboardButton("⬅️", callback_data=pack("fm:p", encode_cursor(prev_cursor))))
+    if next_cursor is not None:
+        navigation.append(InlineKeyboardButton("➡️", callback_data=pack("fm:n", encode_cursor(next_cursor))))
+
+    keyboard = [navigation] if navigation else []
+    if show_windows:
+        keyboard.append([InlineKeyboardButton("Ближайшее свободное время", callback_data="fm:w")])
+    keyboard.append([InlineKeyboardButton("Новый поиск", callback_data="find_master")])
+    keyboard.append([InlineKeyboardButton("Вернуться в меню", callback_data="back_to_main")])
+    return PrebuiltInlineKeyboardMarkup(keyboard)
+
+
+BACK_TO_SEARCH_KEYBOARD = PrebuiltInlineKeyboardMarkup([
+    [InlineKeyboardButton("Назад", callback_data="find_master")]
+])
+
+
+def get_back_to_search_keyboard() -> PrebuiltInlineKeyboardMarkup:
+    """Возвращает клавиатуру возврата к выбору способа поиска."""
+    return BACK_TO_SEARCH_KEYBOARD
@@ -4,27 +4,32 @@
 Содержит логику инициализации и запуска бота.
 """
 
-from telegram.ext import Application, CommandHandler, CallbackQueryHandler, MessageHandler, filters
-from config.settings import TELEGRAM_BOT_TOKEN
-from bot.handlers.welcome_handler import show_welcome_message, show_main_menu
-from bot.handlers.help_handler import show_help_message
-from bot.handlers.registration_handler import (
-    show_registration_benefits,
-    start_master_registration_process,
-    handle_terms_acceptance,
-    handle_terms_decline,
-    return_to_main_menu_from_registration,
-    return_to_terms_from_registration,
-    handle_full_name_input,
-    handle_contact_input,
-    return_to_full_name_input
-)
+import asyncio
+from datetime import date, datetime, time, timedelta
+from telegram import Update
+from telegram.ext import Application, CommandHandler, TypeHandler
+from config.settings import get_settings
+from bot.startup_profiler import StartupProfiler
+from bot.router import Router, lazy
+
+# Модули обработчиков (а с ними клавиатуры и тексты) импортируются при
+# первом обращении к маршруту, чтобы не замедлять запуск бота. Слой базы
+# данных и планировщик импортируются в create_bot_application и on_startup
+WELCOME = "bot.handlers.welcome_handler"
+HELP = "bot.handlers.help_handler"
+ADMIN = "bot.handlers.admin_handler"
+ERROR = "bot.handlers.error_handler"
+SEARCH = "bot.handlers.search_handler"
+REGISTRATION = "bot.handlers.registration_handler"
 
 
 def setup_handlers(application: Application) -> None:
     """
     Регистрирует все обработчики команд и callback-запросов.
 
+    Callback-запросы и сообщения на шагах диалога маршрутизируются через
+    Router: в Application попадает по одному обработчику на каждый тип.
+
     Args:
         application (Application): Объект приложения бота
 
@@ -32,62 +37,191 @@ def setup_handlers(application: Application) -> None:
         None
     """
     # Обработчики команд
-    application.add_handler(CommandHandler("start", show_welcome_message))
-
-    # Обработчики callback-запросов главного меню
-    application.add_handler(CallbackQueryHandler(show_help_message, pattern="^help$"))
-    application.add_handler(CallbackQueryHandler(show_main_menu, pattern="^back_to_main$"))
-    application.add_handler(CallbackQueryHandler(show_registration_benefits, pattern="^become_master$"))
-
-    # Обработчики регистрации мастера
-    application.add_handler(CallbackQueryHandler(start_master_registration_process, pattern="^start_master_registration$"))
-    application.add_handler(CallbackQueryHandler(handle_terms_acceptance, pattern="^accept_terms$"))
-    application.add_handler(CallbackQueryHandler(handle_terms_decline, pattern="^decline_terms$"))
-    application.add_handler(CallbackQueryHandler(return_to_main_menu_from_registration, pattern="^back_to_main_from_registration$"))
-    application.add_handler(CallbackQueryHandler(return_to_terms_from_registration, pattern="^back_to_terms$"))
-    application.add_handler(CallbackQueryHandler(return_to_full_name_input, pattern="^back_to_full_name_input$"))
-
-    # ОДИН обработчик для всех текстовых сообщений - он сам разберется что делать
-    application.add_handler(MessageHandler(
-        filters.TEXT & ~filters.COMMAND,
-        handle_full_name_input
-    ))
-
-    # ОДИН обработчик для контактов и специальных текстов
-    application.add_handler(MessageHandler(
-        (filters.CONTACT | (filters.TEXT & filters.Regex("⬅️ Назад"))) & ~filters.COMMAND,
-        handle_contact_input
-    ))
-
-
-def create_bot_application() -> Application:
+    application.add_handler(CommandHandler("start", lazy(f"{WELCOME}:show_welcome_message")))
+    application.add_handler(CommandHandler("dbstats", lazy(f"{ADMIN}:show_db_stats")))
+
+    router = Router()
+
+    # Главное меню
+    router.callback("help", f"{HELP}:show_help_message")
+    router.callback("back_to_main", f"{WELCOME}:show_main_menu")
+    router.callback("become_master", f"{REGISTRATION}:show_registration_benefits")
+
+    # Поиск мастера
+    router.callback("find_master", f"{SEARCH}:show_master_search")
+    router.callback("fm:s", f"{SEARCH}:handle_specialization_choice")
+    router.callback("fm:name", f"{SEARCH}:start_name_search")
+    router.callback("fm:n", f"{SEARCH}:handle_master_search_page")
+    router.callback("fm:p", f"{SEARCH}:handle_master_search_page")
+    router.callback("fm:w", f"{SEARCH}:show_nearest_windows")
+    router.state("search_step", "name_input", f"{SEARCH}:handle_master_search_input")
+
+    # Регистрация мастера
+    router.callback("start_master_registration", f"{REGISTRATION}:start_master_registration_process")
+    router.callback("accept_terms", f"{REGISTRATION}:handle_terms_acceptance")
+    router.callback("decline_terms", f"{REGISTRATION}:handle_terms_decline")
+    router.callback("back_to_main_from_registration", f"{REGISTRATION}:return_to_main_menu_from_registration")
+    router.callback("back_to_terms", f"{REGISTRATION}:return_to_terms_from_registration")
+    router.callback("back_to_full_name_input", f"{REGISTRATION}:return_to_full_name_input")
+    router.state("registration_step", "full_name_input", f"{REGISTRATION}:handle_full_name_input")
+    router.state("registration_step", "contact_input", f"{REGISTRATION}:handle_contact_input")
+
+    router.install(application)
+
+    # Быстрый ответ "попробуй позже" при перегрузке пула соединений
+    application.add_error_handler(lazy(f"{ERROR}:handle_error"))
+
+
+async def on_startup(application: Application) -> None:
+    """
+    Подключается к базе данных перед началом обработки обновлений.
+
+    Пул открывается заранее и подготавливает частые запросы, поэтому
+    первый пользователь после деплоя не ждет подключения к базе. Обычно
+    пул уже открыт: его открывает хранилище состояния при загрузке данных.
+    Здесь же загружается индекс свободного времени мастеров и запускается
+    его ежедневный сдвиг на новый горизонт.
+
+    Args:
+        application (Application): Объект приложения бота
+    """
+    from bot.scheduling.availability import availability_index
+    from bot.scheduling.slot_generator import SlotGenerator
+
+    profiler = application.bot_data.get('startup_profiler')
+    db = application.bot_data['db']
+    await db.connect()
+    if profiler:
+        profiler.mark("инициализация: getMe, база, состояние диалогов")
+
+    # Индекс свободного времени строится на весь горизонт слотов
+    date_from, date_to = SlotGenerator(db).horizon()
+    await availability_index.load(db, date_from, date_to)
+    application.bot_data['availability_roll'] = asyncio.create_task(roll_availability(db))
+    if profiler:
+        profiler.mark("индекс свободного времени")
+
+
+async def roll_availability(db) -> None:
+    """
+    Каждую полночь достраивает слоты до конца нового горизонта и перезагружает индекс.
+
+    Генерация идемпотентна, поэтому не мешает ежедневному run_slot_generation.py.
+
+    Args:
+        db (Database): Объект подключения к базе данных
+    """
+    from bot.scheduling.availability import availability_index
+    from bot.scheduling.slot_generator import SlotGenerator
+
+    while True:
+        midnight = datetime.combine(date.today() + timedelta(days=1), time())
+        await asyncio.sleep((midnight - datetime.now()).total_seconds() + 1)
+        try:
+            generator = SlotGenerator(db)
+            await generator.fill_horizon()
+            await availability_index.load(db, *generator.horizon())
+        except Exception as e:
+            print(f"Ошибка при обновлении индекса свободного времени: {e}")
+
+
+async def on_shutdown(application: Application) -> None:
+    """
+    Останавливает обновление индекса свободного времени и закрывает пул
+    соединений с базой данных после остановки бота.
+
+    Args:
+        application (Application): Объект приложения бота
+    """
+    roll = application.bot_data.pop('availability_roll', None)
+    if roll:
+        roll.cancel()
+
+    db = application.bot_data.pop('db', None)
+    if db:
+        await db.disconnect()
+
+
+def create_bot_application(profiler: StartupProfiler = None) -> Application:
     """
     Создает и настраивает приложение бота.
 
+    Args:
+        profiler (StartupProfiler, optional): Профилировщик запуска; отчет
+            печатается при получении первого обновления
+
     Returns:
         Application: Настроенное приложение бота
 
     Raises:
         ValueError: Если TELEGRAM_BOT_TOKEN не установлен
     """
-    if not TELEGRAM_BOT_TOKEN:
+    from bot.database.cache import configure_model_caches
+    from bot.database.database import Database
+    from bot.database.models import PREPARED_QUERIES
+    from bot.database.persistence import PostgresPersistence
+    from bot.rate_limiter import RateLimiter
+    from bot.request import ConcurrencyLimitedRequest
+    from bot.update_processor import PerUserUpdateProcessor
+
+    settings = get_settings()
+    if not settings.TELEGRAM_BOT_TOKEN:
         raise ValueError("TELEGRAM_BOT_TOKEN не установлен в конфигурации")
-
-    application = Application.builder().token(TELEGRAM_BOT_TOKEN).build()
+    configure_model_caches(settings)
+
+    # Хранилище состояния загружает данные до post_init, поэтому база
+    # создается здесь и передается ему напрямую
+    db = Database(prepared_queries=PREPARED_QUERIES)
+
+    application = (
+        Application.builder()
+        .token(settings.TELEGRAM_BOT_TOKEN)
+        .request(ConcurrencyLimitedRequest(settings.BOT_MAX_CONCURRENT_REQUESTS))
+        .persistence(PostgresPersistence(db))
+        .concurrent_updates(PerUserUpdateProcessor(settings.BOT_CONCURRENT_UPDATES))
+        .rate_limiter(RateLimiter())
+        .post_init(on_startup)
+        .post_shutdown(on_shutdown)
+        .build()
+    )
+    application.bot_data['db'] = db
     setup_handlers(application)
 
+    if profiler:
+        application.bot_data['startup_profiler'] = profiler
+
+        async def finish_profiling(update: Update, context) -> None:
+            profiler.finish()
+
+        # Группа -1 проверяется раньше остальных и не мешает обработке обновления
+        application.add_handler(TypeHandler(Update, finish_profiling, block=False), group=-1)
+        profiler.mark("сборка приложения")
+
     return application
 
 
-def run_bot() -> None:
+def run_bot(profiler: StartupProfiler = None) -> None:
     """
-    Запускает бота в режиме polling.
+    Запускает бота в режиме polling или webhook (BOT_MODE).
+
+    Args:
+        profiler (StartupProfiler, optional): Профилировщик запуска
 
     Returns:
         None
     """
-    application = create_bot_application()
-    application.run_polling()
+    settings = get_settings()
+    application = create_bot_application(profiler)
+    if settings.BOT_MODE == "webhook":
+        application.run_webhook(
+            listen=settings.WEBHOOK_LISTEN,
+            port=settings.WEBHOOK_PORT,
+            url_path=settings.WEBHOOK_PATH,
+            webhook_url=f"{settings.WEBHOOK_URL.rstrip('/')}/{settings.WEBHOOK_PATH}",
+            secret_token=settings.WEBHOOK_SECRET
+        )
+    else:
+        application.run_polling()
 
 
 def main() -> None:
@@ -0,0 +1,238 @@
+"""
+Ограничение частоты исходящих запросов к Telegram Bot API.
+
+Telegram ограничивает отправку примерно 30 сообщениями в секунду на бота,
+около одного сообщения в секунду в один личный чат и 20 сообщениями в минуту
+в группу. RateLimiter подключается к Application и пропускает каждый вызов
+API через корзины токенов: общую и отдельную для каждого чата. Ожидающие
+вызовы выходят из очереди по приоритету, поэтому ответы пользователю не
+стоят за массовыми рассылками. Ответ 429 (RetryAfter) приостанавливает
+отправку в этот чат (или всю отправку, если вызов не относится к чату) на
+указанное Telegram время, после чего вызов повторяется.
+"""
+
+import asyncio
+import heapq
+import itertools
+from telegram.error import RetryAfter
+from telegram.ext import BaseRateLimiter
+from config.settings import get_settings
+
+# Приоритеты вызовов: меньше - раньше
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BULK = 10
+
+# Методы, для которых действует только общий лимит: ответы на запросы и правка
+# уже отправленных ботом сообщений. Лимит чата относится к новым сообщениям, а
+# меню и поиск листаются правкой сообщения - она не должна ждать секунду
+UNLIMITED_CHAT_ENDPOINTS = frozenset({
+    "answerCallbackQuery", "answerInlineQuery",
+    "editMessageText", "editMessageReplyMarkup", "editMessageCaption", "editMessageMedia",
+})
+
+# После скольких корзин чатов удалять простаивающие
+CHAT_BUCKETS_SWEEP_SIZE = 10000
+
+
+class TokenBucket:
+    """
+    Корзина токенов с очередью ожидающих по приоритету.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        """
+        Инициализирует корзину.
+
+        Args:
+            rate (float): Сколько токенов добавляется в секунду
+            capacity (float): Максимум токенов (допустимый всплеск)
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = None
+        # До какого времени цикла событий Telegram запретил отправку (после 429)
+        self.paused_until = 0.0
+        # Куча (приоритет, порядковый номер, future)
+        self._waiters = []
+        self._sequence = itertools.count()
+        self._wakeup_task = None
+
+    def _refill(self, now: float) -> None:
+        if self.updated is not None:
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def is_idle(self, now: float) -> bool:
+        """
+        Проверяет, что корзина полна, не на паузе и никто не ждет - ее можно удалить.
+        """
+        self._refill(now)
+        return not self._waiters and self.tokens >= self.capacity and self.paused_until <= now
+
+    async def acquire(self, priority: int = PRIORITY_INTERACTIVE) -> None:
+        """
+        Забирает один токен, при необходимости дожидаясь очереди.
+
+        Args:
+            priority (int): Приоритет вызова
+        """
+        loop = asyncio.get_running_loop()
+        self._refill(loop.time())
+        if not self._waiters and self.tokens >= 1:
+            self.tokens -= 1
+            return
+
+        future = loop.create_future()
+        heapq.heappush(self._waiters, (priority, next(self._sequence), future))
+        if self._wakeup_task is None or self._wakeup_task.done():
+            self._wakeup_task = loop.create_task(self._wake_waiters())
+        await future
+
+    async def _wake_waiters(self) -> None:
+        """
+        Выдает токены ожидающим по мере пополнения корзины.
+        """
+        loop = asyncio.get_running_loop()
+        while self._waiters:
+            self._refill(loop.time())
+            if self.tokens < 1:
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+                continue
+
+            _, _, future = heapq.heappop(self._waiters)
+            # Отмененный вызов токен не тратит
+            if not future.done():
+                self.tokens -= 1
+                future.set_result(None)
+
+
+class RateLimiter(BaseRateLimiter):
+    """
+    Ограничитель частоты вызовов Bot API для Application.
+
+    Приоритет передается через rate_limit_args методов бота:
+    bot.send_message(..., rate_limit_args={'priority': PRIORITY_BULK}).
+    """
+
+    def __init__(self, global_rate: float = None, global_burst: float = None,
+                 chat_rate: float = None, chat_burst: float = None,
+                 group_rate_per_minute: float = None, max_retries: int = None):
+        """
+        Инициализирует ограничитель.
+
+        Незаданные параметры берутся из настроек TELEGRAM_*.
+
+        Args:
+            global_rate (float, optional): Вызовов в секунду на весь бот
+            global_burst (float, optional): Сколько вызовов подряд можно сделать сверх global_rate
+            chat_rate (float, optional): Сообщений в секунду в один личный чат
+            chat_burst (float, optional): Сколько сообщений подряд можно отправить в личный чат
+            group_rate_per_minute (float, optional): Сообщений в минуту в одну группу
+            max_retries (int, optional): Сколько раз повторять вызов после RetryAfter
+        """
+        settings = get_settings()
+        self.global_rate = settings.TELEGRAM_GLOBAL_RATE if global_rate is None else global_rate
+        self.global_burst = settings.TELEGRAM_GLOBAL_BURST if global_burst is None else global_burst
+        self.chat_rate = settings.TELEGRAM_CHAT_RATE if chat_rate is None else chat_rate
+        self.chat_burst = settings.TELEGRAM_CHAT_BURST if chat_burst is None else chat_burst
+        self.group_rate_per_minute = (settings.TELEGRAM_GROUP_RATE_PER_MINUTE
+                                      if group_rate_per_minute is None else group_rate_per_minute)
+        self.max_retries = settings.TELEGRAM_MAX_RETRIES if max_retries is None else max_retries
+        self.global_bucket = TokenBucket(self.global_rate, self.global_burst)
+        self.chat_buckets = {}
+        self.retries = 0
+        self._paused_until = 0.0
+
+    async def initialize(self) -> None:
+        return
+
+    async def shutdown(self) -> None:
+        self.chat_buckets.clear()
+
+    def _chat_bucket(self, chat_id: int, now: float) -> TokenBucket:
+        """
+        Возвращает корзину чата, создавая ее при первом обращении.
+
+        Args:
+            chat_id (int): ID чата (отрицательный у групп и каналов)
+            now (float): Текущее время цикла событий
+
+        Returns:
+            TokenBucket: Корзина чата
+        """
+        bucket = self.chat_buckets.get(chat_id)
+        if bucket is None:
+            if len(self.chat_buckets) >= CHAT_BUCKETS_SWEEP_SIZE:
+                for idle_id in [key for key, value in self.chat_buckets.items() if value.is_idle(now)]:
+                    del self.chat_buckets[idle_id]
+            if chat_id < 0:
+                # Половина минутного лимита может уйти сразу, вторая половина - равномерно за минуту
+                bucket = TokenBucket(self.group_rate_per_minute / 120, self.group_rate_per_minute / 2)
+            else:
+                bucket = TokenBucket(self.chat_rate, self.chat_burst)
+            self.chat_buckets[chat_id] = bucket
+        return bucket
+
+    @staticmethod
+    def _chat_id(data: dict):
+        """
+        Возвращает числовой ID чата из параметров вызова, если он есть.
+        """
+        chat_id = data.get("chat_id")
+        if isinstance(chat_id, int):
+            return chat_id
+        if isinstance(chat_id, str) and chat_id.lstrip("-").isdigit():
+            return int(chat_id)
+        return None
+
+    async def process_request(self, callback, args, kwargs, endpoint, data, rate_limit_args):
+        """
+        Выполняет вызов API с учетом лимитов и повторяет его после RetryAfter.
+
+        Args:
+            callback: Корутина, выполняющая запрос
+            args: Позиционные аргументы callback
+            kwargs: Именованные аргументы callback
+            endpoint (str): Метод Bot API
+            data (dict): Параметры вызова
+            rate_limit_args (dict | None): {'priority': int}
+
+        Returns:
+            Результат вызова API
+
+        Raises:
+            RetryAfter: Если Telegram продолжает отвечать 429 после max_retries повторов
+        """
+        loop = asyncio.get_running_loop()
+        priority = (rate_limit_args or {}).get("priority", PRIORITY_INTERACTIVE)
+        chat_id = self._chat_id(data)
+
+        attempt = 0
+        while True:
+            # Корзина чата хранит и паузу после 429, поэтому нужна и методам без лимита чата
+            bucket = self._chat_bucket(chat_id, loop.time()) if chat_id is not None else None
+            paused_until = max(self._paused_until, bucket.paused_until if bucket else 0.0)
+            pause = paused_until - loop.time()
+            if pause > 0:
+                await asyncio.sleep(pause)
+
+            if bucket is not None and endpoint not in UNLIMITED_CHAT_ENDPOINTS:
+                await bucket.acquire(priority)
+            await self.global_bucket.acquire(priority)
+
+            try:
+                return await callback(*args, **kwargs)
+            except RetryAfter as e:
+                retry_after = e.retry_after
+                # 429 вызова в чат останавливает только этот чат, остальные - всю отправку
+                until = loop.time() + retry_after
+                if bucket is not None:
+                    bucket.paused_until = max(bucket.paused_until, until)
+                else:
+                    self._paused_until = max(self._paused_until, until)
+                attempt += 1
+                self.retries += 1
+                if attempt > self.max_retries:
+                    raise
+                print(f"Telegram ограничил отправку ({endpoint}), повтор через {retry_after} с")
@@ -0,0 +1,44 @@
+"""
+HTTP-транспорт бота с ограничением числа одновременных запросов к Bot API.
+
+Пул соединений httpcore при каждом начале и завершении запроса перебирает
+все ожидающие запросы и все соединения (и опрашивает сокеты простаивающих).
+Когда в пуле одновременно несколько десятков запросов, этот перебор занимает
+около половины процессорного времени, и обработка обновлений замедляется
+вместо того, чтобы ускоряться (см. benchmarks.bench_updates). Поэтому лишние
+запросы ждут в asyncio.Semaphore, а в пул попадает не больше, чем в нем
+соединений.
+"""
+
+import asyncio
+from telegram.request import HTTPXRequest
+
+
+class ConcurrencyLimitedRequest(HTTPXRequest):
+    """
+    HTTPXRequest, который пропускает в пул не больше заданного числа запросов.
+    """
+
+    __slots__ = ("_semaphore",)
+
+    def __init__(self, max_concurrent_requests: int, **kwargs):
+        """
+        Инициализирует транспорт.
+
+        Args:
+            max_concurrent_requests (int): Сколько запросов выполняется одновременно;
+                столько же соединений в пуле
+            **kwargs: Остальные параметры HTTPXRequest (таймауты, прокси)
+        """
+        super().__init__(connection_pool_size=max_concurrent_requests, **kwargs)
+        self._semaphore = asyncio.Semaphore(max_concurrent_requests)
+
+    async def do_request(self, *args, **kwargs) -> tuple:
+        """
+        Выполняет запрос, дождавшись свободного места.
+
+        Returns:
+            tuple: HTTP-код и тело ответа
+        """
+        async with self._semaphore:
+            return await super().do_request(*args, **kwargs)
@@ -0,0 +1,220 @@
+"""
+Маршрутизация callback-запросов и текстовых сообщений по таблицам.
+
+Вместо цепочки CallbackQueryHandler с регулярными выражениями, которые
+Application проверяет по очереди для каждого обновления, бот регистрирует
+два обработчика PTB, а нужная функция находится поиском в словаре:
+callback-запросы - по действию из callback_data, сообщения - по текущему
+шагу пользователя (registration_step, search_step).
+
+callback_data имеет вид "действие:арг1:арг2", где действие само может
+содержать двоеточия ("fm:s"). Обработчик получает аргументы в context.args.
+
+Обработчик можно указать строкой "модуль:функция": модуль импортируется
+при первом обращении к маршруту, а не при запуске бота.
+"""
+
+import importlib
+from telegram import Update
+from telegram.ext import Application, CallbackQueryHandler, ContextTypes, MessageHandler, filters
+
+# Ограничение Telegram на длину callback_data (в байтах)
+CALLBACK_DATA_MAX_BYTES = 64
+
+
+def pack(action: str, *args) -> str:
+    """
+    Собирает callback_data из действия и аргументов.
+
+    Args:
+        action (str): Действие, например "fm:s"
+        *args: Аргументы (приводятся к строке, не должны содержать ":")
+
+    Returns:
+        str: Строка callback_data
+
+    Raises:
+        ValueError: Если результат длиннее 64 байт
+    """
+    data = ":".join((action, *map(str, args)))
+    if len(data.encode("utf-8")) > CALLBACK_DATA_MAX_BYTES:
+        raise ValueError(f"callback_data длиннее {CALLBACK_DATA_MAX_BYTES} байт: {data}")
+    return data
+
+
+class LazyHandler:
+    """
+    Обработчик, модуль которого импортируется при первом вызове.
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path (str): Путь "модуль:функция", например
+                "bot.handlers.help_handler:show_help_message"
+
+        Raises:
+            ValueError: Если путь не содержит имя функции
+        """
+        module_name, separator, name = path.partition(":")
+        if not separator or not name:
+            raise ValueError(f"Ожидается путь вида модуль:функция, получено {path}")
+        self.module_name = module_name
+        self.__name__ = name
+        self._handler = None
+
+    def load(self):
+        """
+        Импортирует модуль и возвращает функцию обработчика.
+
+        Returns:
+            Асинхронная функция (update, context)
+        """
+        if self._handler is None:
+            self._handler = getattr(importlib.import_module(self.module_name), self.__name__)
+        return self._handler
+
+    async def __call__(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        return await self.load()(update, context)
+
+
+def lazy(handler):
+    """
+    Заменяет строку "модуль:функция" ленивым обработчиком.
+
+    Args:
+        handler: Функция обработчика или путь к ней
+
+    Returns:
+        Обработчик, который можно передать в PTB или Router
+    """
+    return LazyHandler(handler) if isinstance(handler, str) else handler
+
+
+class Router:
+    """
+    Таблицы обработчиков для callback-запросов и шагов диалога.
+    """
+
+    def __init__(self):
+        """
+        Инициализирует пустые таблицы маршрутов.
+        """
+        self.callbacks = {}
+        self.states = {}
+        # Ключи user_data, в которых хранится текущий шаг; проверяются по порядку
+        self.state_keys = []
+
+    def callback(self, action: str, handler) -> None:
+        """
+        Регистрирует обработчик callback-запроса.
+
+        Args:
+            action (str): Точное callback_data или действие перед аргументами
+            handler: Асинхронная функция (update, context) или путь "модуль:функция"
+
+        Raises:
+            ValueError: Если действие уже зарегистрировано
+        """
+        if action in self.callbacks:
+            raise ValueError(f"Действие {action} уже зарегистрировано")
+        self.callbacks[action] = lazy(handler)
+
+    def state(self, key: str, value: str, handler) -> None:
+        """
+        Регистрирует обработчик сообщений для шага диалога.
+
+        Args:
+            key (str): Ключ шага в user_data, например "registration_step"
+            value (str): Значение шага, например "full_name_input"
+            handler: Асинхронная функция (update, context) или путь "модуль:функция"
+
+        Raises:
+            ValueError: Если шаг уже зарегистрирован
+        """
+        if (key, value) in self.states:
+            raise ValueError(f"Шаг {key}={value} уже зарегистрирован")
+        if key not in self.state_keys:
+            self.state_keys.append(key)
+        self.states[(key, value)] = lazy(handler)
+
+    def resolve_callback(self, data: str) -> tuple:
+        """
+        Находит обработчик для callback_data.
+
+        Сначала ищется точное совпадение, затем от callback_data по одному
+        отрезаются аргументы с конца, пока не найдется действие.
+
+        Args:
+            data (str): callback_data
+
+        Returns:
+            tuple: (обработчик или None, список аргументов)
+        """
+        handler = self.callbacks.get(data)
+        if handler is not None:
+            return handler, []
+
+        action, args = data, []
+        while True:
+            action, separator, arg = action.rpartition(":")
+            if not separator:
+                return None, []
+            args.append(arg)
+            handler = self.callbacks.get(action)
+            if handler is not None:
+                args.reverse()
+                return handler, args
+
+    def resolve_state(self, user_data: dict):
+        """
+        Находит обработчик сообщения для текущего шага пользователя.
+
+        Args:
+            user_data (dict): Данные пользователя
+
+        Returns:
+            Обработчик или None, если пользователь не находится ни на одном шаге
+        """
+        for key in self.state_keys:
+            value = user_data.get(key)
+            if value is not None:
+                handler = self.states.get((key, value))
+                if handler is not None:
+                    return handler
+        return None
+
+    async def dispatch_callback(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+        """
+        Передает callback-запрос зарегистрированному обработчику.
+
+        Неизвестные кнопки просто подтверждаются, чтобы у пользователя не висели часики.
+        """
+        handler, args = self.resolve_callback(update.callback_query.data or "")
+        if handler is None:
+            await update.callback_query.answer()
+            return
+
+        context.args = args
+        await handler(update, context)
+
+    async def dispatch_message(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+        """
+        Передает сообщение обработчику текущего шага пользователя.
+        """
+        handler = self.resolve_state(context.user_data)
+        if handler is not None:
+            await handler(update, context)
+
+    def install(self, application: Application) -> None:
+        """
+        Регистрирует в приложении два обработчика PTB, ведущих в таблицы маршрутов.
+
+        Args:
+            application (Application): Объект приложения бота
+        """
+        application.add_handler(CallbackQueryHandler(self.dispatch_callback))
+        application.add_handler(MessageHandler(
+            (filters.TEXT | filters.CONTACT) & ~filters.COMMAND,
+            self.dispatch_message
+        ))
@@ -0,0 +1,350 @@
+"""
+Модуль индекса свободного времени мастеров.
+
+Свободное время хранится в памяти как битовая маска на каждый день мастера
+(int, один бит - один интервал resolution минут). Поиск окон длительностью D
+сводится к нескольким сдвигам и AND над маской, без запросов к PostgreSQL.
+
+Индекс процесса - availability_index. Бот загружает его при запуске и раз в
+сутки сдвигает на новый горизонт; бронирование, отмена и перегенерация слотов
+применяют свои изменения после COMMIT. Индекс только подсказывает окна:
+занятость слота окончательно проверяет запрос бронирования.
+"""
+
+import heapq
+from datetime import date, time, timedelta
+from typing import NamedTuple
+from bot.database.database import DatabaseExecutor
+
+MINUTES_IN_DAY = 24 * 60
+
+SELECT_MASTER_SPECIALIZATIONS = """
+SELECT id, specialization
+FROM masters
+WHERE $1::int[] IS NULL OR id = ANY($1::int[])
+"""
+
+SELECT_FREE_SLOTS = """
+SELECT master_id, date, start_time, end_time
+FROM time_slots
+WHERE is_available
+  AND date BETWEEN $1 AND $2
+  AND ($3::int[] IS NULL OR master_id = ANY($3::int[]))
+"""
+
+
+class FreeWindow(NamedTuple):
+    """
+    Непрерывный интервал свободного времени мастера.
+    """
+    date: date
+    start_time: time
+    end_time: time
+    master_id: int
+
+
+def _to_minutes(value: time) -> int:
+    """Переводит время в минуты от начала суток."""
+    return value.hour * 60 + value.minute
+
+
+def _to_time(minutes: int) -> time:
+    """Переводит минуты от начала суток во время (24:00 - в 23:59)."""
+    minutes = min(minutes, MINUTES_IN_DAY - 1)
+    return time(minutes // 60, minutes % 60)
+
+
+class AvailabilityIndex:
+    """
+    Индекс свободного времени: дата -> мастер -> битовая маска.
+    """
+
+    def __init__(self, resolution: int = 5):
+        """
+        Инициализирует пустой индекс.
+
+        Args:
+            resolution (int): Шаг сетки в минутах (один бит маски)
+        """
+        self.resolution = resolution
+        # Загруженный диапазон дат; до первой загрузки изменения слотов не применяются
+        self.date_from = None
+        self.date_to = None
+        self._days = {}
+        self._specializations = {}
+        self._masters_by_specialization = {}
+
+    def set_master(self, master_id: int, specialization: str) -> None:
+        """
+        Добавляет мастера или меняет его специализацию.
+
+        Args:
+            master_id (int): ID мастера
+            specialization (str): Специализация
+        """
+        old = self._specializations.get(master_id)
+        if old is not None:
+            self._masters_by_specialization[old].discard(master_id)
+        self._specializations[master_id] = specialization
+        self._masters_by_specialization.setdefault(specialization, set()).add(master_id)
+
+    def remove_master(self, master_id: int) -> None:
+        """
+        Удаляет мастера и все его свободное время из индекса.
+
+        Args:
+            master_id (int): ID мастера
+        """
+        specialization = self._specializations.pop(master_id, None)
+        if specialization is not None:
+            self._masters_by_specialization[specialization].discard(master_id)
+        for masters in self._days.values():
+            masters.pop(master_id, None)
+
+    def _mask(self, start: time, end: time, outer: bool) -> int:
+        """
+        Строит маску интервала.
+
+        Args:
+            start (time): Начало интервала
+            end (time): Конец интервала
+            outer (bool): True - округлять наружу (занятость),
+                False - внутрь (свободное время)
+
+        Returns:
+            int: Маска интервала
+        """
+        start_minutes = _to_minutes(start)
+        end_minutes = _to_minutes(end) or MINUTES_IN_DAY
+        if outer:
+            first = start_minutes // self.resolution
+            last = -(-end_minutes // self.resolution)
+        else:
+            first = -(-start_minutes // self.resolution)
+            last = end_minutes // self.resolution
+        if last <= first:
+            return 0
+        return ((1 << (last - first)) - 1) << first
+
+    def mark_free(self, master_id: int, day: date, start: time, end: time) -> None:
+        """
+        Отмечает интервал как свободный.
+
+        Args:
+            master_id (int): ID мастера
+            day (date): Дата
+            start (time): Начало интервала
+            end (time): Конец интервала
+        """
+        mask = self._mask(start, end, outer=False)
+        if mask:
+            masters = self._days.setdefault(day, {})
+            masters[master_id] = masters.get(master_id, 0) | mask
+
+    def mark_busy(self, master_id: int, day: date, start: time, end: time) -> None:
+        """
+        Отмечает интервал как занятый.
+
+        Args:
+            master_id (int): ID мастера
+            day (date): Дата
+            start (time): Начало интервала
+            end (time): Конец интервала
+        """
+        masters = self._days.get(day)
+        if not masters or master_id not in masters:
+            return
+        bits = masters[master_id] & ~self._mask(start, end, outer=True)
+        if bits:
+            masters[master_id] = bits
+        else:
+            del masters[master_id]
+
+    def apply_slot(self, master_id: int, day: date, start: time, end: time,
+                   is_available: bool) -> None:
+        """
+        Применяет к индексу изменение одного слота.
+
+        Args:
+            master_id (int): ID мастера
+            day (date): Дата слота
+            start (time): Начало слота
+            end (time): Конец слота
+            is_available (bool): Доступен ли слот для записи
+        """
+        if self.date_from is None or not self.date_from <= day <= self.date_to:
+            return
+        if is_available:
+            self.mark_free(master_id, day, start, end)
+        else:
+            self.mark_busy(master_id, day, start, end)
+
+    def clear_master_days(self, master_id: int, date_from: date, date_to: date) -> None:
+        """
+        Удаляет свободное время мастера на диапазоне дат.
+
+        Args:
+            master_id (int): ID мастера
+            date_from (date): Первая дата
+            date_to (date): Последняя дата
+        """
+        day = date_from
+        while day <= date_to:
+            masters = self._days.get(day)
+            if masters:
+                masters.pop(master_id, None)
+            day += timedelta(days=1)
+
+    def _windows(self, bits: int, length: int) -> list:
+        """
+        Находит в маске непрерывные свободные интервалы не короче length битов.
+
+        Args:
+            bits (int): Маска свободного времени
+            length (int): Минимальная длина в битах
+
+        Returns:
+            list: Кортежи (первый бит, число битов)
+        """
+        # fits: бит i установлен, если свободны все биты i..i+length-1
+        fits = bits
+        span = 1
+        while span < length and fits:
+            step = min(span, length - span)
+            fits &= fits >> step
+            span += step
+        if not fits:
+            return []
+
+        windows = []
+        while bits:
+            low = (bits & -bits).bit_length() - 1
+            run = bits >> low
+            size = (~run & (run + 1)).bit_length() - 1
+            if size >= length:
+                windows.append((low, size))
+            bits &= ~(((1 << size) - 1) << low)
+        return windows
+
+    def find_windows(self, specialization: str, duration: int, date_from: date,
+                     date_to: date, limit: int = 10, not_before: time = None) -> list:
+        """
+        Возвращает первые свободные окна нужной длительности.
+
+        Окна упорядочены по дате, времени начала и ID мастера.
+
+        Args:
+            specialization (str): Специализация мастеров
+            duration (int): Минимальная длительность окна в минутах
+            date_from (date): Первая дата поиска
+            date_to (date): Последняя дата поиска
+            limit (int): Максимальное количество окон
+            not_before (time, optional): Время, раньше которого окна первой
+                даты не начинаются (например, текущее время для сегодняшнего дня)
+
+        Returns:
+            list: Список объектов FreeWindow
+        """
+        masters = self._masters_by_specialization.get(specialization)
+        if not masters or limit <= 0:
+            return []
+
+        length = -(-duration // self.resolution)
+        # Биты первой даты до not_before отбрасываются
+        cutoff = -(-_to_minutes(not_before) // self.resolution) if not_before else 0
+        result = []
+        day = date_from
+        while day <= date_to and len(result) < limit:
+            day_masters = self._days.get(day)
+            if day_masters:
+                if len(masters) < len(day_masters):
+                    candidates = ((m, day_masters.get(m)) for m in masters)
+                else:
+                    candidates = ((m, b) for m, b in day_masters.items() if m in masters)
+                if day == date_from and cutoff:
+                    candidates = ((m, b >> cutoff << cutoff) for m, b in candidates if b)
+                found = (
+                    (start, size, master_id)
+                    for master_id, bits in candidates if bits
+                    for start, size in self._windows(bits, length)
+                )
+                for start, size, master_id in heapq.nsmallest(limit - len(result), found):
+                    result.append(FreeWindow(
+                        date=day,
+                        start_time=_to_time(start * self.resolution),
+                        end_time=_to_time((start + size) * self.resolution),
+                        master_id=master_id
+                    ))
+            day += timedelta(days=1)
+        return result
+
+    def replace(self, date_from: date, date_to: date, masters: list, slots: list,
+                master_ids: list = None) -> None:
+        """
+        Заменяет данные индекса результатом fetch_free_time.
+
+        Без master_ids индекс строится заново на диапазоне дат. С master_ids
+        заменяется свободное время только этих мастеров в пределах уже
+        загруженного диапазона.
+
+        Args:
+            date_from (date): Первая дата
+            date_to (date): Последняя дата
+            masters (list): Строки мастеров (id, specialization)
+            slots (list): Строки свободных слотов
+            master_ids (list, optional): ID мастеров, None - все мастера
+        """
+        if master_ids is None:
+            self.date_from, self.date_to = date_from, date_to
+            self._days = {}
+            self._specializations = {}
+            self._masters_by_specialization = {}
+        elif self.date_from is None:
+            return
+        else:
+            date_from = max(date_from, self.date_from)
+            date_to = min(date_to, self.date_to)
+
+        for row in masters:
+            self.set_master(row['id'], row['specialization'])
+            self.clear_master_days(row['id'], date_from, date_to)
+        for row in slots:
+            if date_from <= row['date'] <= date_to:
+                self.mark_free(row['master_id'], row['date'], row['start_time'], row['end_time'])
+
+    async def load(self, db: DatabaseExecutor, date_from: date, date_to: date,
+                   master_ids: list = None) -> None:
+        """
+        Загружает мастеров и свободные слоты из базы данных (см. replace).
+
+        Args:
+            db (DatabaseExecutor): Подключение к базе данных или открытая транзакция
+            date_from (date): Первая дата
+            date_to (date): Последняя дата
+            master_ids (list, optional): ID мастеров, None - все мастера
+        """
+        masters, slots = await fetch_free_time(db, date_from, date_to, master_ids)
+        self.replace(date_from, date_to, masters, slots, master_ids)
+
+
+async def fetch_free_time(db: DatabaseExecutor, date_from: date, date_to: date,
+                          master_ids: list = None) -> tuple:
+    """
+    Читает мастеров и их свободные слоты для AvailabilityIndex.replace.
+
+    Args:
+        db (DatabaseExecutor): Подключение к базе данных или открытая транзакция
+        date_from (date): Первая дата
+        date_to (date): Последняя дата
+        master_ids (list, optional): ID мастеров, None - все мастера
+
+    Returns:
+        tuple: (строки мастеров, строки свободных слотов)
+    """
+    masters = await db.fetch(SELECT_MASTER_SPECIALIZATIONS, master_ids)
+    slots = await db.fetch(SELECT_FREE_SLOTS, date_from, date_to, master_ids)
+    return masters, slots
+
+
+# Индекс процесса бота
+availability_index = AvailabilityIndex()
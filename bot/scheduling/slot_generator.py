@@ -0,0 +1,181 @@
+"""
+Модуль генерации временных слотов по графику работы мастеров.
+
+Слоты строятся одним запросом INSERT ... SELECT: generate_series разворачивает
+график (working_schedules) в даты горизонта и интервалы длительности услуги,
+так что все слоты считаются и вставляются на стороне PostgreSQL за один проход.
+"""
+
+from datetime import date, datetime, timedelta
+from bot.database.database import DatabaseExecutor, run_after_commit
+from bot.scheduling.availability import availability_index, fetch_free_time
+from config.settings import get_settings
+
+# Свободные слоты на диапазоне дат, которые можно пересоздать. Уже начавшиеся
+# слоты сегодняшнего дня ($5 - текущий момент) не трогаются
+DELETE_FREE_SLOTS = """
+DELETE FROM time_slots
+WHERE master_id = ANY($1::int[])
+  AND date BETWEEN $2 AND $3
+  AND date + start_time > $5::timestamp
+  AND is_available AND booking_id IS NULL
+  AND ($4::int[] IS NULL OR EXTRACT(ISODOW FROM date)::int = ANY($4::int[]))
+"""
+
+# Разворачивает график в слоты. Длительность: явная ($4), иначе самая короткая
+# услуга мастера, иначе значение по умолчанию ($5). Слоты, пересекающиеся с
+# перерывом или с оставшимися (забронированными) слотами, пропускаются, как и
+# слоты, начало которых уже прошло ($7 - текущий момент). Слот с тем же началом,
+# вставленный параллельным запуском, отбрасывается ограничением
+# uq_time_slots_master_date_start (миграция 010).
+INSERT_GENERATED_SLOTS = """
+WITH days AS (
+    SELECT d::date AS date
+    FROM generate_series($2::date, $3::date, interval '1 day') AS d
+),
+schedules AS (
+    SELECT ws.master_id, ws.day_of_week, ws.start_time, ws.end_time,
+           ws.break_start_time, ws.break_end_time,
+           COALESCE($4::interval,
+                    (SELECT MIN(s.duration) FROM services s
+                     WHERE s.master_id = ws.master_id AND s.duration > interval '0'),
+                    $5::interval) AS duration
+    FROM working_schedules ws
+    WHERE ($1::int[] IS NULL OR ws.master_id = ANY($1::int[]))
+      AND ws.is_working
+      AND ws.start_time IS NOT NULL AND ws.end_time IS NOT NULL
+      AND ($6::int[] IS NULL OR ws.day_of_week = ANY($6::int[]))
+),
+candidates AS (
+    SELECT sch.master_id, days.date,
+           slot_start::time AS start_time,
+           (slot_start + sch.duration)::time AS end_time,
+           sch.break_start_time, sch.break_end_time
+    FROM days
+    JOIN schedules sch ON sch.day_of_week = EXTRACT(ISODOW FROM days.date)
+    CROSS JOIN LATERAL generate_series(days.date + sch.start_time,
+                                       days.date + sch.end_time - sch.duration,
+                                       sch.duration) AS slot_start
+),
+inserted AS (
+    INSERT INTO time_slots (master_id, date, start_time, end_time)
+    SELECT c.master_id, c.date, c.start_time, c.end_time
+    FROM candidates c
+    WHERE c.date + c.start_time > $7::timestamp
+      AND NOT (c.break_start_time IS NOT NULL AND c.break_end_time IS NOT NULL
+               AND c.start_time < c.break_end_time AND c.end_time > c.break_start_time)
+      AND NOT EXISTS (
+          SELECT 1 FROM time_slots t
+          WHERE t.master_id = c.master_id AND t.date = c.date
+            AND t.start_time < c.end_time AND t.end_time > c.start_time
+      )
+    ON CONFLICT (master_id, date, start_time) DO NOTHING
+    RETURNING 1
+)
+SELECT count(*) AS created FROM inserted
+"""
+
+# Секции time_slots на месяцы диапазона дат (существующие не пересоздаются)
+ENSURE_PARTITIONS = """
+SELECT create_time_slots_partition(month::date)
+FROM generate_series(date_trunc('month', $1::date), $2::date, interval '1 month') AS month
+"""
+
+# Блокировка перегенерации слотов мастера до конца транзакции
+LOCK_MASTER_SLOTS = "SELECT pg_advisory_xact_lock(hashtext('time_slots'), $1)"
+
+
+class SlotGenerator:
+    """
+    Класс для построения временных слотов на скользящий горизонт дат.
+    """
+
+    def __init__(self, database: DatabaseExecutor, horizon_days: int = None,
+                 default_duration: timedelta = None):
+        """
+        Инициализирует генератор слотов.
+
+        Args:
+            database (DatabaseExecutor): Подключение к базе данных или открытая транзакция
+            horizon_days (int, optional): На сколько дней вперед строятся слоты
+                (по умолчанию SLOT_HORIZON_DAYS)
+            default_duration (timedelta, optional): Длительность слота, если у мастера
+                нет услуг (по умолчанию SLOT_DEFAULT_DURATION_MINUTES)
+        """
+        settings = get_settings()
+        self.database = database
+        self.horizon_days = settings.SLOT_HORIZON_DAYS if horizon_days is None else horizon_days
+        if default_duration is None:
+            default_duration = timedelta(minutes=settings.SLOT_DEFAULT_DURATION_MINUTES)
+        self.default_duration = default_duration
+
+    def horizon(self) -> tuple:
+        """
+        Возвращает диапазон дат текущего горизонта.
+
+        Returns:
+            tuple: (первая дата, последняя дата) включительно
+        """
+        today = date.today()
+        return today, today + timedelta(days=self.horizon_days - 1)
+
+    async def fill_horizon(self, master_ids: list = None, duration: timedelta = None) -> int:
+        """
+        Достраивает недостающие слоты мастеров до конца горизонта.
+
+        Уже существующие слоты не трогаются, поэтому метод можно вызывать
+        ежедневно: будут созданы только слоты новых дней. Сегодня слоты
+        создаются только на еще не наступившее время.
+
+        Args:
+            master_ids (list, optional): ID мастеров, None - все мастера
+            duration (timedelta, optional): Длительность слота вместо длительности услуг
+
+        Returns:
+            int: Количество созданных слотов
+        """
+        date_from, date_to = self.horizon()
+        await self.database.execute(ENSURE_PARTITIONS, date_from, date_to)
+        row = await self.database.fetchrow(
+            INSERT_GENERATED_SLOTS, master_ids, date_from, date_to,
+            duration, self.default_duration, None, datetime.now(), use_primary=True
+        )
+        return row['created']
+
+    async def regenerate_master(self, master_id: int, days_of_week: list = None,
+                                duration: timedelta = None) -> int:
+        """
+        Пересоздает свободные слоты мастера после изменения графика.
+
+        Затрагиваются только еще не начавшиеся слоты горизонта с указанными
+        днями недели; забронированные слоты остаются на месте, а новые слоты,
+        которые с ними пересекаются, не создаются. Перегенерации одного мастера
+        выполняются по очереди под транзакционной advisory-блокировкой.
+        Свободное время мастера в индексе заменяется после COMMIT.
+
+        Args:
+            master_id (int): ID мастера
+            days_of_week (list, optional): Измененные дни недели (1=Пн, 7=Вс),
+                None - все дни
+            duration (timedelta, optional): Длительность слота вместо длительности услуг
+
+        Returns:
+            int: Количество созданных слотов
+        """
+        date_from, date_to = self.horizon()
+        now = datetime.now()
+        await self.database.execute(ENSURE_PARTITIONS, date_from, date_to)
+        async with self.database.transaction() as tx:
+            await tx.execute(LOCK_MASTER_SLOTS, master_id)
+            await tx.execute(DELETE_FREE_SLOTS, [master_id], date_from, date_to, days_of_week, now)
+            row = await tx.fetchrow(
+                INSERT_GENERATED_SLOTS, [master_id], date_from, date_to,
+                duration, self.default_duration, days_of_week, now
+            )
+            # Индекс загружен только в процессе бота; скрипты его не читают
+            if availability_index.date_from is not None:
+                masters, slots = await fetch_free_time(tx, date_from, date_to, [master_id])
+                run_after_commit(tx, lambda: availability_index.replace(
+                    date_from, date_to, masters, slots, [master_id]
+                ))
+        return row['created']
@@ -0,0 +1,184 @@
+"""
+Профилирование холодного старта бота.
+
+StartupProfiler отмечает этапы запуска (импорт, загрузка настроек, сборка
+приложения, подключение к базе, первое обновление) и время импорта модулей
+по пакетам. Время импорта измеряется загрузчиком-оберткой, который
+ставится первым в sys.meta_path, поэтому профилировщик нужно включить до
+импорта telegram и модулей бота. Модуль использует только стандартную
+библиотеку, чтобы не искажать замер.
+"""
+
+import importlib.abc
+import os
+import sys
+import time
+
+# Запасная точка отсчета, если время запуска процесса узнать нельзя
+_IMPORTED_AT = time.perf_counter()
+
+
+def process_uptime() -> float:
+    """
+    Возвращает время с запуска процесса в секундах.
+
+    На Linux время считается по /proc с учетом запуска интерпретатора
+    (точность - такт планировщика, обычно 10 мс), на других системах - с
+    импорта этого модуля.
+
+    Returns:
+        float: Секунды с запуска процесса
+    """
+    try:
+        with open("/proc/self/stat") as f:
+            # Поле 22 (starttime) - в тактах с загрузки системы; имя процесса
+            # в скобках может содержать пробелы, поэтому отсчет идет после ")"
+            start_ticks = int(f.read().rsplit(")", 1)[1].split()[19])
+        with open("/proc/uptime") as f:
+            uptime = float(f.read().split()[0])
+        return uptime - start_ticks / os.sysconf("SC_CLK_TCK")
+    except (OSError, ValueError, IndexError, AttributeError):
+        return time.perf_counter() - _IMPORTED_AT
+
+
+class _TimingLoader(importlib.abc.Loader):
+    """
+    Загрузчик, который замеряет выполнение модуля исходного загрузчика.
+    """
+
+    def __init__(self, loader, profiler: 'StartupProfiler'):
+        self._loader = loader
+        self._profiler = profiler
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module) -> None:
+        profiler = self._profiler
+        # Время вложенных импортов вычитается из собственного времени модуля
+        profiler._children.append(0.0)
+        started = time.perf_counter()
+        try:
+            self._loader.exec_module(module)
+        finally:
+            elapsed = time.perf_counter() - started
+            children = profiler._children.pop()
+            if profiler._children:
+                profiler._children[-1] += elapsed
+            profiler._record_import(module.__name__, elapsed - children)
+
+    def __getattr__(self, name: str):
+        # get_resource_reader, is_package и прочее - у исходного загрузчика
+        return getattr(self._loader, name)
+
+
+class _TimingFinder(importlib.abc.MetaPathFinder):
+    """
+    Находит модуль остальными поисковиками и подменяет его загрузчик.
+    """
+
+    def __init__(self, profiler: 'StartupProfiler'):
+        self._profiler = profiler
+
+    def find_spec(self, fullname: str, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                break
+        else:
+            return None
+
+        if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+            spec.loader = _TimingLoader(spec.loader, self._profiler)
+        return spec
+
+
+class StartupProfiler:
+    """
+    Разбивка времени запуска по этапам и по импортированным пакетам.
+    """
+
+    def __init__(self):
+        """
+        Начинает отсчет с момента создания.
+        """
+        self.started = time.perf_counter()
+        self.stages = []
+        self.imports = {}
+        self.finished = False
+        self._last = self.started
+        self._children = []
+        self._finder = None
+
+    def install(self) -> None:
+        """
+        Включает замер времени импорта модулей.
+        """
+        if self._finder is None:
+            self._finder = _TimingFinder(self)
+            sys.meta_path.insert(0, self._finder)
+
+    def uninstall(self) -> None:
+        """
+        Отключает замер времени импорта.
+        """
+        if self._finder is not None:
+            sys.meta_path.remove(self._finder)
+            self._finder = None
+
+    def _record_import(self, module_name: str, seconds: float) -> None:
+        package = module_name.partition(".")[0]
+        total, count = self.imports.get(package, (0.0, 0))
+        self.imports[package] = (total + seconds, count + 1)
+
+    def mark(self, stage: str) -> None:
+        """
+        Завершает этап запуска.
+
+        Args:
+            stage (str): Название этапа, который закончился сейчас
+        """
+        now = time.perf_counter()
+        self.stages.append((stage, now - self._last))
+        self._last = now
+
+    def finish(self, stage: str = "до первого обновления") -> None:
+        """
+        Завершает последний этап, печатает отчет и отключает замер импорта.
+
+        Повторные вызовы ничего не делают.
+
+        Args:
+            stage (str): Название последнего этапа
+        """
+        if self.finished:
+            return
+        self.finished = True
+        self.mark(stage)
+        self.uninstall()
+        print(self.report())
+
+    def report(self, top: int = 15) -> str:
+        """
+        Формирует текстовый отчет.
+
+        Args:
+            top (int): Сколько самых медленных пакетов показать
+
+        Returns:
+            str: Отчет об этапах запуска и времени импорта
+        """
+        lines = [f"Запуск бота: {(self._last - self.started) * 1000:.0f} мс"]
+        for stage, seconds in self.stages:
+            lines.append(f"  {stage:<40} {seconds * 1000:>8.1f} мс")
+
+        if self.imports:
+            imported = sum(count for _, count in self.imports.values())
+            total = sum(seconds for seconds, _ in self.imports.values())
+            lines.append(f"Импорт: {imported} модулей, {total * 1000:.0f} мс")
+            ranked = sorted(self.imports.items(), key=lambda item: item[1][0], reverse=True)
+            for package, (seconds, count) in ranked[:top]:
+                lines.append(f"  {package:<40} {seconds * 1000:>8.1f} мс  ({count} мод.)")
+        return "\n".join(lines)
@@ -0,0 +1,50 @@
+"""
+Модуль текстов поиска мастера.
+"""
+
+
+SEARCH_START_TEXT = "Выбери специализацию мастера или найди его по имени:"
+NAME_SEARCH_TEXT = "Введи фамилию или имя мастера (можно частично):"
+NO_MASTERS_TEXT = "По твоему запросу мастера не найдены. Попробуй изменить параметры поиска."
+NO_WINDOWS_TEXT = "У мастеров этой специализации пока нет свободного времени."
+
+
+def get_search_start_text() -> str:
+    """Возвращает текст выбора способа поиска."""
+    return SEARCH_START_TEXT
+
+
+def get_name_search_text() -> str:
+    """Возвращает текст запроса имени для поиска."""
+    return NAME_SEARCH_TEXT
+
+
+def get_no_masters_text() -> str:
+    """Возвращает текст для пустого результата поиска."""
+    return NO_MASTERS_TEXT
+
+
+def get_search_results_text(masters: list) -> str:
+    """Возвращает текст страницы результатов поиска."""
+    lines = ["Найденные мастера:\n"]
+    for master in masters:
+        lines.append(
+            f"{master.last_name} {master.first_name} - {master.specialization}, "
+            f"стаж {master.experience_years} лет"
+        )
+    return "\n".join(lines)
+
+
+def get_nearest_windows_text(windows: list, masters: dict) -> str:
+    """Возвращает текст со списком ближайших свободных окон мастеров."""
+    if not windows:
+        return NO_WINDOWS_TEXT
+
+    lines = ["Ближайшее свободное время:\n"]
+    for window in windows:
+        master = masters.get(window.master_id)
+        name = f"{master.last_name} {master.first_name}" if master else f"мастер #{window.master_id}"
+        lines.append(
+            f"{window.date:%d.%m} {window.start_time:%H:%M}-{window.end_time:%H:%M} - {name}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,85 @@
+"""
+Параллельная обработка обновлений с сохранением порядка для каждого пользователя.
+"""
+
+import asyncio
+from telegram import Update
+from telegram.ext import BaseUpdateProcessor
+
+
+class PerUserUpdateProcessor(BaseUpdateProcessor):
+    """
+    Обрабатывает обновления параллельно, но обновления одного пользователя - строго по очереди.
+
+    Пошаговые сценарии (registration_step, search_step) хранят состояние в
+    user_data, поэтому два сообщения одного пользователя не должны
+    обрабатываться одновременно. Обновления разных пользователей не ждут друг друга.
+
+    Общее ограничение max_concurrent_updates соблюдает базовый класс, поэтому
+    обновление, ожидающее предыдущее сообщение того же пользователя, тоже
+    занимает место. Пользователь в одном чате редко присылает больше пары
+    сообщений подряд, так что это не мешает остальным.
+    """
+
+    __slots__ = ("_locks",)
+
+    def __init__(self, max_concurrent_updates: int):
+        """
+        Инициализирует обработчик.
+
+        Args:
+            max_concurrent_updates (int): Сколько обновлений обрабатывается одновременно
+        """
+        super().__init__(max_concurrent_updates)
+        # Ключ -> [блокировка, число обновлений в очереди]
+        self._locks = {}
+
+    @staticmethod
+    def _ordering_key(update: object):
+        """
+        Возвращает ключ, по которому упорядочиваются обновления.
+
+        Args:
+            update (object): Обновление
+
+        Returns:
+            int | None: ID пользователя (или чата), None - порядок не важен
+        """
+        if not isinstance(update, Update):
+            return None
+        if update.effective_user:
+            return update.effective_user.id
+        if update.effective_chat:
+            return update.effective_chat.id
+        return None
+
+    async def do_process_update(self, update: object, coroutine) -> None:
+        """
+        Выполняет обновление после предыдущих обновлений того же пользователя.
+
+        Args:
+            update (object): Обновление
+            coroutine: Корутина обработки обновления
+        """
+        key = self._ordering_key(update)
+        if key is None:
+            await coroutine
+            return
+
+        entry = self._locks.get(key)
+        if entry is None:
+            entry = self._locks[key] = [asyncio.Lock(), 0]
+        entry[1] += 1
+        try:
+            async with entry[0]:
+                await coroutine
+        finally:
+            entry[1] -= 1
+            if not entry[1]:
+                del self._locks[key]
+
+    async def initialize(self) -> None:
+        return
+
+    async def shutdown(self) -> None:
+        return
@@ -0,0 +1,31 @@
+-- Migration 005: Create bookings table
+CREATE TABLE IF NOT EXISTS bookings (
+    id SERIAL PRIMARY KEY,
+    slot_id INTEGER NOT NULL,
+    master_id INTEGER REFERENCES masters(id) ON DELETE CASCADE,
+    service_id INTEGER REFERENCES services(id) ON DELETE SET NULL,
+    client_telegram_id BIGINT NOT NULL,
+    date DATE NOT NULL,
+    start_time TIME NOT NULL,
+    end_time TIME NOT NULL,
+    status VARCHAR(20) NOT NULL DEFAULT 'confirmed' CHECK (status IN ('confirmed', 'cancelled')),
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    cancelled_at TIMESTAMP
+);
+
+-- Indexes
+-- Не больше одной действующей записи на слот
+CREATE UNIQUE INDEX IF NOT EXISTS idx_bookings_active_slot ON bookings(slot_id) WHERE status = 'confirmed';
+CREATE INDEX IF NOT EXISTS idx_bookings_master_id ON bookings(master_id);
+CREATE INDEX IF NOT EXISTS idx_bookings_client ON bookings(client_telegram_id);
+
+-- Comments
+COMMENT ON TABLE bookings IS 'Записи клиентов к мастерам';
+COMMENT ON COLUMN bookings.slot_id IS 'ID временного слота';
+COMMENT ON COLUMN bookings.master_id IS 'ID мастера';
+COMMENT ON COLUMN bookings.service_id IS 'ID услуги';
+COMMENT ON COLUMN bookings.client_telegram_id IS 'Telegram ID клиента';
+COMMENT ON COLUMN bookings.date IS 'Дата записи (копия из слота)';
+COMMENT ON COLUMN bookings.start_time IS 'Время начала (копия из слота)';
+COMMENT ON COLUMN bookings.end_time IS 'Время окончания (копия из слота)';
+COMMENT ON COLUMN bookings.status IS 'Статус записи';
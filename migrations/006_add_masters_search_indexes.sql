@@ -0,0 +1,9 @@
+-- Migration 006: Add indexes for master search
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- Indexes
+-- Поиск по подстроке ФИО (ILIKE '%...%')
+CREATE INDEX IF NOT EXISTS idx_masters_full_name_trgm
+    ON masters USING GIN ((last_name || ' ' || first_name) gin_trgm_ops);
+-- Keyset-пагинация по (specialization, id)
+CREATE INDEX IF NOT EXISTS idx_masters_specialization_id ON masters(specialization, id);
@@ -0,0 +1,14 @@
+-- Migration 007: Create bot persistence table
+CREATE TABLE IF NOT EXISTS bot_persistence (
+    kind VARCHAR(10) NOT NULL CHECK (kind IN ('user', 'chat')),
+    id BIGINT NOT NULL,
+    data JSONB NOT NULL,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (kind, id)
+);
+
+-- Comments
+COMMENT ON TABLE bot_persistence IS 'Состояние диалогов бота (user_data и chat_data)';
+COMMENT ON COLUMN bot_persistence.kind IS 'Тип данных: user или chat';
+COMMENT ON COLUMN bot_persistence.id IS 'Telegram ID пользователя или чата';
+COMMENT ON COLUMN bot_persistence.data IS 'Данные в формате JSON';
@@ -0,0 +1,72 @@
+-- Migration 008: Partition time slots by month
+-- Таблица пересоздается секционированной по date (одна секция на месяц),
+-- существующие слоты переносятся с сохранением id. Миграция выполняется
+-- в одной транзакции и блокирует time_slots на время копирования.
+
+-- Создает секцию на месяц, в который попадает month_day, если ее еще нет.
+-- Существующая секция проверяется заранее: CREATE TABLE ... PARTITION OF
+-- блокирует всю time_slots, а функция вызывается перед каждой генерацией слотов
+CREATE OR REPLACE FUNCTION create_time_slots_partition(month_day DATE) RETURNS TEXT AS $$
+DECLARE
+    month_start DATE := date_trunc('month', month_day)::date;
+    partition_name TEXT := 'time_slots_' || to_char(month_start, '"y"YYYY"m"MM');
+BEGIN
+    IF to_regclass(quote_ident(partition_name)) IS NULL THEN
+        EXECUTE format(
+            'CREATE TABLE IF NOT EXISTS %I PARTITION OF time_slots FOR VALUES FROM (%L) TO (%L)',
+            partition_name, month_start, (month_start + interval '1 month')::date
+        );
+    END IF;
+    RETURN partition_name;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Последовательность id остается прежней: отвязываем ее от старой таблицы до удаления
+ALTER SEQUENCE time_slots_id_seq OWNED BY NONE;
+ALTER TABLE time_slots RENAME TO time_slots_unpartitioned;
+
+CREATE TABLE time_slots (
+    id INTEGER NOT NULL DEFAULT nextval('time_slots_id_seq'),
+    master_id INTEGER REFERENCES masters(id) ON DELETE CASCADE,
+    date DATE NOT NULL,
+    start_time TIME NOT NULL,
+    end_time TIME NOT NULL,
+    is_available BOOLEAN DEFAULT TRUE,
+    booking_id INTEGER,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    -- Ключ секционирования обязан входить в первичный ключ
+    PRIMARY KEY (id, date)
+) PARTITION BY RANGE (date);
+
+ALTER SEQUENCE time_slots_id_seq OWNED BY time_slots.id;
+
+-- Секции для уже созданных слотов и текущего месяца. Секции на будущие месяцы
+-- создает run_migrations.py по настройке SLOT_PARTITION_MONTHS_AHEAD, а перед
+-- вставкой слотов их дополнительно проверяет генератор
+SELECT create_time_slots_partition(month::date)
+FROM generate_series(
+    date_trunc('month', LEAST(COALESCE((SELECT MIN(date) FROM time_slots_unpartitioned), CURRENT_DATE), CURRENT_DATE)),
+    date_trunc('month', GREATEST(COALESCE((SELECT MAX(date) FROM time_slots_unpartitioned), CURRENT_DATE),
+                                 CURRENT_DATE)),
+    interval '1 month'
+) AS month;
+
+INSERT INTO time_slots (id, master_id, date, start_time, end_time, is_available, booking_id, created_at)
+SELECT id, master_id, date, start_time, end_time, is_available, booking_id, created_at
+FROM time_slots_unpartitioned;
+
+DROP TABLE time_slots_unpartitioned;
+
+-- Indexes (создаются на каждой секции автоматически)
+-- Слоты мастера по дням: генерация, проверка пересечений, загрузка расписания
+CREATE INDEX IF NOT EXISTS idx_time_slots_master_date_start ON time_slots(master_id, date, start_time);
+-- Только свободные слоты: поиск времени для записи
+CREATE INDEX IF NOT EXISTS idx_time_slots_free ON time_slots(master_id, date, start_time) WHERE is_available;
+
+-- Comments
+COMMENT ON TABLE time_slots IS 'Временные слоты для записи (секции по месяцам)';
+COMMENT ON COLUMN time_slots.date IS 'Дата слота (ключ секционирования)';
+COMMENT ON COLUMN time_slots.start_time IS 'Время начала';
+COMMENT ON COLUMN time_slots.end_time IS 'Время окончания';
+COMMENT ON COLUMN time_slots.is_available IS 'Доступность для записи';
+COMMENT ON COLUMN time_slots.booking_id IS 'ID бронирования';
@@ -0,0 +1,23 @@
+-- Migration 009: One working schedule row per master and day of week
+-- Повторное сохранение графика раньше добавляло дубли. Из дублей остается
+-- последняя сохраненная запись, после чего (master_id, day_of_week)
+-- становится уникальным и служит целью ON CONFLICT.
+
+DELETE FROM working_schedules
+WHERE master_id IS NULL OR day_of_week IS NULL;
+
+DELETE FROM working_schedules older
+USING working_schedules newer
+WHERE older.master_id = newer.master_id
+  AND older.day_of_week = newer.day_of_week
+  AND older.id < newer.id;
+
+ALTER TABLE working_schedules
+    ALTER COLUMN master_id SET NOT NULL,
+    ALTER COLUMN day_of_week SET NOT NULL;
+
+ALTER TABLE working_schedules
+    ADD CONSTRAINT uq_working_schedules_master_day UNIQUE (master_id, day_of_week);
+
+-- Индекс ограничения начинается с master_id и заменяет отдельный индекс
+DROP INDEX IF EXISTS idx_schedules_master_id;
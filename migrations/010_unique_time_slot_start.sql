@@ -0,0 +1,25 @@
+-- Migration 010: One time slot per master, date and start time
+-- Одновременные запуски генерации могли вставить один и тот же слот дважды.
+-- Из дублей остается забронированный слот, иначе слот с меньшим id; если
+-- забронированы оба дубля, создание ограничения завершится ошибкой и их
+-- нужно разобрать вручную.
+
+DELETE FROM time_slots t
+USING (
+    SELECT id, date,
+           row_number() OVER (PARTITION BY master_id, date, start_time
+                              ORDER BY booking_id IS NULL, id) AS position
+    FROM time_slots
+) duplicates
+WHERE t.id = duplicates.id
+  AND t.date = duplicates.date
+  AND duplicates.position > 1
+  AND t.booking_id IS NULL;
+
+-- Ключ секционирования (date) входит в ограничение, поэтому оно допустимо
+-- на секционированной таблице и служит целью ON CONFLICT при генерации
+ALTER TABLE time_slots
+    ADD CONSTRAINT uq_time_slots_master_date_start UNIQUE (master_id, date, start_time);
+
+-- Индекс ограничения заменяет обычный индекс по тем же столбцам
+DROP INDEX IF EXISTS idx_time_slots_master_date_start;
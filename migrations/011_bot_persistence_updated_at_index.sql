@@ -0,0 +1,6 @@
+-- Migration 011: Index bot persistence by update time
+-- При запуске бот загружает только состояние, менявшееся за последние
+-- PERSISTENCE_LOAD_DAYS дней, - без индекса это полный просмотр таблицы
+CREATE INDEX IF NOT EXISTS idx_bot_persistence_kind_updated ON bot_persistence(kind, updated_at);
+
+COMMENT ON COLUMN bot_persistence.updated_at IS 'Время последнего изменения';
@@ -0,0 +1,7 @@
+-- Migration 012: Add row version to masters
+-- Master.update сверяет прочитанную версию и увеличивает ее на сервере.
+-- updated_at для этого не годится: NOW() одинаков для всех запросов одной
+-- транзакции и может совпасть у двух быстрых изменений
+ALTER TABLE masters ADD COLUMN IF NOT EXISTS version INTEGER NOT NULL DEFAULT 0;
+
+COMMENT ON COLUMN masters.version IS 'Версия строки, увеличивается при каждом изменении';
@@ -1,8 +1,34 @@
 """
 Точка входа для запуска Telegram-бота.
+
+С флагом --profile-startup бот печатает разбивку времени запуска: импорт
+модулей по пакетам, загрузку настроек и инициализацию до первого
+полученного обновления.
 """
 
-from bot.main import main
+import sys
+
+
+def main() -> None:
+    """Загружает настройки и запускает бота."""
+    profiler = None
+    if "--profile-startup" in sys.argv[1:]:
+        # Профилировщик включается до импорта telegram и модулей бота
+        from bot.startup_profiler import StartupProfiler
+        profiler = StartupProfiler()
+        profiler.install()
+
+    from config.settings import load_settings
+    load_settings()
+    if profiler:
+        profiler.mark("загрузка настроек")
+
+    from bot.main import run_bot
+    if profiler:
+        profiler.mark("импорт bot.main")
+
+    run_bot(profiler)
+
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
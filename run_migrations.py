@@ -9,14 +9,19 @@ import os
 # Добавляем текущую директорию в путь поиска модулей
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
+from config.settings import load_settings
 from bot.database.database import Database
 from bot.database.migrations import MigrationManager
+from bot.database.partitions import PartitionManager
 
 
 async def run_migrations():
     """Запускает миграции базы данных."""
     # Создаем подключение к базе данных
-    db = Database()
+    # Миграции выполняются только в основной базе
+    db = Database(replica_dsns=())
+    # Миграции могут строить индексы на больших таблицах - без ограничения времени
+    db.statement_timeout_ms = 0
 
     try:
         # Подключаемся к базе данных
@@ -29,6 +34,11 @@ async def run_migrations():
         # Запускаем миграции
         await migration_manager.run_migrations()
 
+        # Миграция 008 создает секции time_slots только по текущий месяц,
+        # будущие секции - по настройке SLOT_PARTITION_MONTHS_AHEAD
+        created = await PartitionManager(db).create_future_partitions()
+        print(f"Создано секций time_slots: {len(created)}")
+
         print("Миграции успешно применены!")
 
     except Exception as e:
@@ -40,4 +50,5 @@ async def run_migrations():
 
 
 if __name__ == "__main__":
+    load_settings()
     asyncio.run(run_migrations())
\ No newline at end of file
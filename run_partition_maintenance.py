@@ -0,0 +1,39 @@
+"""
+Скрипт обслуживания секций таблицы time_slots.
+
+Создает секции на несколько месяцев вперед и удаляет секции старше срока
+хранения. Рассчитан на ежедневный запуск (например, из cron) перед
+генерацией слотов.
+"""
+
+import asyncio
+import sys
+import os
+
+# Добавляем текущую директорию в путь поиска модулей
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from config.settings import load_settings
+from bot.database.database import Database
+from bot.database.partitions import PartitionManager
+
+
+async def run_partition_maintenance():
+    """Создает будущие и удаляет устаревшие секции time_slots."""
+    # Изменение схемы - только в основной базе
+    db = Database(replica_dsns=())
+
+    try:
+        await db.connect()
+        await PartitionManager(db).run_maintenance()
+
+    except Exception as e:
+        print(f"Ошибка при обслуживании секций: {e}")
+        raise
+    finally:
+        await db.disconnect()
+
+
+if __name__ == "__main__":
+    load_settings()
+    asyncio.run(run_partition_maintenance())
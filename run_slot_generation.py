@@ -0,0 +1,44 @@
+"""
+Скрипт для достраивания временных слотов всех мастеров до конца горизонта.
+
+Рассчитан на ежедневный запуск (например, из cron).
+"""
+
+import asyncio
+import sys
+import os
+
+# Добавляем текущую директорию в путь поиска модулей
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from config.settings import load_settings
+from bot.database.database import Database
+from bot.database.partitions import PartitionManager
+from bot.scheduling.slot_generator import SlotGenerator
+
+
+async def run_slot_generation():
+    """Достраивает слоты всех мастеров."""
+    db = Database()
+
+    try:
+        await db.connect()
+
+        # Слоты вставляются в месячные секции - они должны существовать до генерации
+        await PartitionManager(db).create_future_partitions()
+
+        generator = SlotGenerator(db)
+        created = await generator.fill_horizon()
+
+        print(f"Создано слотов: {created}")
+
+    except Exception as e:
+        print(f"Ошибка при генерации слотов: {e}")
+        raise
+    finally:
+        await db.disconnect()
+
+
+if __name__ == "__main__":
+    load_settings()
+    asyncio.run(run_slot_generation())
@@ -0,0 +1,110 @@
+"""
+Общие настройки тестов.
+
+Тесты не обращаются к Telegram и PostgreSQL: настройки загружаются из
+фиксированного набора переменных, а соединения заменяются заглушками.
+"""
+
+from contextlib import asynccontextmanager
+
+import pytest
+
+from config.settings import load_settings
+
+load_settings({"TELEGRAM_BOT_TOKEN": "1:test", "DB_PASSWORD": "test"})
+
+from bot.database.database import Database, Transaction  # noqa: E402
+from bot.database.stats import QueryStats  # noqa: E402
+
+
+class FakeConnection:
+    """
+    Соединение asyncpg без сервера.
+
+    Запоминает запросы (с схлопнутыми пробелами) и параметры, а fetch и
+    fetchrow возвращают заранее заданные ответы по очереди.
+    """
+
+    def __init__(self):
+        self.rows = []
+        self.queries = []
+        # Сколько следующих транзакций не откроется (ConnectionError)
+        self.failures = 0
+        self.readonly = None
+        self.committed = 0
+        self.rolled_back = 0
+
+    @asynccontextmanager
+    async def transaction(self, readonly: bool = False):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("база недоступна")
+        self.readonly = readonly
+        try:
+            yield
+        except BaseException:
+            self.rolled_back += 1
+            raise
+        self.committed += 1
+
+    def _record(self, query: str, args: tuple) -> None:
+        self.queries.append((" ".join(query.split()), args))
+
+    async def execute(self, query: str, *args) -> str:
+        self._record(query, args)
+        return "OK"
+
+    async def executemany(self, query: str, args: list) -> None:
+        self._record(query, (args,))
+
+    async def fetch(self, query: str, *args) -> list:
+        self._record(query, args)
+        return self.rows.pop(0) if self.rows else []
+
+    async def fetchrow(self, query: str, *args):
+        self._record(query, args)
+        return self.rows.pop(0) if self.rows else None
+
+    async def copy_records_to_table(self, table: str, records: list, columns: list) -> str:
+        self._record(f"COPY {table}", (records, columns))
+        return f"COPY {len(records)}"
+
+
+class FakePool:
+    """Пул из одного соединения."""
+
+    def __init__(self, connection: FakeConnection):
+        self.connection = connection
+
+    async def acquire(self, timeout: float = None) -> FakeConnection:
+        return self.connection
+
+    async def release(self, connection: FakeConnection) -> None:
+        pass
+
+
+@pytest.fixture
+def connection() -> FakeConnection:
+    """Соединение основной базы."""
+    return FakeConnection()
+
+
+@pytest.fixture
+def replica() -> FakeConnection:
+    """Соединение реплики для чтения."""
+    return FakeConnection()
+
+
+@pytest.fixture
+def transaction(connection: FakeConnection) -> Transaction:
+    """Transaction на соединении основной базы (вне блока transaction() - как Database.session())."""
+    return Transaction(connection, QueryStats(slow_query_threshold=1.0))
+
+
+@pytest.fixture
+def database(connection: FakeConnection, replica: FakeConnection) -> Database:
+    """Database, у которой основная база и одна реплика - заглушки."""
+    db = Database(replica_dsns=())
+    db.pool = FakePool(connection)
+    db.replica_pools = [FakePool(replica)]
+    return db
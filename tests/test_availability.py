@@ -0,0 +1,149 @@
+"""
+Тесты индекса свободного времени: поиск окон и применение изменений слотов.
+"""
+
+import asyncio
+from datetime import date, time
+
+from bot.database.models.booking import Booking
+from bot.database.models.master import Master
+from bot.database.models.time_slot import TimeSlot
+from bot.scheduling.availability import AvailabilityIndex, FreeWindow
+
+DAY = date(2026, 3, 2)
+NEXT_DAY = date(2026, 3, 3)
+
+
+def make_index() -> AvailabilityIndex:
+    index = AvailabilityIndex()
+    masters = [{'id': 1, 'specialization': "барбер"}, {'id': 2, 'specialization': "барбер"},
+               {'id': 3, 'specialization': "маникюр"}]
+    index.replace(DAY, NEXT_DAY, masters, [])
+    return index
+
+
+def test_find_windows_orders_by_date_time_and_master():
+    index = make_index()
+    index.mark_free(2, DAY, time(10), time(12))
+    index.mark_free(1, DAY, time(11), time(12))
+    index.mark_free(1, NEXT_DAY, time(9), time(10))
+    index.mark_free(3, DAY, time(8), time(20))
+
+    assert index.find_windows("барбер", 60, DAY, NEXT_DAY) == [
+        FreeWindow(DAY, time(10), time(12), 2),
+        FreeWindow(DAY, time(11), time(12), 1),
+        FreeWindow(NEXT_DAY, time(9), time(10), 1),
+    ]
+    assert index.find_windows("барбер", 60, DAY, NEXT_DAY, limit=1) == [
+        FreeWindow(DAY, time(10), time(12), 2),
+    ]
+
+
+def test_find_windows_skips_short_gaps():
+    index = make_index()
+    index.mark_free(1, DAY, time(9), time(12))
+    index.mark_busy(1, DAY, time(10), time(10, 30))
+
+    assert index.find_windows("барбер", 90, DAY, DAY) == [
+        FreeWindow(DAY, time(10, 30), time(12), 1),
+    ]
+    assert index.find_windows("барбер", 120, DAY, DAY) == []
+
+
+def test_find_windows_not_before_cuts_first_day_only():
+    index = make_index()
+    index.mark_free(1, DAY, time(9), time(12))
+    index.mark_free(1, NEXT_DAY, time(9), time(12))
+
+    assert index.find_windows("барбер", 60, DAY, NEXT_DAY, not_before=time(10, 2)) == [
+        FreeWindow(DAY, time(10, 5), time(12), 1),
+        FreeWindow(NEXT_DAY, time(9), time(12), 1),
+    ]
+
+
+def test_apply_slot_ignores_days_outside_loaded_range():
+    index = AvailabilityIndex()
+    index.set_master(1, "барбер")
+    index.apply_slot(1, DAY, time(9), time(10), True)
+    assert index.find_windows("барбер", 60, DAY, DAY) == []
+
+    index = make_index()
+    index.apply_slot(1, date(2026, 3, 4), time(9), time(10), True)
+    index.apply_slot(1, DAY, time(9), time(10), True)
+    assert index.find_windows("барбер", 60, DAY, date(2026, 3, 4)) == [
+        FreeWindow(DAY, time(9), time(10), 1),
+    ]
+
+
+def test_replace_for_masters_keeps_other_masters():
+    index = make_index()
+    index.mark_free(1, DAY, time(9), time(10))
+    index.mark_free(2, DAY, time(9), time(10))
+
+    slots = [{'master_id': 1, 'date': DAY, 'start_time': time(15), 'end_time': time(16)}]
+    index.replace(DAY, NEXT_DAY, [{'id': 1, 'specialization': "барбер"}], slots, master_ids=[1])
+
+    assert index.find_windows("барбер", 60, DAY, DAY) == [
+        FreeWindow(DAY, time(9), time(10), 2),
+        FreeWindow(DAY, time(15), time(16), 1),
+    ]
+
+
+def test_cancel_frees_slot_in_index_after_commit(monkeypatch, transaction):
+    index = make_index()
+    monkeypatch.setattr('bot.database.models.booking.availability_index', index)
+    row = {'id': 7, 'master_id': 1, 'date': DAY, 'start_time': time(9), 'end_time': time(10)}
+    tx = transaction
+    tx.connection.rows = [row]
+
+    async def cancel():
+        async with tx.transaction():
+            assert await Booking(id=7).cancel(tx)
+            assert index.find_windows("барбер", 60, DAY, DAY) == []
+
+    asyncio.run(cancel())
+    assert index.find_windows("барбер", 60, DAY, DAY) == [FreeWindow(DAY, time(9), time(10), 1)]
+
+
+def test_book_slot_filters_by_date_and_marks_slot_busy(monkeypatch, transaction):
+    index = make_index()
+    index.mark_free(1, DAY, time(9), time(10))
+    monkeypatch.setattr('bot.database.models.booking.availability_index', index)
+    transaction.connection.rows = [(70, 7, 1, None, 555, DAY, time(9), time(10), "confirmed", None, None)]
+
+    booking = asyncio.run(Booking.book_slot(transaction, 7, DAY, 555))
+
+    query, args = transaction.connection.queries[0]
+    assert "WHERE id = $1 AND date = $4 AND is_available" in query
+    assert args == (7, None, 555, DAY)
+    assert booking.slot_id == 7
+    assert index.find_windows("барбер", 60, DAY, DAY) == []
+
+
+def test_created_slots_become_free_after_commit(monkeypatch, transaction):
+    index = make_index()
+    monkeypatch.setattr('bot.database.models.time_slot.availability_index', index)
+    transaction.connection.rows = [[{'id': 1}]]
+
+    async def create():
+        async with transaction.transaction():
+            await TimeSlot.bulk_create(transaction, [(1, DAY, time(9), time(10))])
+            await TimeSlot.copy_records(transaction, [(2, DAY, time(9), time(10))])
+            assert index.find_windows("барбер", 60, DAY, DAY) == []
+
+    asyncio.run(create())
+    assert index.find_windows("барбер", 60, DAY, DAY) == [
+        FreeWindow(DAY, time(9), time(10), 1),
+        FreeWindow(DAY, time(9), time(10), 2),
+    ]
+
+
+def test_created_master_is_added_to_index(monkeypatch, transaction):
+    index = make_index()
+    monkeypatch.setattr('bot.database.models.master.availability_index', index)
+    transaction.connection.rows = [{'id': 4, 'created_at': None, 'updated_at': None, 'version': 1}]
+
+    asyncio.run(Master.create(transaction, "Анна", "Иванова", "+70000000000", "визажист"))
+    index.mark_free(4, DAY, time(9), time(10))
+
+    assert index.find_windows("визажист", 60, DAY, DAY) == [FreeWindow(DAY, time(9), time(10), 4)]
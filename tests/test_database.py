@@ -0,0 +1,76 @@
+"""
+Тесты Database: прогрев соединений, функции after_commit и точки сохранения.
+"""
+
+import asyncio
+
+import pytest
+
+from bot.database.database import Database
+
+
+def test_callbacks_run_after_outer_commit(transaction):
+    tx = transaction
+    calls = []
+
+    async def scenario():
+        async with tx.transaction():
+            tx.after_commit(lambda: calls.append("outer"))
+            async with tx.transaction():
+                tx.after_commit(lambda: calls.append("inner"))
+            assert calls == []
+
+    asyncio.run(scenario())
+    assert calls == ["outer", "inner"]
+    assert tx.commit_callbacks == []
+
+
+def test_callbacks_dropped_on_rollback(transaction):
+    tx = transaction
+    calls = []
+
+    async def scenario():
+        async with tx.transaction():
+            tx.after_commit(lambda: calls.append("x"))
+            raise RuntimeError("откат")
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(scenario())
+    assert calls == []
+    assert tx.commit_callbacks == []
+
+
+def test_savepoint_rollback_drops_only_its_callbacks(transaction):
+    tx = transaction
+    calls = []
+
+    async def scenario():
+        async with tx.transaction():
+            tx.after_commit(lambda: calls.append("kept"))
+            with pytest.raises(ValueError):
+                async with tx.transaction():
+                    tx.after_commit(lambda: calls.append("dropped"))
+                    raise ValueError()
+
+    asyncio.run(scenario())
+    assert calls == ["kept"]
+
+
+def test_callback_outside_transaction_runs_immediately(transaction):
+    # Соединение из Database.session(): команды фиксируются сразу
+    tx = transaction
+    calls = []
+    tx.after_commit(lambda: calls.append("now"))
+    assert calls == ["now"]
+
+
+def test_init_connection_warms_queries_with_null_parameters(connection):
+    queries = ("SELECT 1 FROM masters WHERE id = $1",
+               "SELECT 1 FROM masters WHERE id = $2 AND phone_number = $1",
+               "SELECT 1")
+    db = Database(prepared_queries=queries, replica_dsns=())
+
+    asyncio.run(db._init_connection(connection))
+
+    assert connection.readonly is True
+    assert connection.queries == [(queries[0], (None,)), (queries[1], (None, None)), (queries[2], ())]
@@ -0,0 +1,130 @@
+"""
+Тесты Master: измененные поля и сохранение с проверкой версии.
+"""
+
+import asyncio
+from datetime import datetime
+
+import pytest
+
+from bot.database.cache import master_cache
+from bot.database.database import ConcurrentUpdateError
+from bot.database.models.master import Master
+
+READ_AT = datetime(2026, 3, 1, 12, 0)
+SAVED_AT = datetime(2026, 3, 1, 12, 5)
+
+
+class Row(tuple):
+    """Строка результата: доступ по позиции и по имени столбца, как у asyncpg.Record."""
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            key = Master.__slots__.index(key)
+        return super().__getitem__(key)
+
+
+def make_row(description: str = "", version: int = 3, updated_at: datetime = READ_AT) -> Row:
+    return Row((7, "Анна", "Иванова", "+70000000000", "барбер", None, description, 5,
+                READ_AT, updated_at, version))
+
+
+def make_master() -> Master:
+    return Master.from_row(make_row())
+
+
+def test_changed_fields_tracks_only_modified_columns():
+    master = make_master()
+    assert master.changed_fields() == {}
+
+    master.description = "Стрижки"
+    master.experience_years = 6
+    assert master.changed_fields() == {'description': "Стрижки", 'experience_years': 6}
+
+    assert set(Master(id=1).changed_fields()) == {name for name, _ in Master.UPDATABLE_FIELDS}
+
+
+def test_update_sets_changed_columns_and_checks_version(transaction):
+    master = make_master()
+    master.description = "Стрижки"
+    transaction.connection.rows = [{'updated_at': SAVED_AT, 'version': 4}]
+
+    assert asyncio.run(master.update(transaction)) is True
+    query, args = transaction.connection.queries[0]
+    assert "SET description = $1, updated_at = NOW(), version = version + 1" in query
+    assert "WHERE id = $2 AND version = $3" in query
+    assert args == ("Стрижки", 7, 3)
+    assert asyncio.run(make_master().update(transaction)) is False
+
+
+def test_update_applies_new_version_after_commit_only(transaction):
+    master = make_master()
+    tx = transaction
+    tx.connection.rows = [{'updated_at': SAVED_AT, 'version': 4}, {'updated_at': SAVED_AT, 'version': 5}]
+
+    async def run():
+        async with tx.transaction():
+            master.description = "Стрижки"
+            await master.update(tx)
+            assert (master.version, master.updated_at) == (3, READ_AT)
+            assert master.changed_fields() == {'description': "Стрижки"}
+
+            master.experience_years = 6
+            await master.update(tx)
+
+    asyncio.run(run())
+    assert [query[1] for query in tx.connection.queries] == [("Стрижки", 7, 3), (6, 7, 4)]
+    assert (master.version, master.updated_at) == (5, SAVED_AT)
+    assert master.changed_fields() == {}
+
+
+def test_update_rolled_back_keeps_loaded_state(transaction):
+    master = make_master()
+    tx = transaction
+    tx.connection.rows = [{'updated_at': SAVED_AT, 'version': 4}]
+
+    async def run():
+        async with tx.transaction():
+            master.description = "Стрижки"
+            await master.update(tx)
+            raise RuntimeError("откат")
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(run())
+    assert master.version == 3
+    assert master.changed_fields() == {'description': "Стрижки"}
+
+
+def test_update_of_changed_row_raises(transaction):
+    master = make_master()
+    master.description = "Стрижки"
+    transaction.connection.rows = [None]
+
+    with pytest.raises(ConcurrentUpdateError):
+        asyncio.run(master.update(transaction))
+
+
+def test_cache_is_filled_from_primary_after_update(database, connection, replica):
+    master_cache.clear()
+    master = make_master()
+    master.description = "Стрижки"
+    # Реплика отстает: на ней строка до UPDATE
+    replica.rows = [[make_row()]]
+    connection.rows = [{'updated_at': SAVED_AT, 'version': 4},
+                       [make_row("Стрижки", version=4, updated_at=SAVED_AT)],
+                       {'updated_at': SAVED_AT, 'version': 5}]
+
+    async def run():
+        await master.update(database)
+        cached = await Master.get_by_id(database, 7)
+        assert (cached.description, cached.version) == ("Стрижки", 4)
+
+        cached.experience_years = 6
+        assert await cached.update(database)
+
+    try:
+        asyncio.run(run())
+    finally:
+        master_cache.clear()
+    assert replica.queries == []
+    assert connection.queries[-1][1] == (6, 7, 4)
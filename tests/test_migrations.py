@@ -0,0 +1,41 @@
+"""
+Тесты разбиения файлов миграций на команды.
+"""
+
+import glob
+import os
+
+from bot.database.migrations import split_statements
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "migrations")
+
+
+def test_splits_on_semicolons_and_drops_empty_statements():
+    sql = "CREATE TABLE a (id INT);\n\n-- комментарий;\nINSERT INTO a VALUES (1);\n;"
+    assert split_statements(sql) == ["CREATE TABLE a (id INT)", "-- комментарий;\nINSERT INTO a VALUES (1)"]
+
+
+def test_keeps_semicolons_inside_quotes_comments_and_dollar_blocks():
+    sql = """
+    COMMENT ON TABLE a IS 'текст; с ''кавычками''';
+    /* блок; комментария */ SELECT "col;name" FROM a;
+    CREATE FUNCTION f() RETURNS INT AS $$ BEGIN RETURN 1; END; $$ LANGUAGE plpgsql;
+    DO $body$ BEGIN PERFORM 1; END $body$;
+    SELECT $1::int
+    """
+    statements = split_statements(sql)
+    assert len(statements) == 5
+    assert statements[0] == "COMMENT ON TABLE a IS 'текст; с ''кавычками'''"
+    assert statements[2].endswith("END; $$ LANGUAGE plpgsql")
+    assert statements[3] == "DO $body$ BEGIN PERFORM 1; END $body$"
+    assert statements[4] == "SELECT $1::int"
+
+
+def test_repository_migrations_split_into_complete_statements():
+    for path in sorted(glob.glob(os.path.join(MIGRATIONS_DIR, "*.sql"))):
+        with open(path, encoding="utf-8") as f:
+            statements = split_statements(f.read())
+        assert statements, path
+        for statement in statements:
+            assert statement.count("$$") % 2 == 0, (path, statement)
+            assert statement.count("(") == statement.count(")"), (path, statement)
@@ -0,0 +1,59 @@
+"""
+Тесты PostgresPersistence: пакетная запись, повтор после ошибки и финальный сброс.
+"""
+
+import asyncio
+
+import pytest
+
+from bot.database import persistence
+from bot.database.persistence import PostgresPersistence
+
+
+def written(connection) -> list:
+    return [args for _, args in connection.queries]
+
+
+def test_changes_are_written_in_one_batch(database, connection):
+    store = PostgresPersistence(database, update_interval=1)
+
+    async def run():
+        await asyncio.gather(store.update_user_data(1, {'step': 'a'}), store.update_user_data(2, {}))
+        await store._flush_task
+
+    asyncio.run(run())
+    assert written(connection) == [('user', [1, 2], ['{"step": "a"}', '{}'])]
+
+
+def test_background_flush_retries_after_failure(monkeypatch, database, connection):
+    monkeypatch.setattr(persistence, 'FLUSH_RETRY_MIN_DELAY', 0.01)
+    connection.failures = 2
+    store = PostgresPersistence(database, update_interval=1)
+
+    async def run():
+        await store.update_user_data(1, {'step': 'a'})
+        await asyncio.sleep(0)
+        await store.update_user_data(2, {})
+        await store._flush_task
+
+    asyncio.run(run())
+    assert written(connection) == [('user', [1, 2], ['{"step": "a"}', '{}'])]
+
+
+def test_final_flush_raises_and_keeps_changes(database, connection):
+    connection.failures = 10
+    store = PostgresPersistence(database, update_interval=1)
+
+    async def run():
+        await store.update_user_data(1, {'step': 'a'})
+        await store.drop_chat_data(5)
+        with pytest.raises(ConnectionError):
+            await store.flush()
+        await asyncio.sleep(0)
+        assert store._flush_task.cancelled()
+
+        connection.failures = 0
+        await store.flush()
+
+    asyncio.run(run())
+    assert written(connection) == [('user', [1], ['{"step": "a"}']), ('chat', [5])]
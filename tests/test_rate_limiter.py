@@ -0,0 +1,104 @@
+"""
+Тесты TokenBucket и RateLimiter без обращений к Telegram.
+"""
+
+import asyncio
+
+from telegram.error import RetryAfter
+
+from bot.rate_limiter import PRIORITY_BULK, PRIORITY_INTERACTIVE, RateLimiter, TokenBucket
+
+
+def test_bucket_allows_burst_then_waits_for_refill():
+    async def run():
+        loop = asyncio.get_running_loop()
+        bucket = TokenBucket(rate=100, capacity=3)
+        started = loop.time()
+        for _ in range(3):
+            await bucket.acquire()
+        burst = loop.time() - started
+        await bucket.acquire()
+        return burst, loop.time() - started
+
+    burst, total = asyncio.run(run())
+    assert burst < 0.005
+    assert total >= 0.009
+
+
+def test_bucket_wakes_waiters_by_priority():
+    async def run():
+        bucket = TokenBucket(rate=200, capacity=1)
+        await bucket.acquire()
+        order = []
+
+        async def wait(name, priority):
+            await bucket.acquire(priority)
+            order.append(name)
+
+        await asyncio.gather(wait("рассылка", PRIORITY_BULK), wait("ответ", PRIORITY_INTERACTIVE))
+        return order
+
+    assert asyncio.run(run()) == ["ответ", "рассылка"]
+
+
+def test_cancelled_waiter_does_not_take_a_token():
+    async def run():
+        bucket = TokenBucket(rate=100, capacity=1)
+        await bucket.acquire()
+        waiter = asyncio.ensure_future(bucket.acquire())
+        await asyncio.sleep(0)
+        waiter.cancel()
+        await asyncio.sleep(0.02)
+        return bucket.tokens
+
+    assert asyncio.run(run()) >= 1
+
+
+def make_limiter() -> RateLimiter:
+    return RateLimiter(global_rate=1000, global_burst=1000, chat_rate=1, chat_burst=1,
+                       group_rate_per_minute=20, max_retries=2)
+
+
+def test_edits_skip_the_chat_bucket():
+    async def call():
+        return "ok"
+
+    async def run():
+        limiter = make_limiter()
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        await limiter.process_request(call, (), {}, "sendMessage", {"chat_id": 5}, None)
+        for _ in range(3):
+            await limiter.process_request(call, (), {}, "editMessageText", {"chat_id": 5}, None)
+        return loop.time() - started
+
+    assert asyncio.run(run()) < 0.1
+
+
+def test_retry_after_pauses_only_that_chat():
+    async def run():
+        limiter = make_limiter()
+        loop = asyncio.get_running_loop()
+        attempts = []
+
+        async def limited():
+            attempts.append(loop.time())
+            if len(attempts) == 1:
+                raise RetryAfter(1)
+            return "ok"
+
+        async def other():
+            return loop.time()
+
+        started = loop.time()
+        first = asyncio.ensure_future(
+            limiter.process_request(limited, (), {}, "sendMessage", {"chat_id": 5}, None)
+        )
+        await asyncio.sleep(0.01)
+        other_sent = await limiter.process_request(other, (), {}, "sendMessage", {"chat_id": 6}, None)
+        await first
+        return other_sent - started, attempts[1] - started
+
+    other_delay, retry_delay = asyncio.run(run())
+    assert other_delay < 0.5
+    assert retry_delay >= 1
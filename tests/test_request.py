@@ -0,0 +1,31 @@
+"""
+Тесты ограничения одновременных запросов к Bot API.
+"""
+
+import asyncio
+
+from telegram.request import HTTPXRequest
+
+from bot.request import ConcurrencyLimitedRequest
+
+
+def test_requests_above_limit_wait_for_a_free_place(monkeypatch):
+    running = []
+    peak = 0
+
+    async def do_request(self, url, method, **kwargs):
+        nonlocal peak
+        running.append(url)
+        peak = max(peak, len(running))
+        await asyncio.sleep(0.01)
+        running.remove(url)
+        return 200, b'{"ok": true, "result": true}'
+
+    monkeypatch.setattr(HTTPXRequest, "do_request", do_request)
+
+    async def run():
+        request = ConcurrencyLimitedRequest(2)
+        return await asyncio.gather(*(request.do_request(f"/bot/m{i}", "POST") for i in range(5)))
+
+    assert asyncio.run(run()) == [(200, b'{"ok": true, "result": true}')] * 5
+    assert peak == 2
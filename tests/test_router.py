@@ -0,0 +1,78 @@
+"""
+Тесты Router и callback_data поиска мастера.
+"""
+
+import pytest
+
+from bot.keyboards.search_keyboard import get_specializations_keyboard, specialization_key
+from bot.router import CALLBACK_DATA_MAX_BYTES, LazyHandler, Router, lazy, pack
+
+
+async def first(update, context):
+    pass
+
+
+async def second(update, context):
+    pass
+
+
+def test_pack_joins_arguments_and_checks_length():
+    assert pack("fm:n", "1z") == "fm:n:1z"
+    assert pack("help") == "help"
+
+    with pytest.raises(ValueError):
+        pack("fm:s", "я" * (CALLBACK_DATA_MAX_BYTES // 2))
+
+
+def test_resolve_callback_prefers_exact_match_then_longest_action():
+    router = Router()
+    router.callback("fm", first)
+    router.callback("fm:name", second)
+
+    assert router.resolve_callback("fm:name") == (second, [])
+    assert router.resolve_callback("fm:name:x") == (second, ["x"])
+    assert router.resolve_callback("fm:s:a:b") == (first, ["s", "a", "b"])
+    assert router.resolve_callback("unknown:1") == (None, [])
+
+
+def test_register_twice_is_an_error():
+    router = Router()
+    router.callback("help", first)
+
+    with pytest.raises(ValueError):
+        router.callback("help", second)
+
+
+def test_specialization_buttons_do_not_depend_on_list_order():
+    keyboard = get_specializations_keyboard(("барбер", "маникюр"))
+    reordered = get_specializations_keyboard(("визажист", "маникюр", "барбер"))
+
+    def buttons(markup):
+        return {row[0].text: row[0].callback_data for row in markup.inline_keyboard[:-2]}
+
+    assert buttons(keyboard)["маникюр"] == buttons(reordered)["маникюр"]
+    assert buttons(keyboard)["барбер"] == pack("fm:s", specialization_key("барбер"))
+    assert len(specialization_key("очень длинная специализация " * 10)) == 10
+
+
+def test_resolve_state_checks_state_keys_in_registration_order():
+    router = Router()
+    router.state("registration_step", "full_name_input", first)
+    router.state("search_step", "name_input", second)
+
+    assert router.resolve_state({'search_step': "name_input"}) is second
+    assert router.resolve_state({'registration_step': "full_name_input", 'search_step': "name_input"}) is first
+    assert router.resolve_state({'registration_step': "unknown"}) is None
+    assert router.resolve_state({}) is None
+
+
+def test_lazy_handler_imports_module_on_first_call():
+    handler = lazy("bot.handlers.help_handler:show_help_message")
+
+    assert isinstance(handler, LazyHandler)
+    assert handler._handler is None
+    assert handler.load().__name__ == "show_help_message"
+    assert lazy(first) is first
+
+    with pytest.raises(ValueError):
+        lazy("bot.handlers.help_handler")
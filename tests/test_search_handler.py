@@ -0,0 +1,93 @@
+"""
+Тесты обработчиков поиска мастера без Telegram и базы данных.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+from bot.database.models.master import Master
+from bot.handlers import search_handler
+from bot.keyboards.search_keyboard import encode_cursor, specialization_key
+
+
+class FakeMessage:
+    def __init__(self):
+        self.edits = []
+
+    async def edit_text(self, text, reply_markup=None):
+        self.edits.append((text, reply_markup))
+
+
+class FakeCallbackQuery:
+    def __init__(self, data: str):
+        self.data = data
+        self.message = FakeMessage()
+
+    async def answer(self):
+        pass
+
+
+def make_call(data: str, args: list, user_data: dict = None):
+    query = FakeCallbackQuery(data)
+    update = SimpleNamespace(callback_query=query, message=None)
+    context = SimpleNamespace(args=args, user_data=user_data or {}, bot_data={'db': None})
+    return update, context, query.message
+
+
+def test_missing_cursor_falls_back_to_first_page(monkeypatch):
+    search_handler.search_cache.clear()
+    master = Master(id=3, first_name="Анна", last_name="Иванова", specialization="барбер")
+
+    async def search(db, specialization=None, name=None, cursor=None, forward=True, limit=5):
+        return ([], False) if cursor is not None else ([master], False)
+
+    monkeypatch.setattr(Master, "search", search)
+    update, context, message = make_call(
+        "fm:n:" + encode_cursor(99), [encode_cursor(99)], {'master_search': {'specialization': "барбер"}}
+    )
+
+    asyncio.run(search_handler.handle_master_search_page(update, context))
+
+    text, keyboard = message.edits[0]
+    assert "Иванова Анна" in text
+    assert all(not button.callback_data.startswith(("fm:p", "fm:n"))
+               for row in keyboard.inline_keyboard for button in row)
+
+
+def test_bare_or_invalid_cursor_shows_first_page(monkeypatch):
+    master = Master(id=3, first_name="Анна", last_name="Иванова", specialization="барбер")
+    searched = []
+
+    async def search(db, specialization=None, name=None, cursor=None, forward=True, limit=5):
+        searched.append((cursor, forward))
+        return [master], False
+
+    monkeypatch.setattr(Master, "search", search)
+    for data, args in (("fm:n", []), ("fm:p", []), ("fm:n:!!", ["!!"])):
+        search_handler.search_cache.clear()
+        update, context, message = make_call(data, args, {'master_search': {'specialization': "барбер"}})
+
+        asyncio.run(search_handler.handle_master_search_page(update, context))
+
+        assert "Иванова Анна" in message.edits[0][0]
+    assert searched == [(None, True)] * 3
+
+
+def test_specialization_choice_by_key(monkeypatch):
+    search_handler.search_cache.clear()
+    search_handler.search_cache.set('specializations', ("барбер", "маникюр"))
+    searched = []
+
+    async def search(db, specialization=None, name=None, cursor=None, forward=True, limit=5):
+        searched.append(specialization)
+        return [], False
+
+    monkeypatch.setattr(Master, "search", search)
+    update, context, _ = make_call("fm:s", [specialization_key("маникюр")])
+    asyncio.run(search_handler.handle_specialization_choice(update, context))
+    assert searched == ["маникюр"]
+
+    update, context, message = make_call("fm:s", ["unknown"])
+    asyncio.run(search_handler.handle_specialization_choice(update, context))
+    assert searched == ["маникюр"]
+    assert message.edits[0][0] == search_handler.get_search_start_text()
@@ -0,0 +1,29 @@
+"""
+Тесты нормализации запросов и описания параметров для журнала медленных запросов.
+"""
+
+from datetime import date
+
+from bot.database.stats import normalize_query, redact_args
+
+
+def test_normalize_query_replaces_literals_and_keeps_parameters():
+    query = """
+        SELECT id, t1.name FROM masters t1
+        WHERE id = $12 AND name = 'O''Brien' AND rating > 4.5
+        LIMIT 10
+    """
+    assert normalize_query(query) == (
+        "SELECT id, t1.name FROM masters t1 WHERE id = $12 AND name = ? AND rating > ? LIMIT ?"
+    )
+
+
+def test_normalize_query_is_shared_by_calls_with_different_literals():
+    assert normalize_query("SELECT 1 FROM a WHERE b = 'x'") == normalize_query("SELECT  2\nFROM a WHERE b = 'yy'")
+
+
+def test_redact_args_hides_values():
+    described = redact_args((42, "+79991234567", [1, 2, 3], None, date(2026, 3, 1)))
+    assert described == "$1=<int>, $2=<str:12>, $3=<list:3>, $4=<NoneType>, $5=<date>"
+    assert "7999" not in described
+    assert redact_args(()) == ""
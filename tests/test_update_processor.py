@@ -0,0 +1,46 @@
+"""
+Тесты PerUserUpdateProcessor: порядок обновлений одного пользователя.
+"""
+
+import asyncio
+
+from telegram import Update
+
+from bot.update_processor import PerUserUpdateProcessor
+
+
+def make_update(update_id: int, user_id: int) -> Update:
+    user = {"id": user_id, "is_bot": False, "first_name": "User"}
+    return Update.de_json({
+        "update_id": update_id,
+        "message": {"message_id": update_id, "date": 0, "text": "x", "from": user,
+                    "chat": {"id": user_id, "type": "private"}},
+    }, None)
+
+
+def test_same_user_is_sequential_and_users_run_in_parallel():
+    processor = PerUserUpdateProcessor(8)
+    running = {}
+    overlaps = []
+    log = []
+
+    async def handle(update_id: int, user_id: int) -> None:
+        running[user_id] = running.get(user_id, 0) + 1
+        overlaps.append(sum(1 for count in running.values() if count))
+        assert running[user_id] == 1
+        await asyncio.sleep(0.01)
+        log.append((user_id, update_id))
+        running[user_id] -= 1
+
+    async def run():
+        updates = [(1, 1), (2, 2), (3, 1), (4, 2), (5, 1)]
+        await asyncio.gather(*(
+            processor.process_update(make_update(update_id, user_id), handle(update_id, user_id))
+            for update_id, user_id in updates
+        ))
+
+    asyncio.run(run())
+    assert [u for user, u in log if user == 1] == [1, 3, 5]
+    assert [u for user, u in log if user == 2] == [2, 4]
+    assert max(overlaps) == 2
+    assert processor._locks == {}